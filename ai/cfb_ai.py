@@ -1,18 +1,30 @@
 # cfb_ai.py
 """
 Full pipeline:
-- Connect to DuckDB
-- Load cfb_games, cfb_rankings, cfb_drives, cfb_plays
-- Normalize columns
+- Load .env (outside production) so its CFB_* settings apply, then connect to DuckDB
+- Load cfb_games, cfb_rankings, cfb_drives, cfb_plays (needed columns only)
+- Normalize columns and compact dtypes (ai.cfb_memory); plays are aggregated one
+  season at a time when they exceed CFB_AI_MEMORY_BUDGET_MB
 - Aggregate drive & play metrics per (game_id, offense)
 - Assign those aggregates to home/away using is_home_offense
 - Merge those features into games (merge on games.id == team_perf.game_id)
+- Join pregame box-score form from cfb.cfb_team_box_stats and opponent-adjusted
+  ratings from cfb.team_adjusted_ratings (ai.cfb_ratings) when they exist
 - Compute recent rolling stats
 - Train LightGBM models (home_win classifier, spread regressor, total points regressor)
-- Save predictions back to DuckDB (cfb.cfb_predictions)
-- Evaluate model performance and store results
+- Evaluate model performance
+- Compute betting edges against every provider + consensus line (ai.cfb_edges)
+- Store per-feature attributions (pred_contrib) for predicted games whose features
+  or fitted models changed in cfb.ai_attributions (ai.cfb_explain)
+- Append predictions, evaluation and edges as one versioned run (ai.cfb_history);
+  cfb.cfb_predictions / cfb.model_eval / cfb.ai_best_bets are latest-run tables
+- Record wall/CPU time, peak RSS and row counts per stage in cfb.ai_run_metrics
+  (ai.cfb_profile; CFB_AI_PROFILE_STAGE=<stage> captures a cProfile/tracemalloc report)
+- Publish an immutable snapshot of the serving tables (shared.snapshots)
 """
 
+import os
+
 import duckdb
 import pandas as pd
 import numpy as np
@@ -21,37 +33,94 @@ import warnings
 from sklearn.metrics import accuracy_score, roc_auc_score, log_loss
 import lightgbm as lgb
 
+from shared.app_config import load_local_env
+
+# .env first: the modules below read their settings (CFB_EDGE_THRESHOLD, CFB_AI_MEMORY_BUDGET_MB, ...) at import
+load_local_env()
+
+from ai.cfb_edges import EDGE_THRESHOLD  # noqa: E402
+from ai.cfb_explain import ATTRIBUTIONS_TABLE, save_attributions  # noqa: E402
+from ai.cfb_history import model_version, new_run_id, save_run  # noqa: E402
+from ai.cfb_profile import METRICS_TABLE, RunMetrics  # noqa: E402
+from ai.cfb_memory import MEMORY_BUDGET_MB, compact_frame, fill_numeric, fits_in_budget, frame_mb, table_rows  # noqa: E402
+from shared.snapshots import publish_snapshot  # noqa: E402
+
 warnings.filterwarnings("ignore")
 
 # -------------------------
 # Step 1: Connect to DuckDB
 # -------------------------
-con = duckdb.connect(database='cfb_analytics.duckdb', read_only=False)
+DB_PATH = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+con = duckdb.connect(database=DB_PATH, read_only=False)
+RUN_TS = datetime.now()
+RUN_ID = new_run_id(RUN_TS)
+metrics = RunMetrics(RUN_ID)
 
 # -------------------------
-# Step 2: Load tables
+# Step 2: Load tables (only the columns used below, then compacted in Step 3)
 # -------------------------
-games = con.execute("SELECT * FROM cfb.cfb_games").df()
-rankings = con.execute("SELECT * FROM cfb.cfb_rankings").df()
-drives = con.execute("SELECT * FROM cfb.cfb_drives").df()
-plays = con.execute("SELECT * FROM cfb.cfb_plays").df()
+metrics.start('load')
+
+def table_exists(qualified_name):
+    schema, name = qualified_name.split('.')
+    return con.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = ? AND table_name = ?
+    """, [schema, name]).fetchone()[0] > 0
+
+# Prefer in-house Elo (ai.cfb_elo → cfb.game_elo) over the API's pregame Elo when it has been built
+if table_exists('cfb.game_elo'):
+    elo_select = """
+        COALESCE(e.home_pregame_elo, g.home_pregame_elo) AS home_pregame_elo,
+        COALESCE(e.away_pregame_elo, g.away_pregame_elo) AS away_pregame_elo
+    FROM cfb.cfb_games g
+    LEFT JOIN cfb.game_elo e USING (game_id)"""
+else:
+    elo_select = """
+        g.home_pregame_elo, g.away_pregame_elo
+    FROM cfb.cfb_games g"""
+
+games = con.execute(f"""
+    SELECT
+        g.game_id AS id, g.season, g.week, g.season_type, g.game_completed AS completed,
+        g.home_id, g.away_id, g.home_points, g.away_points,{elo_select}
+""").df()
+rankings = con.execute("""
+    SELECT season, season_type, week, team_id, poll, team_rank AS rank
+    FROM cfb.cfb_rankings
+""").df()
+drives = con.execute("""
+    SELECT game_id, offense_team_name AS offense, is_home_offense, drive_number, scoring, plays, yards
+    FROM cfb.cfb_drives
+""").df()
+
+# Plays are by far the largest table; they are loaded in Step 7, whole or one season at a time
+PLAYS_QUERY = """
+    SELECT play_id AS id, game_id, offense_team_name AS offense, yards_gained, scoring, ppa
+    FROM cfb.cfb_plays
+"""
 
 # -------------------------
-# Step 3: Normalize column names
+# Step 3: Normalize column names + compact dtypes
 # -------------------------
 def normalize(df):
-    df = df.copy()
     df.columns = df.columns.str.lower().str.strip()
     return df
 
-games = normalize(games)
-rankings = normalize(rankings)
-drives = normalize(drives)
-plays = normalize(plays)
+# Scores and the targets derived from them are added/subtracted after compaction, so keep their width
+SCORE_COLUMNS = ['home_points', 'away_points', 'point_spread', 'total_points']
+
+games = compact_frame(normalize(games), categorical=['season_type'], exclude=SCORE_COLUMNS)
+rankings = compact_frame(normalize(rankings), categorical=['season_type', 'poll'])
+drives = compact_frame(normalize(drives), categorical=['offense'])
+print(f"Loaded games {frame_mb(games):.1f} MB, rankings {frame_mb(rankings):.1f} MB, drives {frame_mb(drives):.1f} MB")
+
+metrics.stop(rows_out=len(games) + len(rankings) + len(drives))
 
 # -------------------------
 # Step 4: Prepare rankings (AP Top 25)
 # -------------------------
+metrics.start('rankings', rows_in=len(games))
 if 'poll' in rankings.columns:
     rankings['poll'] = rankings['poll'].astype(str).str.lower()
     rankings_ap = rankings[rankings['poll'] == 'ap top 25'].copy()
@@ -75,9 +144,12 @@ else:
     games['home_rank'] = 25
     games['away_rank'] = 25
 
+metrics.stop(rows_out=len(games))
+
 # -------------------------
 # Step 5: Base game-level features
 # -------------------------
+metrics.start('base_features', rows_in=len(games))
 games['home_pregame_elo'] = games.get('home_pregame_elo', 1500).fillna(1500)
 games['away_pregame_elo'] = games.get('away_pregame_elo', 1500).fillna(1500)
 games['home_rank'] = games['home_rank'].fillna(25)
@@ -87,6 +159,7 @@ games['elo_diff'] = games['home_pregame_elo'] - games['away_pregame_elo']
 games['rank_diff'] = games['home_rank'] - games['away_rank']
 
 games['completed'] = games.get('completed', False)
+games['completed'] = games['completed'].fillna(False).astype(bool)
 games['home_points'] = games.get('home_points', pd.NA)
 games['away_points'] = games.get('away_points', pd.NA)
 
@@ -95,80 +168,149 @@ games['home_win'] = (
     (games['home_points'].notna()) &
     (games['away_points'].notna()) &
     (games['home_points'] > games['away_points'])
-).astype(int)
+).astype(np.int8)
 
 games['point_spread'] = games['home_points'].fillna(0) - games['away_points'].fillna(0)
 games['total_points'] = games['home_points'].fillna(0) + games['away_points'].fillna(0)
 
+metrics.stop(rows_out=len(games))
+
 # -------------------------
 # Step 6: Drive-level aggregation
 # -------------------------
+metrics.start('drive_agg', rows_in=len(drives))
 for col in ['yards', 'plays', 'scoring']:
     if col not in drives.columns:
         drives[col] = 0
 if 'is_home_offense' not in drives.columns:
     drives['is_home_offense'] = 0
 
-drive_summary = drives.groupby(['game_id', 'offense'], dropna=False).agg(
+drive_summary = drives.groupby(['game_id', 'offense'], dropna=False, observed=True).agg(
     drives_run=('drive_number', 'count'),
     drives_scoring=('scoring', 'sum'),
     total_drive_yards=('yards', 'sum'),
     total_drive_plays=('plays', 'sum'),
     is_home_offense=('is_home_offense', 'max')
 ).reset_index()
+del drives
 
 drive_summary['drive_scoring_rate'] = (drive_summary['drives_scoring'] / drive_summary['drives_run']).fillna(0)
 drive_summary['avg_drive_yards'] = (drive_summary['total_drive_yards'] / drive_summary['drives_run']).fillna(0)
 drive_summary['avg_drive_plays'] = (drive_summary['total_drive_plays'] / drive_summary['drives_run']).fillna(0)
 
+metrics.stop(rows_out=len(drive_summary))
+
 # -------------------------
-# Step 7: Play-level aggregation
+# Step 7: Play-level aggregation (chunked by season above the memory budget)
 # -------------------------
-for col in ['yards_gained', 'ppa', 'scoring']:
-    if col not in plays.columns:
-        plays[col] = 0
+metrics.start('play_agg')
 
-play_summary = plays.groupby(['game_id', 'offense'], dropna=False).agg(
-    total_plays=('id', 'count'),
-    total_yards=('yards_gained', 'sum'),
-    avg_yards_per_play=('yards_gained', 'mean'),
-    scoring_plays=('scoring', 'sum'),
-    total_ppa=('ppa', 'sum'),
-    avg_ppa=('ppa', 'mean'),
-).reset_index()
+def summarize_plays(plays):
+    plays = compact_frame(normalize(plays), categorical=['offense'])
+    for col in ['yards_gained', 'ppa', 'scoring']:
+        if col not in plays.columns:
+            plays[col] = 0
+    plays['ppa_success'] = (plays['ppa'] > 0).astype(np.float32)
+
+    return plays.groupby(['game_id', 'offense'], dropna=False, observed=True).agg(
+        total_plays=('id', 'count'),
+        total_yards=('yards_gained', 'sum'),
+        avg_yards_per_play=('yards_gained', 'mean'),
+        scoring_plays=('scoring', 'sum'),
+        total_ppa=('ppa', 'sum'),
+        avg_ppa=('ppa', 'mean'),
+        success_rate=('ppa_success', 'mean'),
+    ).reset_index()
 
-success_rate = plays.groupby(['game_id', 'offense'], dropna=False)['ppa'].apply(lambda x: (x > 0).mean()).reset_index(name='success_rate')
-play_summary = play_summary.merge(success_rate, on=['game_id', 'offense'], how='left').fillna(0)
+play_rows = table_rows(con, 'cfb.cfb_plays')
+if fits_in_budget(play_rows):
+    play_summary = summarize_plays(con.execute(PLAYS_QUERY).df())
+else:
+    # A game belongs to one season, so per-season summaries concatenate exactly
+    print(f"Plays ({play_rows:,} rows) exceed the {MEMORY_BUDGET_MB:.0f} MB budget — aggregating one season at a time")
+    play_seasons = [r[0] for r in con.execute("SELECT DISTINCT season FROM cfb.cfb_plays ORDER BY season").fetchall()]
+    play_summary = pd.concat(
+        [
+            summarize_plays(con.execute(PLAYS_QUERY + " WHERE season IS NOT DISTINCT FROM ?", [season]).df())
+            for season in play_seasons
+        ],
+        ignore_index=True,
+    )
+play_summary = compact_frame(play_summary, categorical=['offense'])
+fill_numeric(play_summary)
+
+metrics.stop(rows_in=play_rows, rows_out=len(play_summary))
 
 # -------------------------
 # Step 8: Combine drive + play summaries
 # -------------------------
-team_perf = pd.merge(drive_summary, play_summary, on=['game_id', 'offense'], how='outer').fillna(0)
-team_perf['is_home_offense'] = team_perf['is_home_offense'].astype(int)
-max_yds = team_perf['avg_yards_per_play'].max() or 1.0
-team_perf['offense_efficiency'] = (
-    0.5 * team_perf['drive_scoring_rate'] +
-    0.3 * (team_perf['avg_yards_per_play'] / max_yds) +
-    0.2 * team_perf['success_rate']
-).fillna(0)
+metrics.start('team_perf', rows_in=len(drive_summary) + len(play_summary))
+team_perf = pd.merge(drive_summary, play_summary, on=['game_id', 'offense'], how='outer')
+del drive_summary, play_summary
+fill_numeric(team_perf)
+team_perf['is_home_offense'] = team_perf['is_home_offense'].fillna(0).astype(int)
+
+metrics.stop(rows_out=len(team_perf))
 
 # -------------------------
 # Step 9: Merge team_perf into games
 # -------------------------
+metrics.start('merge_features', rows_in=len(games))
+
 def prefix(df, pre):
     rename = {c: f"{pre}{c}" for c in df.columns if c not in ['game_id', 'offense']}
     return df.rename(columns=rename)
 
 home_perf = prefix(team_perf[team_perf['is_home_offense'] == 1], 'home_')
 away_perf = prefix(team_perf[team_perf['is_home_offense'] == 0], 'away_')
+perf_cols = [c for c in list(home_perf.columns) + list(away_perf.columns) if c not in ['game_id', 'offense']]
 
 games = games.merge(home_perf, left_on='id', right_on='game_id', how='left')
 games = games.merge(away_perf, left_on='id', right_on='game_id', how='left', suffixes=('', '_away'))
-games = games.fillna(0)
+games.drop(columns=['game_id', 'game_id_away', 'offense', 'offense_away'], errors='ignore', inplace=True)
+del team_perf, home_perf, away_perf
+
+# Pregame box-score form (SQLMesh cfb.cfb_team_box_stats), when the feature model has been built
+BOX_FEATURES = ['pass_yards_l3', 'rush_yards_l3', 'completion_pct_l3', 'yards_per_rush_l3', 'turnovers_l3', 'sacks_l3']
+if table_exists('cfb.cfb_team_box_stats'):
+    box = con.execute(f"""
+        SELECT game_id, team_id, {', '.join(BOX_FEATURES)}
+        FROM cfb.cfb_team_box_stats
+        WHERE team_id IS NOT NULL
+    """).df()
+    box = compact_frame(box.drop_duplicates(subset=['game_id', 'team_id']))
+    for side in ['home', 'away']:
+        side_box = box.rename(columns={'game_id': 'id', 'team_id': f'{side}_id', **{f: f'{side}_{f}' for f in BOX_FEATURES}})
+        games = games.merge(side_box, on=['id', f'{side}_id'], how='left')
+        perf_cols += [f'{side}_{f}' for f in BOX_FEATURES]
+    del box, side_box
+
+# Opponent-adjusted pregame ratings (ai.cfb_ratings → cfb.team_adjusted_ratings), when they have been solved
+ADJ_FEATURES = ['adj_off_ppa', 'adj_def_ppa', 'adj_off_success', 'adj_def_success', 'adj_off_yards', 'adj_def_yards']
+if table_exists('cfb.team_adjusted_ratings'):
+    adj = con.execute(f"""
+        SELECT game_id, team_id, {', '.join(ADJ_FEATURES)}
+        FROM cfb.team_adjusted_ratings
+    """).df()
+    adj = compact_frame(adj.drop_duplicates(subset=['game_id', 'team_id']))
+    for side in ['home', 'away']:
+        side_adj = adj.rename(columns={'game_id': 'id', 'team_id': f'{side}_id', **{f: f'{side}_{f}' for f in ADJ_FEATURES}})
+        games = games.merge(side_adj, on=['id', f'{side}_id'], how='left')
+        perf_cols += [f'{side}_{f}' for f in ADJ_FEATURES]
+    del adj, side_adj
+
+# Fill only the merged feature columns, in place (keeps compact dtypes, no full-frame copy)
+fill_numeric(games, perf_cols)
+compact_frame(games, exclude=SCORE_COLUMNS)
+print(f"Game feature frame: {len(games):,} rows, {frame_mb(games):.1f} MB")
+
+metrics.stop(rows_out=len(games))
 
 # -------------------------
 # Step 10: Rolling averages (3-game window)
 # -------------------------
+metrics.start('rolling', rows_in=len(games))
+
 def rolling_stats(df, team_col, scored_col, allowed_col):
     df[f'{team_col}_recent_scored'] = df.groupby(team_col)[scored_col].transform(
         lambda x: x.shift(1).rolling(3, min_periods=1).mean()
@@ -181,6 +323,8 @@ def rolling_stats(df, team_col, scored_col, allowed_col):
 games = rolling_stats(games, 'home_id', 'home_points', 'away_points')
 games = rolling_stats(games, 'away_id', 'away_points', 'home_points')
 
+metrics.stop(rows_out=len(games))
+
 # -------------------------
 # Step 11: Feature selection
 # -------------------------
@@ -190,8 +334,16 @@ features = [
     'away_id_recent_scored', 'away_id_recent_allowed',
     'home_drive_scoring_rate', 'away_drive_scoring_rate',
     'home_avg_yards_per_play', 'away_avg_yards_per_play',
-    'home_offense_efficiency', 'away_offense_efficiency',
-    'home_avg_ppa', 'away_avg_ppa'
+    'home_adj_off_ppa', 'home_adj_def_ppa', 'away_adj_off_ppa', 'away_adj_def_ppa',
+    'home_adj_off_success', 'home_adj_def_success', 'away_adj_off_success', 'away_adj_def_success',
+    'home_adj_off_yards', 'home_adj_def_yards', 'away_adj_off_yards', 'away_adj_def_yards',
+    'home_avg_ppa', 'away_avg_ppa',
+    'home_pass_yards_l3', 'away_pass_yards_l3',
+    'home_rush_yards_l3', 'away_rush_yards_l3',
+    'home_completion_pct_l3', 'away_completion_pct_l3',
+    'home_yards_per_rush_l3', 'away_yards_per_rush_l3',
+    'home_turnovers_l3', 'away_turnovers_l3',
+    'home_sacks_l3', 'away_sacks_l3'
 ]
 features = [f for f in features if f in games.columns]
 print("Using feature columns:", features)
@@ -199,31 +351,41 @@ print("Using feature columns:", features)
 # -------------------------
 # Step 12: Train on completed games
 # -------------------------
+metrics.start('train')
 train_data = games[games['completed'] == True].copy()
 X_train = train_data[features].fillna(0)
 y_train = train_data['home_win']
 
-clf = lgb.LGBMClassifier(n_estimators=200, learning_rate=0.05)
+MODEL_PARAMS = {"n_estimators": 200, "learning_rate": 0.05}
+MODEL_VERSION = model_version(features, MODEL_PARAMS)
+
+clf = lgb.LGBMClassifier(**MODEL_PARAMS)
 clf.fit(X_train, y_train)
 
-spread_model = lgb.LGBMRegressor(n_estimators=200, learning_rate=0.05)
+spread_model = lgb.LGBMRegressor(**MODEL_PARAMS)
 spread_model.fit(X_train, train_data['point_spread'])
 
-total_model = lgb.LGBMRegressor(n_estimators=200, learning_rate=0.05)
+total_model = lgb.LGBMRegressor(**MODEL_PARAMS)
 total_model.fit(X_train, train_data['total_points'])
 
+metrics.stop(rows_in=len(train_data))
+
 # -------------------------
 # Step 13: Predict on all games
 # -------------------------
+metrics.start('predict', rows_in=len(games))
 X_all = games[features].fillna(0)
 games['home_win_prob'] = clf.predict_proba(X_all)[:, 1]
 games['home_win_pred'] = (games['home_win_prob'] >= 0.5).astype(int)
 games['point_spread_pred'] = -spread_model.predict(X_all)
 games['total_points_pred'] = total_model.predict(X_all)
 
+metrics.stop(rows_out=len(games))
+
 # -------------------------
-# Step 14: Save predictions (only future/incomplete games)
+# Step 14: Collect predictions (only future/incomplete games)
 # -------------------------
+metrics.start('collect_preds', rows_in=len(games))
 future_games = games[games['completed'] == False].copy()
 
 pred_cols = [
@@ -236,50 +398,14 @@ preds = preds.sort_values(['season', 'week']).drop_duplicates(
     subset=['season', 'week', 'home_id', 'away_id'], keep='last'
 )
 
-con.register('___preds', preds)
-
-con.execute("""
-CREATE TABLE IF NOT EXISTS cfb.cfb_predictions (
-    season INTEGER,
-    week INTEGER,
-    home_id INTEGER,
-    away_id INTEGER,
-    home_win_pred DOUBLE,
-    home_win_prob DOUBLE,
-    point_spread_pred DOUBLE,
-    total_points_pred DOUBLE
-)
-""")
-
-# Only merge future predictions — past games stay untouched
-con.execute("""
-MERGE INTO cfb.cfb_predictions AS t
-USING (SELECT * FROM ___preds) AS s
-ON t.season = s.season
-   AND t.week = s.week
-   AND t.home_id = s.home_id
-   AND t.away_id = s.away_id
-WHEN MATCHED THEN UPDATE SET
-    home_win_pred = s.home_win_pred,
-    home_win_prob = s.home_win_prob,
-    point_spread_pred = s.point_spread_pred,
-    total_points_pred = s.total_points_pred
-WHEN NOT MATCHED THEN INSERT (
-    season, week, home_id, away_id,
-    home_win_pred, home_win_prob, point_spread_pred, total_points_pred
-)
-VALUES (
-    s.season, s.week, s.home_id, s.away_id,
-    s.home_win_pred, s.home_win_prob, s.point_spread_pred, s.total_points_pred
-)
-""")
+print(f"Prepared {len(preds)} future predictions (run {RUN_ID}, model {MODEL_VERSION})")
 
-con.unregister('___preds')
-print(f"✅ Merged {len(preds)} future predictions into cfb.cfb_predictions")
+metrics.stop(rows_out=len(preds))
 
 # -------------------------
 # Step 15: Evaluate model (on completed games)
 # -------------------------
+metrics.start('evaluate', rows_in=len(train_data))
 if len(y_train.unique()) > 1:
     acc = accuracy_score(y_train, train_data['home_win_pred'] if 'home_win_pred' in train_data else clf.predict(X_train))
     auc = roc_auc_score(y_train, train_data['home_win_prob'] if 'home_win_prob' in train_data else clf.predict_proba(X_train)[:,1])
@@ -290,87 +416,51 @@ else:
     print("\n⚠️ Only one class in training — metrics not computed.")
 
 eval_df = pd.DataFrame({
-    "timestamp": [datetime.now()],
+    "timestamp": [RUN_TS],
     "accuracy": [acc],
     "auc": [auc],
     "log_loss": [loss],
     "rows_trained": [len(train_data)]
 })
-con.register("___eval", eval_df)
-con.execute("CREATE OR REPLACE TABLE cfb.model_eval AS SELECT * FROM ___eval")
-con.unregister("___eval")
-print("✅ Evaluation saved in DuckDB (cfb.model_eval)")
+
+metrics.stop(rows_out=len(eval_df))
 
 # -------------------------
-# Step 16: Evaluate betting edges
+# Step 16: Save run — predictions, evaluation and betting edges (every provider + consensus)
 # -------------------------
-BETTING_PROVIDER = "DraftKings"
-
-# Pull lines
-lines = con.execute(f"""
-    SELECT
-        home_team_id,
-        home_team,
-        away_team_id,
-        away_team,
-        spread AS vegas_spread,
-        week,
-        season
-    FROM cfb.cfb_lines
-    WHERE provider = '{BETTING_PROVIDER}'
-""").df()
+# Append-only: one transaction, bulk Arrow inserts, history keyed by run_id/season/week.
+# cfb.cfb_predictions / cfb.model_eval / cfb.ai_best_bets are "latest" tables upserted with it.
+metrics.start('save_run', rows_in=len(preds))
+written = save_run(con, RUN_ID, RUN_TS, MODEL_VERSION, preds, eval_df, EDGE_THRESHOLD)
+metrics.stop(rows_out=sum(written.values()))
 
-# Pull predictions
-future_preds = con.execute("SELECT * FROM cfb.cfb_predictions").df()
+print(f"✅ Appended run {RUN_ID} to DuckDB:")
+for table, rows in written.items():
+    print(f"   {table}: {rows} rows")
+print(f"   (edge threshold {EDGE_THRESHOLD:.1f} pts)")
 
-# Merge predictions with lines
-future_preds = future_preds.merge(
-    lines,
-    left_on=['home_id', 'away_id', 'week'],
-    right_on=['home_team_id', 'away_team_id', 'week'],
-    how='left',
-    suffixes=('', '_line')
+# -------------------------
+# Step 17: Feature attributions for the predicted games (cfb.ai_attributions)
+# -------------------------
+metrics.start('attributions', rows_in=len(preds))
+explained_games = future_games.loc[preds.index]
+recomputed = save_attributions(
+    con, {'win': clf, 'spread': spread_model, 'total': total_model}, explained_games, features,
+    RUN_ID, MODEL_VERSION,
 )
+metrics.stop(rows_out=recomputed)
+print(f"✅ Attributions recomputed for {recomputed} of {len(explained_games)} games ({ATTRIBUTIONS_TABLE})")
 
-# Generate AI recommendation
-def recommend_cover(row):
-    predicted_margin = row['point_spread_pred']  # negative = home favored
-    vegas_margin = row['vegas_spread']          # negative = home favored
-
-    if pd.isna(predicted_margin) or pd.isna(vegas_margin):
-        return None
-
-    if predicted_margin < vegas_margin - 1:
-        # Home expected to cover
-        covering_team = row['home_team']
-        spread_to_show = vegas_margin  # keep Vegas sign
-    elif predicted_margin > vegas_margin + 1:
-        # Away expected to cover
-        covering_team = row['away_team']
-        spread_to_show = -vegas_margin  # flip sign to show away covering
-    else:
-        return "Too close to call"
-
-    return f"{covering_team} covers {spread_to_show:+.1f}"
-
-future_preds['ai_recommendation'] = future_preds.apply(recommend_cover, axis=1)
+# -------------------------
+# Step 18: Stage metrics (cfb.ai_run_metrics)
+# -------------------------
+metrics.report()
+metrics.save(con)
+print(f"✅ Stage metrics saved in DuckDB ({METRICS_TABLE})")
 
-# Keep only relevant columns
-best_bets_cols = [
-    'season', 'week', 'home_id', 'away_id',
-    'home_team', 'away_team',
-    'point_spread_pred', 'vegas_spread',
-    'ai_recommendation'
-]
-best_bets = future_preds[best_bets_cols]
-
-# Save to DuckDB
-con.register("___best_bets", best_bets)
-con.execute("""
-CREATE OR REPLACE TABLE cfb.ai_best_bets AS
-SELECT *
-FROM ___best_bets
-""")
-con.unregister("___best_bets")
-
-print("✅ AI best bets saved in DuckDB (cfb.ai_best_bets)")
+# -------------------------
+# Step 19: Publish a read-only snapshot for the dashboard and other readers
+# -------------------------
+con.close()
+if os.getenv("CFB_AI_PUBLISH_SNAPSHOT", "1") != "0":  # the orchestrator publishes once at the end
+    publish_snapshot(source_db=DB_PATH)
@@ -0,0 +1,91 @@
+# cfb_edges.py
+"""
+Betting edge engine:
+- Compare model spread/total predictions against every provider in cfb.cfb_lines
+- Add a "consensus" line (median across providers) per game
+- Compute spread and total edges + recommendations in a single DuckDB query
+- Only the games in the predictions relation are scored; ai.cfb_history appends
+  them per run, so untouched season/weeks are never rewritten
+"""
+
+import os
+
+# Minimum edge (in points) before the model takes a side
+EDGE_THRESHOLD = float(os.getenv("CFB_EDGE_THRESHOLD", "1.0"))
+CONSENSUS_PROVIDER = "consensus"
+
+
+def edges_query(predictions: str) -> str:
+    """
+    Build the edge query for a predictions relation (table, view or registered frame).
+    The edge threshold is bound as the named `$threshold` parameter.
+
+    Sign conventions (negative = home favored for both spreads):
+    - spread_edge > 0 -> home side has value, spread_edge < 0 -> away side has value
+    - total_edge > 0  -> over has value,      total_edge < 0  -> under has value
+    """
+    return f"""
+    WITH preds AS (
+        SELECT season, week, home_id, away_id, point_spread_pred, total_points_pred
+        FROM {predictions}
+    ),
+    provider_lines AS (
+        SELECT
+            l.season,
+            l.week,
+            l.home_id,
+            l.away_id,
+            l.line_provider,
+            l.spread_close AS vegas_spread,
+            l.over_under_close AS vegas_total
+        FROM cfb.cfb_lines l
+        SEMI JOIN preds p USING (season, week, home_id, away_id)
+        WHERE l.spread_close IS NOT NULL OR l.over_under_close IS NOT NULL
+    ),
+    all_lines AS (
+        SELECT * FROM provider_lines
+        UNION ALL
+        SELECT
+            season, week, home_id, away_id,
+            '{CONSENSUS_PROVIDER}' AS line_provider,
+            MEDIAN(vegas_spread) AS vegas_spread,
+            MEDIAN(vegas_total) AS vegas_total
+        FROM provider_lines
+        GROUP BY season, week, home_id, away_id
+    ),
+    edges AS (
+        SELECT
+            p.season,
+            p.week,
+            p.home_id,
+            p.away_id,
+            ht.team_name AS home_team,
+            vt.team_name AS away_team,
+            l.line_provider,
+            p.point_spread_pred,
+            l.vegas_spread,
+            l.vegas_spread - p.point_spread_pred AS spread_edge,
+            p.total_points_pred,
+            l.vegas_total,
+            p.total_points_pred - l.vegas_total AS total_edge
+        FROM preds p
+        LEFT JOIN all_lines l USING (season, week, home_id, away_id)
+        LEFT JOIN cfb.cfb_teams ht ON ht.team_id = p.home_id AND ht.season = p.season
+        LEFT JOIN cfb.cfb_teams vt ON vt.team_id = p.away_id AND vt.season = p.season
+    )
+    SELECT
+        *,
+        CASE
+            WHEN spread_edge IS NULL THEN NULL
+            WHEN spread_edge > $threshold THEN CONCAT(home_team, ' covers ', PRINTF('%+.1f', vegas_spread))
+            WHEN spread_edge < -$threshold THEN CONCAT(away_team, ' covers ', PRINTF('%+.1f', -vegas_spread))
+            ELSE 'Too close to call'
+        END AS ai_recommendation,
+        CASE
+            WHEN total_edge IS NULL THEN NULL
+            WHEN total_edge > $threshold THEN CONCAT('Over ', PRINTF('%.1f', vegas_total))
+            WHEN total_edge < -$threshold THEN CONCAT('Under ', PRINTF('%.1f', vegas_total))
+            ELSE 'Too close to call'
+        END AS ai_total_recommendation
+    FROM edges
+    """
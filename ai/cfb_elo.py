@@ -0,0 +1,274 @@
+# cfb_elo.py
+"""
+In-house Elo ratings over the full cfb.cfb_games history:
+- Games are processed in rounds (season, regular/postseason, week); every game
+  in a round is rated in one NumPy pass with np.add.at updates
+- Tunable K-factor, home-field advantage, margin-of-victory multiplier and
+  between-season reversion (ELO_PARAMS)
+- FBS / non-FBS teams start from different baselines (cfb.cfb_teams.division)
+- Incremental: the rating state after the last fully completed round is kept in
+  cfb.elo_state, so a refresh only replays rounds after that watermark
+- Outputs pregame ratings per game (cfb.game_elo) and per team-week (cfb.team_elo)
+
+Run with: python -m ai.cfb_elo            (incremental)
+          python -m ai.cfb_elo --full     (rebuild from scratch)
+"""
+
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from ai.cfb_history import model_version
+from shared.rounds import round_key_sql
+
+DB_PATH = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+
+ELO_PARAMS: Dict[str, float] = {
+    "k": 25.0,
+    "home_field": 55.0,
+    "season_revert": 0.33,   # share of the distance back to baseline at each new season
+    "mov_scale": 2.2,        # margin-of-victory autocorrelation damping
+    "fbs_initial": 1500.0,
+    "other_initial": 1200.0,
+}
+
+GAME_ELO_TABLE = "cfb.game_elo"
+TEAM_ELO_TABLE = "cfb.team_elo"
+STATE_TABLE = "cfb.elo_state"
+
+# Postseason rounds sort after every regular-season week of the same season
+ROUND_KEY_SQL = round_key_sql()
+
+
+def load_games(con, after_round: int = -1) -> pd.DataFrame:
+    """Games after `after_round`, in rating order."""
+    return con.execute(f"""
+        SELECT *
+        FROM (
+            SELECT
+                game_id,
+                season,
+                week,
+                {ROUND_KEY_SQL} AS round_key,
+                home_id,
+                away_id,
+                home_points,
+                away_points,
+                COALESCE(neutral_site, FALSE) AS neutral_site,
+                COALESCE(game_completed, FALSE)
+                    AND home_points IS NOT NULL AND away_points IS NOT NULL AS completed,
+                start_date
+            FROM cfb.cfb_games
+            WHERE home_id IS NOT NULL AND away_id IS NOT NULL AND week IS NOT NULL
+        )
+        WHERE round_key > ?
+        ORDER BY round_key, start_date, game_id
+    """, [after_round]).df()
+
+
+def load_baselines(con, params: Dict[str, float] = ELO_PARAMS) -> Dict[int, float]:
+    """Starting rating per team from its most recent division."""
+    rows = con.execute("""
+        SELECT team_id, ARG_MAX(division, season) AS division
+        FROM cfb.cfb_teams
+        GROUP BY team_id
+    """).fetchall()
+    return {
+        int(team_id): params["fbs_initial"] if str(division).lower() == "fbs" else params["other_initial"]
+        for team_id, division in rows
+    }
+
+
+def load_state(con, params_hash: str):
+    """(ratings by team, watermark round, last season) or None when a rebuild is needed."""
+    exists = con.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = 'cfb' AND table_name = 'elo_state'
+    """).fetchone()[0]
+    if not exists:
+        return None
+
+    state = con.execute(f"SELECT team_id, rating, watermark, last_season, params_hash FROM {STATE_TABLE}").df()
+    if state.empty or (state['params_hash'] != params_hash).any():
+        return None
+
+    ratings = dict(zip(state['team_id'].astype(int), state['rating'].astype(float)))
+    last_season = int(state['last_season'].iloc[0])
+    return ratings, int(state['watermark'].iloc[0]), None if last_season < 0 else last_season
+
+
+def compute_elo(
+    games: pd.DataFrame,
+    baselines: Dict[int, float],
+    params: Dict[str, float] = ELO_PARAMS,
+    state: Optional[tuple] = None,
+):
+    """
+    Rate `games` (sorted by round_key) starting from `state`.
+    Returns (games with pre/postgame ratings, new state tuple).
+    """
+    start_ratings, _, last_season = state if state else ({}, -1, None)
+
+    team_ids = np.unique(np.concatenate([
+        games['home_id'].to_numpy(dtype=np.int64),
+        games['away_id'].to_numpy(dtype=np.int64),
+        np.fromiter(start_ratings.keys(), dtype=np.int64, count=len(start_ratings)),
+    ]))
+    base = np.array([baselines.get(int(t), params["other_initial"]) for t in team_ids])
+    ratings = np.array([start_ratings.get(int(t), b) for t, b in zip(team_ids, base)])
+
+    home = np.searchsorted(team_ids, games['home_id'].to_numpy(dtype=np.int64))
+    away = np.searchsorted(team_ids, games['away_id'].to_numpy(dtype=np.int64))
+    rounds = games['round_key'].to_numpy(dtype=np.int64)
+    seasons = games['season'].to_numpy(dtype=np.int64)
+    completed = games['completed'].to_numpy(dtype=bool)
+    neutral = games['neutral_site'].to_numpy(dtype=bool)
+    margin = (games['home_points'].astype(float) - games['away_points'].astype(float)).to_numpy()
+    hfa = np.where(neutral, 0.0, params["home_field"])
+
+    n = len(games)
+    home_pre, away_pre = np.empty(n), np.empty(n)
+    home_post, away_post = np.empty(n), np.empty(n)
+    home_prob = np.empty(n)
+
+    # The new watermark is the last round before the first round with unfinished games
+    incomplete_rounds = rounds[~completed]
+    done_rounds = rounds[rounds < incomplete_rounds.min()] if len(incomplete_rounds) else rounds
+    watermark = int(done_rounds.max()) if len(done_rounds) else (state[1] if state else -1)
+    snapshot = (ratings.copy(), last_season)
+
+    bounds = np.flatnonzero(np.diff(rounds)) + 1
+    for sl in np.split(np.arange(n), bounds):
+        if not len(sl):
+            continue
+        season = seasons[sl[0]]
+        if last_season is not None and season != last_season:
+            ratings = base + (ratings - base) * (1 - params["season_revert"])
+        last_season = season
+
+        h, a = home[sl], away[sl]
+        rh, ra = ratings[h], ratings[a]
+        diff = rh + hfa[sl] - ra
+        expected = 1.0 / (1.0 + 10 ** (-diff / 400.0))
+        home_pre[sl], away_pre[sl], home_prob[sl] = rh, ra, expected
+
+        done = completed[sl]
+        m = np.nan_to_num(margin[sl])
+        result = np.where(m > 0, 1.0, np.where(m < 0, 0.0, 0.5))
+        # 538-style multiplier: bigger wins count more, less so for heavy favourites
+        winner_diff = np.where(m >= 0, diff, -diff)
+        mult = np.log(np.abs(m) + 1) * params["mov_scale"] / (winner_diff * 0.001 + params["mov_scale"])
+        delta = np.where(done, params["k"] * mult * (result - expected), 0.0)
+        np.add.at(ratings, h, delta)
+        np.add.at(ratings, a, -delta)
+        home_post[sl], away_post[sl] = ratings[h], ratings[a]
+
+        if rounds[sl[0]] == watermark:
+            snapshot = (ratings.copy(), last_season)
+
+    rated = games.assign(
+        home_pregame_elo=home_pre,
+        away_pregame_elo=away_pre,
+        home_postgame_elo=home_post,
+        away_postgame_elo=away_post,
+        home_win_prob_elo=home_prob,
+    )
+    snap_ratings, snap_season = snapshot
+    new_state = (
+        dict(zip(team_ids.tolist(), snap_ratings.tolist())),
+        watermark,
+        -1 if snap_season is None else int(snap_season),
+    )
+    return rated, new_state
+
+
+def save_elo(con, rated: pd.DataFrame, state: tuple, after_round: int, params_hash: str) -> None:
+    """Replace rows after the previous watermark and store the new state, in one transaction."""
+    game_rows = rated[[
+        'game_id', 'season', 'week', 'round_key', 'home_id', 'away_id',
+        'home_pregame_elo', 'away_pregame_elo', 'home_postgame_elo', 'away_postgame_elo', 'home_win_prob_elo',
+    ]]
+    team_rows = pd.concat([
+        rated[['season', 'week', 'round_key', 'game_id', 'home_id', 'home_pregame_elo', 'home_postgame_elo']]
+        .set_axis(['season', 'week', 'round_key', 'game_id', 'team_id', 'pregame_elo', 'postgame_elo'], axis=1),
+        rated[['season', 'week', 'round_key', 'game_id', 'away_id', 'away_pregame_elo', 'away_postgame_elo']]
+        .set_axis(['season', 'week', 'round_key', 'game_id', 'team_id', 'pregame_elo', 'postgame_elo'], axis=1),
+    ], ignore_index=True).sort_values(['round_key', 'team_id'])
+    ratings, watermark, last_season = state
+    state_rows = pd.DataFrame({
+        'team_id': list(ratings.keys()),
+        'rating': list(ratings.values()),
+        'watermark': watermark,
+        'last_season': last_season,
+        'params_hash': params_hash,
+        'updated_at': datetime.now(),
+    })
+
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {GAME_ELO_TABLE} (
+        game_id BIGINT, season INTEGER, week INTEGER, round_key BIGINT,
+        home_id INTEGER, away_id INTEGER,
+        home_pregame_elo DOUBLE, away_pregame_elo DOUBLE,
+        home_postgame_elo DOUBLE, away_postgame_elo DOUBLE,
+        home_win_prob_elo DOUBLE
+    )""")
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {TEAM_ELO_TABLE} (
+        season INTEGER, week INTEGER, round_key BIGINT, game_id BIGINT,
+        team_id INTEGER, pregame_elo DOUBLE, postgame_elo DOUBLE
+    )""")
+
+    con.register('___game_elo', pa.Table.from_pandas(game_rows, preserve_index=False))
+    con.register('___team_elo', pa.Table.from_pandas(team_rows, preserve_index=False))
+    con.register('___elo_state', pa.Table.from_pandas(state_rows, preserve_index=False))
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"DELETE FROM {GAME_ELO_TABLE} WHERE round_key > ?", [after_round])
+        con.execute(f"DELETE FROM {TEAM_ELO_TABLE} WHERE round_key > ?", [after_round])
+        con.execute(f"INSERT INTO {GAME_ELO_TABLE} BY NAME SELECT * FROM ___game_elo")
+        con.execute(f"INSERT INTO {TEAM_ELO_TABLE} BY NAME SELECT * FROM ___team_elo")
+        con.execute(f"CREATE OR REPLACE TABLE {STATE_TABLE} AS SELECT * FROM ___elo_state")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister('___game_elo')
+        con.unregister('___team_elo')
+        con.unregister('___elo_state')
+
+
+def update_elo(con, params: Dict[str, float] = ELO_PARAMS, full: bool = False) -> int:
+    """Replay rounds after the stored watermark (or everything). Returns games rated."""
+    params_hash = model_version([], params)
+    state = None if full else load_state(con, params_hash)
+    after_round = state[1] if state else -1
+
+    games = load_games(con, after_round)
+    if games.empty:
+        return 0
+
+    rated, new_state = compute_elo(games, load_baselines(con, params), params, state)
+    save_elo(con, rated, new_state, after_round, params_hash)
+    return len(rated)
+
+
+def run_elo(database: str = DB_PATH, full: bool = False) -> None:
+    con = duckdb.connect(database=database, read_only=False)
+    try:
+        started = datetime.now()
+        rated = update_elo(con, full=full)
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"✅ Rated {rated:,} games in {elapsed:.2f}s → {GAME_ELO_TABLE}, {TEAM_ELO_TABLE}")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    run_elo(full="--full" in sys.argv[1:])
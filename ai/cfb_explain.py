@@ -0,0 +1,174 @@
+# cfb_explain.py
+"""
+Per-prediction feature attributions for the cfb_ai models:
+- LightGBM pred_contrib (TreeSHAP) for the win, spread and total models, one
+  batched call per model over every game that needs (re)computing
+- Stored long-format in cfb.ai_attributions: one row per (game, target, feature),
+  plus a '(bias)' row, so contributions + bias add up to the prediction
+  (win: log-odds of a home win; spread/total: points, same sign as the predictions)
+- A game is recomputed only when its feature values or the fitted models changed;
+  model_version here is a hash of the fitted trees, not just the config. Each row
+  also carries the run_id and prediction_model_version of the cfb_ai run it explains
+  (ai.cfb_history), so it joins to cfb.cfb_predictions and its history
+- Rows are written in game_id order with an index on game_id, so
+  the drivers of one matchup are a single indexed lookup
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+ATTRIBUTIONS_TABLE = "cfb.ai_attributions"
+BIAS_FEATURE = "(bias)"
+
+ATTRIBUTIONS_DDL = f"""
+CREATE TABLE IF NOT EXISTS {ATTRIBUTIONS_TABLE} (
+    game_id BIGINT,
+    model_version VARCHAR,
+    run_id VARCHAR,
+    prediction_model_version VARCHAR,
+    season INTEGER,
+    week INTEGER,
+    home_id INTEGER,
+    away_id INTEGER,
+    target VARCHAR,
+    feature VARCHAR,
+    feature_value DOUBLE,
+    contribution DOUBLE,
+    features_hash UBIGINT,
+    computed_at TIMESTAMP
+)"""
+# Tables created before runs were recorded gain the columns in place
+ATTRIBUTIONS_RUN_COLUMNS = ("run_id", "prediction_model_version")
+ATTRIBUTIONS_INDEX = f"CREATE INDEX IF NOT EXISTS ai_attributions_game_idx ON {ATTRIBUTIONS_TABLE} (game_id)"
+
+# pred_contrib explains the raw model output; the spread model predicts home - away
+# while point_spread_pred is stored negated (line convention), so its sign flips too
+TARGET_SIGN = {"win": 1.0, "spread": -1.0, "total": 1.0}
+
+
+def fitted_model_version(models: Dict[str, object]) -> str:
+    """Short hash of the fitted boosters (trees included), so a retrain on new data is a new version."""
+    digest = hashlib.sha1()
+    for target in sorted(models):
+        digest.update(target.encode("utf-8"))
+        digest.update(models[target].booster_.model_to_string().encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def ensure_attributions_table(con) -> None:
+    con.execute("CREATE SCHEMA IF NOT EXISTS cfb")
+    con.execute(ATTRIBUTIONS_DDL)
+    for column in ATTRIBUTIONS_RUN_COLUMNS:
+        con.execute(f"ALTER TABLE {ATTRIBUTIONS_TABLE} ADD COLUMN IF NOT EXISTS {column} VARCHAR")
+    con.execute(ATTRIBUTIONS_INDEX)
+
+
+def _long_format(target: str, contrib: np.ndarray, X: np.ndarray, keys: pd.DataFrame, features: List[str]) -> pa.Table:
+    """(n_games, n_features + 1) contributions -> one row per game and feature (bias last)."""
+    n, width = contrib.shape
+    values = np.column_stack([X, np.full(n, np.nan)])
+
+    def repeat(col):
+        return np.repeat(keys[col].to_numpy(), width)
+
+    return pa.table({
+        "game_id": repeat("game_id"),
+        "season": repeat("season"),
+        "week": repeat("week"),
+        "home_id": repeat("home_id"),
+        "away_id": repeat("away_id"),
+        "features_hash": repeat("features_hash"),
+        "target": np.full(n * width, target),
+        "feature": np.tile(np.array(features + [BIAS_FEATURE]), n),
+        "feature_value": values.ravel(),
+        "contribution": (contrib * TARGET_SIGN[target]).ravel(),
+    })
+
+
+def save_attributions(
+    con,
+    models: Dict[str, object],
+    games: pd.DataFrame,
+    features: List[str],
+    run_id: str,
+    prediction_version: str,
+) -> int:
+    """
+    Compute and store attributions for `games` (one row per game, with id, season, week,
+    home_id, away_id and the model features) whose features or fitted models changed.
+    `models` maps target ('win', 'spread', 'total') to a fitted LightGBM sklearn model;
+    `run_id` / `prediction_version` are the cfb_ai run and its ai.cfb_history.model_version,
+    stamped on every game's rows (unchanged games are re-stamped, not recomputed).
+    Returns the number of games recomputed.
+    """
+    ensure_attributions_table(con)
+    version = fitted_model_version(models)
+
+    X_all = games[features].fillna(0)
+    keys = pd.DataFrame({
+        "game_id": games["id"].to_numpy(dtype=np.int64),
+        "season": games["season"].to_numpy(),
+        "week": games["week"].to_numpy(),
+        "home_id": games["home_id"].to_numpy(),
+        "away_id": games["away_id"].to_numpy(),
+        "features_hash": pd.util.hash_pandas_object(X_all, index=False).to_numpy(),
+    })
+
+    con.register("___attr_keys", pa.Table.from_pandas(keys[["game_id", "features_hash"]], preserve_index=False))
+    try:
+        current = {
+            row[0] for row in con.execute(f"""
+                SELECT DISTINCT a.game_id
+                FROM {ATTRIBUTIONS_TABLE} a
+                JOIN ___attr_keys k ON k.game_id = a.game_id AND k.features_hash = a.features_hash
+                WHERE a.model_version = ?
+            """, [version]).fetchall()
+        }
+    finally:
+        con.unregister("___attr_keys")
+
+    run = {"run_id": run_id, "prediction_version": prediction_version}
+    if current:
+        con.execute(f"""
+            UPDATE {ATTRIBUTIONS_TABLE}
+            SET run_id = $run_id, prediction_model_version = $prediction_version
+            WHERE game_id IN (SELECT UNNEST($game_ids))
+        """, {**run, "game_ids": sorted(current)})
+
+    stale = ~keys["game_id"].isin(current).to_numpy()
+    if not stale.any():
+        return 0
+    keys = keys[stale].reset_index(drop=True)
+    X = X_all[stale].to_numpy(dtype=np.float64)
+
+    # One vectorized TreeSHAP pass per model over all stale games
+    long_tables = [
+        _long_format(target, model.booster_.predict(X, pred_contrib=True), X, keys, features)
+        for target, model in models.items()
+    ]
+    rows = pa.concat_tables(long_tables)
+
+    con.register("___attributions", rows)
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"DELETE FROM {ATTRIBUTIONS_TABLE} WHERE game_id IN (SELECT UNNEST(?))", [keys["game_id"].tolist()])
+        con.execute(f"""
+            INSERT INTO {ATTRIBUTIONS_TABLE} BY NAME
+            SELECT *, $version AS model_version, $run_id AS run_id,
+                   $prediction_version AS prediction_model_version, $computed_at AS computed_at
+            FROM ___attributions
+            ORDER BY game_id, target, ABS(contribution) DESC
+        """, {**run, "version": version, "computed_at": datetime.now()})
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister("___attributions")
+
+    return len(keys)
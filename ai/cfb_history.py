@@ -0,0 +1,256 @@
+# cfb_history.py
+"""
+Append-only, run-versioned storage for cfb_ai outputs:
+- cfb.cfb_predictions_history / cfb.model_eval_history / cfb.ai_best_bets_history
+  keep every run, keyed by (run_id, season, week) and written in that order
+- cfb.cfb_predictions / cfb.model_eval / cfb.ai_best_bets hold the latest run
+  per game (or the latest evaluation); they are upserted with each run, so
+  readers get a small table instead of a window over the whole history
+- A run is written as bulk Arrow inserts inside a single transaction
+"""
+
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List
+
+import pyarrow as pa
+
+from ai.cfb_edges import EDGE_THRESHOLD, edges_query
+
+PREDICTIONS_HISTORY = "cfb.cfb_predictions_history"
+EVAL_HISTORY = "cfb.model_eval_history"
+BEST_BETS_HISTORY = "cfb.ai_best_bets_history"
+
+LEGACY_RUN_ID = "legacy"
+
+_RUN_COLUMNS = """
+    run_id VARCHAR,
+    run_ts TIMESTAMP,
+    model_version VARCHAR,
+"""
+
+HISTORY_DDL = {
+    PREDICTIONS_HISTORY: f"""
+    CREATE TABLE IF NOT EXISTS {PREDICTIONS_HISTORY} ({_RUN_COLUMNS}
+        season INTEGER,
+        week INTEGER,
+        home_id INTEGER,
+        away_id INTEGER,
+        home_win_pred DOUBLE,
+        home_win_prob DOUBLE,
+        point_spread_pred DOUBLE,
+        total_points_pred DOUBLE
+    )""",
+    EVAL_HISTORY: f"""
+    CREATE TABLE IF NOT EXISTS {EVAL_HISTORY} ({_RUN_COLUMNS}
+        accuracy DOUBLE,
+        auc DOUBLE,
+        log_loss DOUBLE,
+        rows_trained BIGINT
+    )""",
+    BEST_BETS_HISTORY: f"""
+    CREATE TABLE IF NOT EXISTS {BEST_BETS_HISTORY} ({_RUN_COLUMNS}
+        season INTEGER,
+        week INTEGER,
+        home_id INTEGER,
+        away_id INTEGER,
+        home_team VARCHAR,
+        away_team VARCHAR,
+        line_provider VARCHAR,
+        point_spread_pred DOUBLE,
+        vegas_spread DOUBLE,
+        spread_edge DOUBLE,
+        total_points_pred DOUBLE,
+        vegas_total DOUBLE,
+        total_edge DOUBLE,
+        ai_recommendation VARCHAR,
+        ai_total_recommendation VARCHAR
+    )""",
+}
+
+# Latest run per game, kept as small tables next to the history and upserted by
+# save_run in the same transaction, so readers never window over the full history.
+# These queries only (re)build them once, when the tables don't exist yet.
+LATEST_SELECTS = {
+    "cfb.cfb_predictions": f"""
+    SELECT * EXCLUDE (run_ts)
+    FROM {PREDICTIONS_HISTORY}
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY season, week, home_id, away_id
+        ORDER BY run_ts DESC, run_id DESC
+    ) = 1
+    ORDER BY season, week, home_id, away_id""",
+    "cfb.model_eval": f"""
+    SELECT run_id, model_version, run_ts AS "timestamp", accuracy, auc, log_loss, rows_trained
+    FROM {EVAL_HISTORY}
+    QUALIFY run_ts = MAX(run_ts) OVER ()""",
+    # rank() keeps every provider row written by that run
+    "cfb.ai_best_bets": f"""
+    SELECT * EXCLUDE (run_ts)
+    FROM {BEST_BETS_HISTORY}
+    QUALIFY RANK() OVER (
+        PARTITION BY season, week, home_id, away_id
+        ORDER BY run_ts DESC, run_id DESC
+    ) = 1
+    ORDER BY season, week, home_id, away_id""",
+}
+GAME_KEY = "(season, week, home_id, away_id)"
+
+
+def new_run_id(run_ts: datetime) -> str:
+    """Sortable, collision-safe run identifier."""
+    return f"{run_ts:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def model_version(features: List[str], params: Dict[str, Any]) -> str:
+    """Short hash of the feature set + hyperparameters, stable across runs."""
+    payload = json.dumps({"features": list(features), "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+def _table_type(con, qualified_name: str):
+    schema, name = qualified_name.split(".")
+    row = con.execute("""
+        SELECT table_type
+        FROM information_schema.tables
+        WHERE table_schema = ? AND table_name = ?
+    """, [schema, name]).fetchone()
+    return row[0] if row else None
+
+
+def _table_columns(con, qualified_name: str) -> set:
+    schema, name = qualified_name.split(".")
+    return {
+        row[0] for row in con.execute("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = ? AND table_name = ?
+        """, [schema, name]).fetchall()
+    }
+
+
+def _is_legacy_table(con, qualified_name: str) -> bool:
+    """The pre-history rewrite-in-place tables are the only base tables without run_id."""
+    return _table_type(con, qualified_name) == "BASE TABLE" and "run_id" not in _table_columns(con, qualified_name)
+
+
+def _migrate_legacy_tables(con) -> None:
+    """Fold the old rewrite-in-place tables into history so the names can hold the latest run."""
+    if _is_legacy_table(con, "cfb.cfb_predictions"):
+        con.execute(f"""
+            INSERT INTO {PREDICTIONS_HISTORY} BY NAME
+            SELECT '{LEGACY_RUN_ID}' AS run_id, TIMESTAMP '1970-01-01' AS run_ts,
+                   '{LEGACY_RUN_ID}' AS model_version, *
+            FROM cfb.cfb_predictions
+        """)
+        con.execute("DROP TABLE cfb.cfb_predictions")
+
+    if _is_legacy_table(con, "cfb.model_eval"):
+        con.execute(f"""
+            INSERT INTO {EVAL_HISTORY} BY NAME
+            SELECT '{LEGACY_RUN_ID}' AS run_id, "timestamp" AS run_ts,
+                   '{LEGACY_RUN_ID}' AS model_version,
+                   accuracy, auc, log_loss, rows_trained
+            FROM cfb.model_eval
+        """)
+        con.execute("DROP TABLE cfb.model_eval")
+
+    if _is_legacy_table(con, "cfb.ai_best_bets"):
+        # The pre-provider layout is fully recomputable, only keep multi-provider rows
+        if "line_provider" in _table_columns(con, "cfb.ai_best_bets"):
+            con.execute(f"""
+                INSERT INTO {BEST_BETS_HISTORY} BY NAME
+                SELECT '{LEGACY_RUN_ID}' AS run_id, TIMESTAMP '1970-01-01' AS run_ts,
+                       '{LEGACY_RUN_ID}' AS model_version, *
+                FROM cfb.ai_best_bets
+            """)
+        con.execute("DROP TABLE cfb.ai_best_bets")
+
+
+def ensure_history_tables(con) -> None:
+    """Create history + latest tables, migrating legacy tables and the old latest views once."""
+    con.execute("CREATE SCHEMA IF NOT EXISTS cfb")
+    for ddl in HISTORY_DDL.values():
+        con.execute(ddl)
+    _migrate_legacy_tables(con)
+    for name, select in LATEST_SELECTS.items():
+        if _table_type(con, name) == "VIEW":
+            con.execute(f"DROP VIEW {name}")
+        if _table_type(con, name) is None:
+            con.execute(f"CREATE TABLE {name} AS {select}")
+
+
+def save_run(
+    con,
+    run_id: str,
+    run_ts: datetime,
+    version: str,
+    preds,
+    eval_df,
+    edge_threshold: float = EDGE_THRESHOLD,
+) -> Dict[str, int]:
+    """
+    Append one run's predictions, evaluation and best bets in a single transaction.
+    `preds` / `eval_df` are pandas frames; they are handed to DuckDB as Arrow tables.
+    Returns the number of rows written per history table.
+    """
+    ensure_history_tables(con)
+
+    run_cols = {"run_id": run_id, "run_ts": run_ts, "model_version": version}
+    preds_arrow = pa.Table.from_pandas(
+        preds.sort_values(["season", "week", "home_id", "away_id"]).assign(**run_cols),
+        preserve_index=False,
+    )
+    eval_arrow = pa.Table.from_pandas(
+        eval_df.drop(columns=["timestamp"], errors="ignore").assign(**run_cols),
+        preserve_index=False,
+    )
+
+    con.register("___run_preds", preds_arrow)
+    con.register("___run_eval", eval_arrow)
+    try:
+        # Edges are computed once; the history and latest tables are both filled from this relation
+        bets_arrow = con.execute(f"""
+            SELECT $run_id AS run_id, $run_ts AS run_ts, $model_version AS model_version, e.*
+            FROM ({edges_query('___run_preds')}) e
+            ORDER BY e.season, e.week, e.home_id, e.away_id
+        """, {**run_cols, "threshold": edge_threshold}).to_arrow_table()
+        con.register("___run_bets", bets_arrow)
+    except Exception:
+        con.unregister("___run_preds")
+        con.unregister("___run_eval")
+        raise
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"INSERT INTO {PREDICTIONS_HISTORY} BY NAME SELECT * FROM ___run_preds")
+        con.execute(f"INSERT INTO {EVAL_HISTORY} BY NAME SELECT * FROM ___run_eval")
+        con.execute(f"INSERT INTO {BEST_BETS_HISTORY} BY NAME SELECT * FROM ___run_bets")
+
+        # This run is now the latest for every game it touched
+        con.execute(f"DELETE FROM cfb.cfb_predictions WHERE {GAME_KEY} IN (SELECT {GAME_KEY} FROM ___run_preds)")
+        con.execute("INSERT INTO cfb.cfb_predictions BY NAME SELECT * EXCLUDE (run_ts) FROM ___run_preds")
+        con.execute(f"DELETE FROM cfb.ai_best_bets WHERE {GAME_KEY} IN (SELECT {GAME_KEY} FROM ___run_bets)")
+        con.execute("INSERT INTO cfb.ai_best_bets BY NAME SELECT * EXCLUDE (run_ts) FROM ___run_bets")
+        con.execute("DELETE FROM cfb.model_eval")
+        con.execute("""
+            INSERT INTO cfb.model_eval BY NAME
+            SELECT * EXCLUDE (run_ts), run_ts AS "timestamp"
+            FROM ___run_eval
+        """)
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister("___run_preds")
+        con.unregister("___run_eval")
+        con.unregister("___run_bets")
+
+    return {
+        PREDICTIONS_HISTORY: preds_arrow.num_rows,
+        EVAL_HISTORY: eval_arrow.num_rows,
+        BEST_BETS_HISTORY: bets_arrow.num_rows,
+    }
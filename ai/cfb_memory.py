@@ -0,0 +1,77 @@
+# cfb_memory.py
+"""
+Memory helpers for cfb_ai:
+- Compact DataFrames in place (float32 / smallest safe int / categoricals)
+- Estimate whether a table fits in the configured memory budget, so large
+  tables (plays) can be processed one season at a time instead
+"""
+
+import os
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Ceiling (MB) for loading a single table at full length before switching to chunks
+MEMORY_BUDGET_MB = float(os.getenv("CFB_AI_MEMORY_BUDGET_MB", "2048"))
+
+# Rough in-memory cost of one loaded play row before compaction (ints, floats, object strings)
+PLAY_ROW_BYTES = 96
+
+# Largest integer float32 represents exactly; bigger values (e.g. game ids) stay float64
+_FLOAT32_EXACT = 2 ** 24
+
+
+def frame_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage of a DataFrame in MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compact_frame(df: pd.DataFrame, categorical: Iterable[str] = (), exclude: Iterable[str] = ()) -> pd.DataFrame:
+    """
+    Downcast a DataFrame column by column, in place:
+    - integers -> smallest integer type holding the range (int8/int16/int32)
+    - floats   -> float32, unless values exceed float32's exact integer range
+    - listed string columns (teams, conferences, polls) -> category
+    Columns in `exclude` are left as they are; pass any integer column that later
+    arithmetic can push past its own range (a downcast int8 wraps 74 + 62 to -120).
+    Returns the same frame for chaining.
+    """
+    categorical = set(categorical)
+    exclude = set(exclude)
+
+    for col in df.columns:
+        if col in exclude:
+            continue
+        s = df[col]
+        if col in categorical:
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                df[col] = s.astype("category")
+        elif pd.api.types.is_bool_dtype(s):
+            continue
+        elif pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s) and s.dtype != np.float32:
+            max_abs = np.nanmax(np.abs(s.to_numpy())) if s.notna().any() else 0.0
+            if max_abs < _FLOAT32_EXACT:
+                df[col] = s.astype(np.float32)
+
+    return df
+
+
+def table_rows(con, table: str) -> int:
+    return con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def fits_in_budget(rows: int, row_bytes: int = PLAY_ROW_BYTES, budget_mb: float = MEMORY_BUDGET_MB) -> bool:
+    """True when `rows` rows of `row_bytes` each fit under the memory budget."""
+    return rows * row_bytes / 1024 ** 2 <= budget_mb
+
+
+def fill_numeric(df: pd.DataFrame, columns: Iterable[str] = None, value=0) -> pd.DataFrame:
+    """In-place fillna restricted to numeric columns (all of them, or those listed)."""
+    columns = df.columns if columns is None else [c for c in columns if c in df.columns]
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    if numeric:
+        df.fillna({c: value for c in numeric}, inplace=True)
+    return df
@@ -0,0 +1,221 @@
+# cfb_play_model.py
+"""
+Play-level win probability model (out-of-core):
+- Build play features in DuckDB from cfb.cfb_plays + cfb.cfb_games
+  (down, distance, yards to goal, clock, score differential, timeouts)
+- Train LightGBM on a reservoir sample drawn inside DuckDB, so training memory
+  is bounded by the sample size, not by how many seasons are loaded
+- Stream every play back out as Arrow record batches, score each batch and
+  append it to cfb.play_win_prob — memory stays constant per batch
+
+Run with: python -m ai.cfb_play_model
+"""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+import duckdb
+import lightgbm as lgb
+import numpy as np
+import pyarrow as pa
+
+from ai.cfb_history import model_version
+
+SAMPLE_ROWS = int(os.getenv("CFB_PLAY_MODEL_SAMPLE_ROWS", "500000"))
+BATCH_ROWS = int(os.getenv("CFB_PLAY_MODEL_BATCH_ROWS", "250000"))
+SEED = 42
+
+DB_PATH = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+MODEL_PATH = Path(os.getenv("OUTPUT_DIR", "./output_data")) / "play_win_prob_model.txt"
+WIN_PROB_TABLE = "cfb.play_win_prob"
+
+PLAY_FEATURES = [
+    'down', 'distance', 'yards_to_goal', 'quarter', 'seconds_remaining',
+    'score_diff', 'offense_timeouts', 'defense_timeouts', 'is_home_offense',
+]
+
+PLAY_MODEL_PARAMS = {
+    "objective": "binary",
+    "learning_rate": 0.05,
+    "num_leaves": 63,
+    "min_data_in_leaf": 200,
+    "feature_fraction": 0.9,
+    "seed": SEED,
+    "verbose": -1,
+}
+NUM_BOOST_ROUND = 300
+
+# Features are cast to DOUBLE so batches convert straight to float arrays (NULL -> NaN)
+_PLAY_FEATURES_SQL = """
+    SELECT
+        p.play_id,
+        p.game_id,
+        g.season,
+        g.week,
+        CAST(p.down AS DOUBLE) AS down,
+        CAST(p.distance_to_first_down AS DOUBLE) AS distance,
+        CAST(p.yards_to_goal AS DOUBLE) AS yards_to_goal,
+        CAST(p.quarter AS DOUBLE) AS quarter,
+        CAST(
+            GREATEST(4 - LEAST(p.quarter, 4), 0) * 900
+            + COALESCE(p.clock_minutes, 0) * 60
+            + COALESCE(p.clock_seconds, 0)
+        AS DOUBLE) AS seconds_remaining,
+        CAST(p.offense_score - p.defense_score AS DOUBLE) AS score_diff,
+        CAST(p.offense_timeouts AS DOUBLE) AS offense_timeouts,
+        CAST(p.defense_timeouts AS DOUBLE) AS defense_timeouts,
+        CAST(p.offense_team_name = p.home_team_name AS DOUBLE) AS is_home_offense,
+        CASE
+            WHEN NOT g.game_completed OR g.home_points IS NULL OR g.away_points IS NULL THEN NULL
+            WHEN p.offense_team_name = p.home_team_name THEN CAST(g.home_points > g.away_points AS INTEGER)
+            ELSE CAST(g.away_points > g.home_points AS INTEGER)
+        END AS offense_won
+    FROM {plays} p
+    JOIN {games} g USING (game_id)
+"""
+
+
+def play_features_sql(plays: str = "cfb.cfb_plays", games: str = "cfb.cfb_games") -> str:
+    """Play feature query over any plays/games relations shaped like the cfb models (e.g. live mode's)."""
+    return _PLAY_FEATURES_SQL.format(plays=plays, games=games)
+
+
+PLAY_FEATURES_SQL = play_features_sql()
+
+
+def _features_matrix(batch) -> np.ndarray:
+    """Arrow table/batch -> float32 feature matrix in PLAY_FEATURES order."""
+    return np.column_stack([
+        batch.column(f).to_numpy(zero_copy_only=False).astype(np.float32)
+        for f in PLAY_FEATURES
+    ])
+
+
+def train_play_model(con, sample_rows: int = SAMPLE_ROWS, num_boost_round: int = NUM_BOOST_ROUND):
+    """Train the win probability booster on a DuckDB reservoir sample of completed-game plays."""
+    # USING SAMPLE applies to the FROM before WHERE, so filter in the subquery first;
+    # otherwise plays from unfinished games take sample slots
+    sample = con.execute(f"""
+        SELECT *
+        FROM (
+            SELECT *
+            FROM ({PLAY_FEATURES_SQL}) AS plays
+            WHERE offense_won IS NOT NULL
+        ) AS completed_plays
+        USING SAMPLE reservoir({int(sample_rows)} ROWS) REPEATABLE ({SEED})
+    """).to_arrow_table()
+
+    if sample.num_rows == 0:
+        raise ValueError("No plays from completed games available for training")
+
+    X = _features_matrix(sample)
+    y = sample.column('offense_won').to_numpy(zero_copy_only=False).astype(np.float32)
+    del sample
+
+    train_set = lgb.Dataset(X, label=y, feature_name=PLAY_FEATURES, free_raw_data=True)
+    booster = lgb.train(PLAY_MODEL_PARAMS, train_set, num_boost_round=num_boost_round)
+    print(f"Trained play win probability model on {len(y):,} sampled plays")
+    return booster
+
+
+def ensure_win_prob_table(con, table: str = WIN_PROB_TABLE) -> None:
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        play_id BIGINT,
+        game_id BIGINT,
+        season INTEGER,
+        week INTEGER,
+        offense_win_prob DOUBLE,
+        model_version VARCHAR,
+        scored_at TIMESTAMP
+    )
+    """)
+
+
+def score_plays(
+    con,
+    booster,
+    version: str,
+    game_ids: Optional[List[int]] = None,
+    batch_rows: int = BATCH_ROWS,
+    features_sql: str = PLAY_FEATURES_SQL,
+    table: str = WIN_PROB_TABLE,
+) -> int:
+    """
+    Score plays in Arrow batches and write them to `table` (cfb.play_win_prob).
+    With `game_ids`, only those games are rescored; otherwise the table is rebuilt.
+    Returns the number of plays scored.
+    """
+    ensure_win_prob_table(con, table)
+    scored_at = datetime.now()
+
+    query = features_sql
+    params = []
+    if game_ids is not None:
+        query += " WHERE p.game_id IN (SELECT UNNEST(?))"
+        params = [list(game_ids)]
+
+    # Read on a separate cursor so the writer connection stays free for inserts
+    reader = con.cursor().execute(query, params).to_arrow_reader(batch_rows)
+
+    scored = 0
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if game_ids is None:
+            con.execute(f"DELETE FROM {table}")
+        else:
+            con.execute(f"DELETE FROM {table} WHERE game_id IN (SELECT UNNEST(?))", [list(game_ids)])
+
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            scored_batch = pa.table({
+                'play_id': batch.column('play_id'),
+                'game_id': batch.column('game_id'),
+                'season': batch.column('season'),
+                'week': batch.column('week'),
+                'offense_win_prob': booster.predict(_features_matrix(batch)),
+            })
+            con.register('___play_wp', scored_batch)
+            con.execute(f"""
+                INSERT INTO {table}
+                SELECT play_id, game_id, season, week, offense_win_prob, ?, ?
+                FROM ___play_wp
+            """, [version, scored_at])
+            con.unregister('___play_wp')
+            scored += batch.num_rows
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+
+    return scored
+
+
+def load_play_model(path: Path = MODEL_PATH):
+    """Load the saved booster and its model version (stored alongside as .version)."""
+    booster = lgb.Booster(model_file=str(path))
+    version = path.with_suffix('.version').read_text(encoding="utf-8").strip()
+    return booster, version
+
+
+def run_play_model(database: str = DB_PATH) -> None:
+    con = duckdb.connect(database=database, read_only=False)
+    try:
+        booster = train_play_model(con)
+        version = model_version(PLAY_FEATURES, {**PLAY_MODEL_PARAMS, "num_boost_round": NUM_BOOST_ROUND})
+
+        MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        booster.save_model(str(MODEL_PATH))
+        MODEL_PATH.with_suffix('.version').write_text(version, encoding="utf-8")
+
+        scored = score_plays(con, booster, version)
+        print(f"✅ Scored {scored:,} plays into {WIN_PROB_TABLE} (model {version})")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    run_play_model()
@@ -0,0 +1,153 @@
+# cfb_profile.py
+"""
+Stage-level instrumentation for cfb_ai runs:
+- metrics.start("stage") / metrics.stop(rows_in=..., rows_out=...) around each step
+- Records wall time, CPU time, peak RSS growth and input/output row counts
+- Opt-in deep capture for one stage: CFB_AI_PROFILE_STAGE=<stage> with
+  CFB_AI_PROFILE_MODE=cprofile (default) or tracemalloc
+- Results are appended to cfb.ai_run_metrics, keyed by run_id
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows; RSS columns stay empty
+
+PROFILE_STAGE = os.getenv("CFB_AI_PROFILE_STAGE", "")
+PROFILE_MODE = os.getenv("CFB_AI_PROFILE_MODE", "cprofile").lower()
+PROFILE_TOP = 25
+
+METRICS_TABLE = "cfb.ai_run_metrics"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water RSS in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+class RunMetrics:
+    """Collects one row of metrics per stage for a single run."""
+
+    def __init__(self, run_id: str, profile_stage: str = PROFILE_STAGE, profile_mode: str = PROFILE_MODE):
+        self.run_id = run_id
+        self.profile_stage = profile_stage
+        self.profile_mode = profile_mode
+        self.rows = []
+        self._current = None
+
+    def start(self, stage: str, rows_in: Optional[int] = None) -> None:
+        if self._current is not None:
+            self.stop()
+
+        profiler = None
+        if stage == self.profile_stage:
+            if self.profile_mode == "tracemalloc":
+                tracemalloc.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+
+        self._current = {
+            "stage": stage,
+            "started_at": datetime.now(),
+            "rows_in": rows_in,
+            "_wall": time.perf_counter(),
+            "_cpu": time.process_time(),
+            "_rss": peak_rss_mb(),
+            "_profiler": profiler,
+        }
+
+    def stop(self, rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+        cur = self._current
+        if cur is None:
+            return
+        self._current = None
+
+        wall = time.perf_counter() - cur["_wall"]
+        cpu = time.process_time() - cur["_cpu"]
+        rss_after = peak_rss_mb()
+
+        profile_text = None
+        if cur["_profiler"] is not None:
+            cur["_profiler"].disable()
+            out = io.StringIO()
+            pstats.Stats(cur["_profiler"], stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            profile_text = out.getvalue()
+        elif cur["stage"] == self.profile_stage and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            profile_text = "\n".join(str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_TOP])
+
+        if profile_text:
+            print(f"\n🔬 {self.profile_mode} capture for stage '{cur['stage']}':\n{profile_text}")
+
+        self.rows.append({
+            "run_id": self.run_id,
+            "stage": cur["stage"],
+            "started_at": cur["started_at"],
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "peak_rss_mb": rss_after,
+            "peak_rss_delta_mb": None if rss_after is None else rss_after - cur["_rss"],
+            "rows_in": rows_in if rows_in is not None else cur["rows_in"],
+            "rows_out": rows_out,
+            "profile": profile_text,
+        })
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.rows, columns=[
+            "run_id", "stage", "started_at", "wall_s", "cpu_s",
+            "peak_rss_mb", "peak_rss_delta_mb", "rows_in", "rows_out", "profile",
+        ])
+
+    def report(self) -> None:
+        df = self.frame()
+        if df.empty:
+            return
+        total_wall = df["wall_s"].sum()
+        print("\n⏱️ Stage timings:")
+        for row in df.itertuples():
+            share = row.wall_s / total_wall * 100 if total_wall else 0
+            rss = "" if pd.isna(row.peak_rss_delta_mb) else f", +{row.peak_rss_delta_mb:.0f} MB peak"
+            print(f"   {row.stage:<18} {row.wall_s:8.2f}s wall {row.cpu_s:8.2f}s cpu ({share:4.1f}%){rss}")
+        print(f"   {'total':<18} {total_wall:8.2f}s")
+
+    def save(self, con) -> None:
+        """Append this run's stage rows to cfb.ai_run_metrics."""
+        if self._current is not None:
+            self.stop()
+        con.execute(f"""
+        CREATE TABLE IF NOT EXISTS {METRICS_TABLE} (
+            run_id VARCHAR,
+            stage VARCHAR,
+            started_at TIMESTAMP,
+            wall_s DOUBLE,
+            cpu_s DOUBLE,
+            peak_rss_mb DOUBLE,
+            peak_rss_delta_mb DOUBLE,
+            rows_in BIGINT,
+            rows_out BIGINT,
+            profile VARCHAR
+        )
+        """)
+        con.register("___run_metrics", pa.Table.from_pandas(self.frame(), preserve_index=False))
+        try:
+            con.execute(f"INSERT INTO {METRICS_TABLE} BY NAME SELECT * FROM ___run_metrics")
+        finally:
+            con.unregister("___run_metrics")
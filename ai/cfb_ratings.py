@@ -0,0 +1,315 @@
+# cfb_ratings.py
+"""
+Opponent-adjusted offense/defense ratings per team-season from cfb.cfb_plays:
+- Plays are reduced in DuckDB to one row per (game, offense): play count and mean
+  PPA, success (PPA > 0, as in cfb_ai) and yards. Weighting each row by its play
+  count gives the same least-squares fit as one row per play
+- Sparse design matrix per season: +1 on the offense's column, +1 on the defense's
+  column and ±1 home-field (0 at neutral sites); ridge regression (ADJ_PARAMS["alpha"],
+  in plays) shrinks thinly-sampled teams toward league average
+- Solved round by round (season, regular/postseason, week) on the completed games
+  before that round, so every rating is pregame. The normal equations are updated
+  with each round's rows and a Jacobi-preconditioned conjugate gradient solves PPA,
+  success and yards at once, warm started from the previous round's solution. The
+  warm start is within one run: a re-solved season starts cold at its first round
+- Ratings are per-play values relative to league average: adj_off_* is what the
+  offense adds, adj_def_* what the defense allows (lower is better)
+- Incremental: a season is re-solved only when its games, completions or plays changed
+  (cfb.adjusted_ratings_state); finished seasons are skipped
+- Outputs pregame ratings for both teams of every game (cfb.team_adjusted_ratings)
+
+Run with: python -m ai.cfb_ratings            (incremental)
+          python -m ai.cfb_ratings --full     (rebuild from scratch)
+"""
+
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from scipy import sparse
+
+from ai.cfb_elo import ROUND_KEY_SQL
+from ai.cfb_history import model_version
+
+DB_PATH = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+
+ADJ_PARAMS: Dict[str, float] = {
+    "alpha": 150.0,       # ridge penalty on team ratings, in plays of evidence
+    "hfa_alpha": 1.0,     # home-field is shared by every game, so barely penalized
+    "tol": 1e-8,          # relative residual for the conjugate gradient
+    "max_iter": 1000,
+}
+
+TARGETS = ("ppa", "success", "yards")
+RATING_COLUMNS = [f"adj_{side}_{t}" for side in ("off", "def") for t in TARGETS]
+
+RATINGS_TABLE = "cfb.team_adjusted_ratings"
+STATE_TABLE = "cfb.adjusted_ratings_state"
+
+GAMES_SQL = f"""
+    SELECT
+        game_id,
+        season,
+        week,
+        {ROUND_KEY_SQL} AS round_key,
+        home_id,
+        away_id,
+        COALESCE(neutral_site, FALSE) AS neutral_site,
+        COALESCE(game_completed, FALSE) AS completed
+    FROM cfb.cfb_games
+    WHERE home_id IS NOT NULL AND away_id IS NOT NULL AND week IS NOT NULL
+"""
+
+# One row per (game, offense) of a completed game; PPA is only set on scrimmage plays
+OFFENSE_GAMES_SQL = f"""
+    WITH games AS ({GAMES_SQL})
+    SELECT
+        g.season,
+        g.round_key,
+        p.game_id,
+        CASE WHEN p.offense_team_name = p.home_team_name THEN g.home_id ELSE g.away_id END AS offense_id,
+        CASE WHEN p.offense_team_name = p.home_team_name THEN g.away_id ELSE g.home_id END AS defense_id,
+        CASE
+            WHEN g.neutral_site THEN 0
+            WHEN p.offense_team_name = p.home_team_name THEN 1
+            ELSE -1
+        END AS home_offense,
+        COUNT(*) AS plays,
+        AVG(p.ppa) AS ppa,
+        AVG(CAST(p.ppa > 0 AS DOUBLE)) AS success,
+        AVG(CAST(p.yards_gained AS DOUBLE)) AS yards
+    FROM cfb.cfb_plays p
+    JOIN games g USING (game_id)
+    WHERE g.completed AND p.ppa IS NOT NULL AND p.yards_gained IS NOT NULL
+    GROUP BY ALL
+"""
+
+
+def season_fingerprints(con) -> pd.DataFrame:
+    """Per season: games, completed games and scrimmage plays — what the ratings depend on."""
+    return con.execute(f"""
+        WITH games AS ({GAMES_SQL}),
+        plays AS (
+            SELECT game_id, COUNT(*) AS plays
+            FROM cfb.cfb_plays
+            WHERE ppa IS NOT NULL
+            GROUP BY game_id
+        )
+        SELECT
+            g.season,
+            COUNT(*) AS games,
+            COUNT(*) FILTER (WHERE g.completed) AS completed_games,
+            COALESCE(SUM(p.plays) FILTER (WHERE g.completed), 0) AS plays
+        FROM games g
+        LEFT JOIN plays p USING (game_id)
+        GROUP BY g.season
+        ORDER BY g.season
+    """).df()
+
+
+def stale_seasons(con, fingerprints: pd.DataFrame, params_hash: str) -> List[int]:
+    """Seasons whose fingerprint or parameters differ from the stored state."""
+    exists = con.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = 'cfb' AND table_name = 'adjusted_ratings_state'
+    """).fetchone()[0]
+    if not exists:
+        return fingerprints["season"].astype(int).tolist()
+
+    state = con.execute(f"SELECT season, games, completed_games, plays, params_hash FROM {STATE_TABLE}").df()
+    merged = fingerprints.merge(state, on="season", how="left", suffixes=("", "_stored"))
+    changed = (
+        (merged["games"] != merged["games_stored"])
+        | (merged["completed_games"] != merged["completed_games_stored"])
+        | (merged["plays"] != merged["plays_stored"])
+        | (merged["params_hash"] != params_hash)
+    )
+    return merged.loc[changed, "season"].astype(int).tolist()
+
+
+def _conjugate_gradient(A, B: np.ndarray, X0: np.ndarray, tol: float, max_iter: int) -> Tuple[np.ndarray, int]:
+    """Jacobi-preconditioned CG for SPD `A`, one column of `B` per target. Returns (X, iterations)."""
+    inv_diag = 1.0 / A.diagonal()
+    X = X0.copy()
+    R = B - A @ X
+    Z = inv_diag[:, None] * R
+    P = Z.copy()
+    rz = (R * Z).sum(axis=0)
+    target = tol * np.maximum(np.linalg.norm(B, axis=0), 1e-12)
+
+    for iteration in range(max_iter):
+        if (np.linalg.norm(R, axis=0) <= target).all():
+            return X, iteration
+        AP = A @ P
+        pap = (P * AP).sum(axis=0)
+        alpha = np.divide(rz, pap, out=np.zeros_like(rz), where=pap > 0)
+        X += alpha * P
+        R -= alpha * AP
+        Z = inv_diag[:, None] * R
+        rz_next = (R * Z).sum(axis=0)
+        beta = np.divide(rz_next, rz, out=np.zeros_like(rz), where=rz > 0)
+        P = Z + beta * P
+        rz = rz_next
+    return X, max_iter
+
+
+def solve_season(
+    games: pd.DataFrame,
+    offense_games: pd.DataFrame,
+    params: Dict[str, float] = ADJ_PARAMS,
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Pregame ratings for both teams of every game in one season.
+    `games` is GAMES_SQL for the season, `offense_games` OFFENSE_GAMES_SQL.
+    Returns (one row per game and team, total CG iterations).
+    """
+    team_ids = np.unique(np.concatenate([games["home_id"].to_numpy(np.int64), games["away_id"].to_numpy(np.int64)]))
+    n_teams = len(team_ids)
+    width = 2 * n_teams + 1  # offense ratings, defense ratings, home-field
+
+    rows = offense_games.sort_values("round_key")
+    row_rounds = rows["round_key"].to_numpy(np.int64)
+    off = np.searchsorted(team_ids, rows["offense_id"].to_numpy(np.int64))
+    dfn = np.searchsorted(team_ids, rows["defense_id"].to_numpy(np.int64))
+    home = rows["home_offense"].to_numpy(np.float64)
+    weight = rows["plays"].to_numpy(np.float64)
+    y = rows[list(TARGETS)].to_numpy(np.float64)
+
+    penalty = np.full(width, params["alpha"])
+    penalty[-1] = params["hfa_alpha"]
+    gram = sparse.diags(penalty, format="csr")      # X'WX + ridge
+    xty = np.zeros((width, len(TARGETS)))           # X'Wy
+    xt1 = np.zeros(width)                           # X'W1, to center y on the running mean
+    total_w, total_wy = 0.0, np.zeros(len(TARGETS))
+
+    solution = np.zeros((width, len(TARGETS)))
+    iterations = 0
+    consumed = 0
+    out = []
+    for round_key, round_games in games.groupby("round_key", sort=True):
+        # Fold in every completed game from earlier rounds
+        upto = int(np.searchsorted(row_rounds, round_key, side="left"))
+        if upto > consumed:
+            sl = slice(consumed, upto)
+            n = upto - consumed
+            X = sparse.csr_matrix(
+                (
+                    np.concatenate([np.ones(n), np.ones(n), home[sl]]),
+                    (np.tile(np.arange(n), 3), np.concatenate([off[sl], n_teams + dfn[sl], np.full(n, width - 1)])),
+                ),
+                shape=(n, width),
+            )
+            XtW = X.T.multiply(weight[sl]).tocsr()
+            gram = gram + XtW @ X
+            xty += XtW @ y[sl]
+            xt1 += np.asarray(XtW.sum(axis=1)).ravel()
+            total_w += weight[sl].sum()
+            total_wy += weight[sl] @ y[sl]
+            consumed = upto
+
+            mean = total_wy / total_w
+            solution, used = _conjugate_gradient(
+                gram, xty - np.outer(xt1, mean), solution, params["tol"], int(params["max_iter"])
+            )
+            iterations += used
+
+        plays_so_far = np.bincount(off[:consumed], weights=weight[:consumed], minlength=n_teams)
+        for side in ("home", "away"):
+            idx = np.searchsorted(team_ids, round_games[f"{side}_id"].to_numpy(np.int64))
+            out.append(pd.DataFrame({
+                "game_id": round_games["game_id"].to_numpy(),
+                "season": round_games["season"].to_numpy(),
+                "week": round_games["week"].to_numpy(),
+                "round_key": round_key,
+                "team_id": team_ids[idx],
+                "plays": plays_so_far[idx].astype(np.int64),
+                **{f"adj_off_{t}": solution[idx, k] for k, t in enumerate(TARGETS)},
+                **{f"adj_def_{t}": solution[n_teams + idx, k] for k, t in enumerate(TARGETS)},
+            }))
+
+    rated = pd.concat(out, ignore_index=True) if out else pd.DataFrame()
+    return rated, iterations
+
+
+def save_ratings(con, rated: pd.DataFrame, fingerprints: pd.DataFrame, seasons: List[int], params_hash: str) -> None:
+    """Replace the re-solved seasons and their state rows in one transaction."""
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {RATINGS_TABLE} (
+        game_id BIGINT, season INTEGER, week INTEGER, round_key BIGINT, team_id INTEGER, plays BIGINT,
+        {', '.join(f'{c} DOUBLE' for c in RATING_COLUMNS)}
+    )""")
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {STATE_TABLE} (
+        season INTEGER, games BIGINT, completed_games BIGINT, plays BIGINT,
+        params_hash VARCHAR, updated_at TIMESTAMP
+    )""")
+    state_rows = fingerprints[fingerprints["season"].isin(seasons)].assign(
+        params_hash=params_hash, updated_at=datetime.now()
+    )
+
+    con.register("___adj_ratings", pa.Table.from_pandas(rated.sort_values(["round_key", "team_id"]), preserve_index=False))
+    con.register("___adj_state", pa.Table.from_pandas(state_rows, preserve_index=False))
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"DELETE FROM {RATINGS_TABLE} WHERE season IN (SELECT UNNEST(?))", [seasons])
+        con.execute(f"DELETE FROM {STATE_TABLE} WHERE season IN (SELECT UNNEST(?))", [seasons])
+        if len(rated):
+            con.execute(f"INSERT INTO {RATINGS_TABLE} BY NAME SELECT * FROM ___adj_ratings")
+        con.execute(f"INSERT INTO {STATE_TABLE} BY NAME SELECT * FROM ___adj_state")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister("___adj_ratings")
+        con.unregister("___adj_state")
+
+
+def update_ratings(con, params: Dict[str, float] = ADJ_PARAMS, full: bool = False) -> Tuple[int, int]:
+    """Re-solve stale seasons (or all). Returns (seasons solved, CG iterations)."""
+    params_hash = model_version(list(TARGETS), params)
+    fingerprints = season_fingerprints(con)
+    seasons = fingerprints["season"].astype(int).tolist() if full else stale_seasons(con, fingerprints, params_hash)
+    if not seasons:
+        return 0, 0
+
+    games = con.execute(f"""
+        SELECT * FROM ({GAMES_SQL})
+        WHERE season IN (SELECT UNNEST(?))
+        ORDER BY round_key, game_id
+    """, [seasons]).df()
+    offense_games = con.execute(f"""
+        SELECT * FROM ({OFFENSE_GAMES_SQL})
+        WHERE season IN (SELECT UNNEST(?))
+    """, [seasons]).df()
+
+    rated, iterations = [], 0
+    by_season = dict(tuple(offense_games.groupby("season")))
+    for season, season_games in games.groupby("season", sort=True):
+        season_rows = by_season.get(season, offense_games.iloc[0:0])
+        season_rated, used = solve_season(season_games, season_rows, params)
+        rated.append(season_rated)
+        iterations += used
+
+    save_ratings(con, pd.concat(rated, ignore_index=True), fingerprints, seasons, params_hash)
+    return len(seasons), iterations
+
+
+def run_ratings(database: str = DB_PATH, full: bool = False) -> None:
+    con = duckdb.connect(database=database, read_only=False)
+    try:
+        started = datetime.now()
+        seasons, iterations = update_ratings(con, full=full)
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"✅ Solved {seasons} season(s) ({iterations:,} CG iterations) in {elapsed:.2f}s → {RATINGS_TABLE}")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    run_ratings(full="--full" in sys.argv[1:])
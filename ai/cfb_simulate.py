@@ -0,0 +1,314 @@
+# cfb_simulate.py
+"""
+Monte Carlo season simulator:
+- Load the season schedule from cfb.cfb_games and the latest model
+  probabilities from cfb.cfb_predictions (home_win_prob)
+- Play out every remaining regular-season game as NumPy array operations
+  (one row per simulated season) in chunks of CHUNK_SIMS, each with its own
+  RNG stream (numpy SeedSequence.spawn); chunks are spread across processes,
+  so a seed gives the same results for any worker count
+- Aggregate win distributions, conference title odds and playoff odds per team
+- Store results in cfb.sim_team_odds and cfb.sim_win_distribution
+
+Run with: python -m ai.cfb_simulate
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+DB_PATH = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+N_SIMS = int(os.getenv("CFB_SIM_COUNT", "100000"))
+SIM_WORKERS = int(os.getenv("CFB_SIM_WORKERS", str(os.cpu_count() or 1)))
+CHUNK_SIMS = 10_000
+
+# 12-team playoff: five highest conference champions + seven at-large teams
+PLAYOFF_FIELD = 12
+PLAYOFF_AUTO_BIDS = 5
+
+# Games without a model probability are treated as coin flips
+DEFAULT_HOME_WIN_PROB = 0.5
+
+TEAM_ODDS_TABLE = "cfb.sim_team_odds"
+WIN_DIST_TABLE = "cfb.sim_win_distribution"
+
+
+def load_season(con, season: Optional[int] = None):
+    """Return (season, schedule frame, teams frame) for the simulation."""
+    if season is None:
+        season = con.execute("SELECT MAX(season) FROM cfb.cfb_games").fetchone()[0]
+
+    schedule = con.execute("""
+        SELECT
+            g.game_id,
+            g.home_id,
+            g.away_id,
+            COALESCE(g.game_completed, FALSE) AS completed,
+            g.home_points,
+            g.away_points,
+            COALESCE(g.conference_game, FALSE) AS conference_game,
+            p.home_win_prob
+        FROM cfb.cfb_games g
+        LEFT JOIN cfb.cfb_predictions p USING (season, week, home_id, away_id)
+        WHERE g.season = ? AND g.season_type = 'regular'
+    """, [season]).df()
+
+    teams = con.execute("""
+        SELECT team_id, ANY_VALUE(conference) AS conference, ANY_VALUE(division) AS division
+        FROM cfb.cfb_teams
+        WHERE season = ?
+        GROUP BY team_id
+    """, [season]).df()
+
+    return season, schedule, teams
+
+
+def _prepare_arrays(schedule: pd.DataFrame, teams: pd.DataFrame) -> dict:
+    """Index teams 0..T-1 and turn the schedule into flat NumPy arrays."""
+    team_ids = np.unique(np.concatenate([schedule['home_id'].to_numpy(), schedule['away_id'].to_numpy()]))
+    team_ids = team_ids[~pd.isna(team_ids)].astype(np.int64)
+    n_teams = len(team_ids)
+
+    teams = teams.set_index('team_id').reindex(team_ids)
+    conference = teams['conference']
+    # Independents have no title to win
+    has_conf = conference.notna() & ~conference.fillna('').str.contains('Independent', case=False)
+    conf_names = sorted(conference[has_conf].unique().tolist())
+    conf_codes = np.full(n_teams, -1, dtype=np.int32)
+    conf_codes[has_conf.to_numpy()] = pd.Categorical(conference[has_conf], categories=conf_names).codes
+    fbs_mask = (teams['division'].fillna('').str.lower() == 'fbs').to_numpy()
+    conf_is_fbs = np.array([fbs_mask[conf_codes == c].any() for c in range(len(conf_names))], dtype=bool)
+
+    schedule = schedule.dropna(subset=['home_id', 'away_id'])
+    home_idx = np.searchsorted(team_ids, schedule['home_id'].to_numpy().astype(np.int64)).astype(np.int32)
+    away_idx = np.searchsorted(team_ids, schedule['away_id'].to_numpy().astype(np.int64)).astype(np.int32)
+    is_conf = schedule['conference_game'].fillna(False).to_numpy(dtype=bool) & (conf_codes[home_idx] >= 0) & (conf_codes[home_idx] == conf_codes[away_idx])
+    played = schedule['completed'].fillna(False).to_numpy(dtype=bool) & schedule['home_points'].notna().to_numpy() & schedule['away_points'].notna().to_numpy()
+
+    # Wins already banked from completed games (ties count for nobody)
+    home_pts = schedule['home_points'].astype(float).to_numpy()
+    away_pts = schedule['away_points'].astype(float).to_numpy()
+    done_winner = np.where(home_pts > away_pts, home_idx, np.where(away_pts > home_pts, away_idx, -1))
+    done_winner = done_winner[played & (done_winner >= 0)]
+    done_conf_winner = np.where(home_pts > away_pts, home_idx, np.where(away_pts > home_pts, away_idx, -1))
+    done_conf_winner = done_conf_winner[played & is_conf & (done_conf_winner >= 0)]
+
+    remaining = ~played
+    p_home = schedule['home_win_prob'].astype(float).to_numpy()[remaining]
+    p_home = np.where(np.isnan(p_home), DEFAULT_HOME_WIN_PROB, p_home).astype(np.float32)
+
+    rem_home, rem_away = home_idx[remaining], away_idx[remaining]
+    max_wins = (
+        np.bincount(done_winner, minlength=n_teams)
+        + np.bincount(rem_home, minlength=n_teams)
+        + np.bincount(rem_away, minlength=n_teams)
+    ).max()
+
+    return {
+        "team_ids": team_ids,
+        "conf_names": conf_names,
+        "conf_codes": conf_codes,
+        "conf_is_fbs": conf_is_fbs,
+        "fbs_mask": fbs_mask,
+        "home_idx": rem_home,
+        "away_idx": rem_away,
+        "is_conf": is_conf[remaining],
+        "p_home": p_home,
+        "base_wins": np.bincount(done_winner, minlength=n_teams).astype(np.int16),
+        "base_conf_wins": np.bincount(done_conf_winner, minlength=n_teams).astype(np.int16),
+        "hist_width": int(max_wins) + 1,
+    }
+
+
+def _team_counts(winner_idx: np.ndarray, n_teams: int) -> np.ndarray:
+    """(sims x games) winner indices -> (sims x teams) win counts via one bincount."""
+    n_sims = winner_idx.shape[0]
+    offsets = (np.arange(n_sims, dtype=np.int64) * n_teams)[:, None]
+    return np.bincount((winner_idx + offsets).ravel(), minlength=n_sims * n_teams).reshape(n_sims, n_teams)
+
+
+def _simulate_shard(seed_seqs: list, chunk_sizes: list, arrays: dict) -> dict:
+    """Run one chunk of seasons per RNG stream; returns per-team count aggregates."""
+    n_teams = len(arrays["team_ids"])
+    width = arrays["hist_width"]
+    conf_codes = arrays["conf_codes"]
+    n_confs = len(arrays["conf_names"])
+    conf_members = [np.flatnonzero(conf_codes == c) for c in range(n_confs)]
+    fbs_confs = np.flatnonzero(arrays["conf_is_fbs"])
+    auto_bids = min(PLAYOFF_AUTO_BIDS, len(fbs_confs))
+    field = min(PLAYOFF_FIELD, int(arrays["fbs_mask"].sum()))
+
+    win_hist = np.zeros((n_teams, width), dtype=np.int64)
+    title_counts = np.zeros(n_teams, dtype=np.int64)
+    playoff_counts = np.zeros(n_teams, dtype=np.int64)
+    wins_sum = np.zeros(n_teams, dtype=np.float64)
+
+    for seed_seq, n in zip(seed_seqs, chunk_sizes):
+        rng = np.random.default_rng(seed_seq)
+        home_won = rng.random((n, len(arrays["p_home"])), dtype=np.float32) < arrays["p_home"]
+        winners = np.where(home_won, arrays["home_idx"], arrays["away_idx"])
+        wins = arrays["base_wins"] + _team_counts(winners, n_teams)
+        conf_wins = arrays["base_conf_wins"] + _team_counts(winners[:, arrays["is_conf"]], n_teams)
+
+        wins_sum += wins.sum(axis=0)
+        team_offsets = np.arange(n_teams, dtype=np.int64) * width
+        win_hist += np.bincount((wins + team_offsets).ravel(), minlength=n_teams * width).reshape(n_teams, width)
+
+        # Random tiebreak in [0, 0.5) never reorders different win totals
+        jitter = rng.random((n, n_teams), dtype=np.float32) * 0.5
+
+        champions = np.empty((n, n_confs), dtype=np.int64)
+        conf_score = conf_wins + jitter
+        for c, members in enumerate(conf_members):
+            champions[:, c] = members[np.argmax(conf_score[:, members], axis=1)]
+            title_counts += np.bincount(champions[:, c], minlength=n_teams)
+
+        # Playoff field: top conference champions, then best remaining FBS records
+        overall = (wins + jitter).astype(np.float32)
+        selected = np.zeros((n, n_teams), dtype=bool)
+        if auto_bids:
+            fbs_champs = champions[:, fbs_confs]
+            champ_scores = np.take_along_axis(overall, fbs_champs, axis=1)
+            top = np.argpartition(-champ_scores, auto_bids - 1, axis=1)[:, :auto_bids]
+            np.put_along_axis(selected, np.take_along_axis(fbs_champs, top, axis=1), True, axis=1)
+        at_large = field - auto_bids
+        if at_large > 0:
+            pool = np.where(selected | ~arrays["fbs_mask"], -np.inf, overall)
+            picks = np.argpartition(-pool, at_large - 1, axis=1)[:, :at_large]
+            np.put_along_axis(selected, picks, True, axis=1)
+        playoff_counts += selected.sum(axis=0)
+
+    return {
+        "win_hist": win_hist,
+        "title_counts": title_counts,
+        "playoff_counts": playoff_counts,
+        "wins_sum": wins_sum,
+    }
+
+
+def simulate_season(arrays: dict, n_sims: int = N_SIMS, workers: int = SIM_WORKERS, seed: Optional[int] = None) -> dict:
+    """
+    Split `n_sims` into CHUNK_SIMS chunks, each with its own spawned RNG stream, and deal
+    the chunks out to `workers` processes. Totals are integer counts, so they don't depend
+    on which worker ran which chunk.
+    """
+    chunk_sizes = [min(CHUNK_SIMS, n_sims - start) for start in range(0, n_sims, CHUNK_SIMS)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    workers = max(1, min(workers, len(chunk_sizes)))
+
+    if workers == 1:
+        shards = [_simulate_shard(seeds, chunk_sizes, arrays)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(
+                _simulate_shard,
+                [seeds[i::workers] for i in range(workers)],
+                [chunk_sizes[i::workers] for i in range(workers)],
+                [arrays] * workers,
+            ))
+
+    return {key: sum(shard[key] for shard in shards) for key in shards[0]}
+
+
+def summarize(season: int, arrays: dict, totals: dict, n_sims: int):
+    """Build (team odds, win distribution) frames from shard aggregates."""
+    team_ids = arrays["team_ids"]
+    conf_names = np.array(arrays["conf_names"] + [None], dtype=object)
+
+    team_odds = pd.DataFrame({
+        "season": season,
+        "team_id": team_ids,
+        "conference": conf_names[arrays["conf_codes"]],
+        "current_wins": arrays["base_wins"].astype(np.int32),
+        "expected_wins": totals["wins_sum"] / n_sims,
+        "conf_title_prob": totals["title_counts"] / n_sims,
+        "playoff_prob": totals["playoff_counts"] / n_sims,
+        "n_sims": n_sims,
+    })
+
+    team_idx, wins = np.nonzero(totals["win_hist"])
+    win_dist = pd.DataFrame({
+        "season": season,
+        "team_id": team_ids[team_idx],
+        "wins": wins.astype(np.int32),
+        "probability": totals["win_hist"][team_idx, wins] / n_sims,
+    })
+    return team_odds, win_dist
+
+
+def save_simulation(con, season: int, team_odds: pd.DataFrame, win_dist: pd.DataFrame) -> None:
+    """Replace this season's simulation rows in one transaction (Arrow inserts)."""
+    simulated_at = datetime.now()
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {TEAM_ODDS_TABLE} (
+        season INTEGER,
+        team_id INTEGER,
+        conference VARCHAR,
+        current_wins INTEGER,
+        expected_wins DOUBLE,
+        conf_title_prob DOUBLE,
+        playoff_prob DOUBLE,
+        n_sims INTEGER,
+        simulated_at TIMESTAMP
+    )
+    """)
+    con.execute(f"""
+    CREATE TABLE IF NOT EXISTS {WIN_DIST_TABLE} (
+        season INTEGER,
+        team_id INTEGER,
+        wins INTEGER,
+        probability DOUBLE,
+        simulated_at TIMESTAMP
+    )
+    """)
+
+    con.register('___sim_odds', pa.Table.from_pandas(team_odds.assign(simulated_at=simulated_at), preserve_index=False))
+    con.register('___sim_dist', pa.Table.from_pandas(win_dist.assign(simulated_at=simulated_at), preserve_index=False))
+    con.execute("BEGIN TRANSACTION")
+    try:
+        for table, source in [(TEAM_ODDS_TABLE, '___sim_odds'), (WIN_DIST_TABLE, '___sim_dist')]:
+            con.execute(f"DELETE FROM {table} WHERE season = ?", [season])
+            con.execute(f"INSERT INTO {table} BY NAME SELECT * FROM {source}")
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    finally:
+        con.unregister('___sim_odds')
+        con.unregister('___sim_dist')
+
+
+def run_simulation(
+    database: str = DB_PATH,
+    season: Optional[int] = None,
+    n_sims: int = N_SIMS,
+    workers: int = SIM_WORKERS,
+    seed: Optional[int] = None,
+) -> None:
+    con = duckdb.connect(database=database, read_only=False)
+    try:
+        season, schedule, teams = load_season(con, season)
+        arrays = _prepare_arrays(schedule, teams)
+
+        started = datetime.now()
+        totals = simulate_season(arrays, n_sims, workers, seed)
+        elapsed = (datetime.now() - started).total_seconds()
+
+        team_odds, win_dist = summarize(season, arrays, totals, n_sims)
+        save_simulation(con, season, team_odds, win_dist)
+        print(
+            f"✅ Simulated {n_sims:,} {season} seasons ({len(arrays['p_home'])} remaining games, "
+            f"{workers} workers) in {elapsed:.1f}s → {TEAM_ODDS_TABLE}, {WIN_DIST_TABLE}"
+        )
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    run_simulation()
@@ -1,29 +1,355 @@
+import os
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
 import streamlit as st
 import duckdb
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
 from pathlib import Path
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # shared/ under `streamlit run dashboards/cfb_dashboard.py`
+
+from shared.snapshots import SNAPSHOT_DIR, SOURCE_DB, latest_snapshot_path  # noqa: E402
+
+# The pipeline's DuckDB file (CFB_DUCKDB_PATH), read only when nothing has been published
+LIVE_DB_PATH = Path(SOURCE_DB)
+
+# Latest published snapshot (shared/snapshots.py), so the dashboard never holds a lock on the live file
+DB_PATH = latest_snapshot_path() or LIVE_DB_PATH
 
-# Path to your DuckDB file
-DB_PATH = Path("./cfb_analytics.duckdb")
+# Game-day snapshots of the cfb_live schema, published every poll by pipelines/cfb_live.py
+LIVE_SNAPSHOT_DIR = SNAPSHOT_DIR / "live"
+
+# --- Query governor limits (custom SQL box + the dashboard's DuckDB instance) ---
+QUERY_TIMEOUT_S = float(os.getenv("DASHBOARD_QUERY_TIMEOUT_S", "30"))
+QUERY_MAX_ROWS = int(os.getenv("DASHBOARD_QUERY_MAX_ROWS", "50000"))
+QUERY_CHUNK_ROWS = 10_000
+DUCKDB_MEMORY_LIMIT = os.getenv("DASHBOARD_DUCKDB_MEMORY_LIMIT", "2GB")
+DUCKDB_THREADS = int(os.getenv("DASHBOARD_DUCKDB_THREADS", "4"))
 
 st.set_page_config(page_title="CFB Analytics Explorer", layout="wide")
 st.title("🏈 College Football Analytics Dashboard")
+if DB_PATH != LIVE_DB_PATH:
+    st.caption(f"Serving snapshot `{DB_PATH.name}`")
 
 # --- Check if DB exists ---
 if not DB_PATH.exists():
-    st.error("❌ No cfb_analytics.duckdb file found. Run your pipeline first.")
+    st.error(f"❌ No {LIVE_DB_PATH} file or published snapshot found. Run your pipeline first.")
     st.stop()
 
+# --- Data version: a new snapshot name, or any write to the DuckDB file (or its WAL) ---
+def db_version(db_path: Path = DB_PATH) -> tuple:
+    version = [str(db_path)]
+    for path in (db_path, db_path.with_name(db_path.name + ".wal")):
+        if path.exists():
+            stat = path.stat()
+            version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+
 # --- Connect to DuckDB ---
-conn = duckdb.connect(str(DB_PATH), read_only=True)
+class DashboardConnection:
+    """Read-only DuckDB connection, closed explicitly or once nothing references it."""
+
+    def __init__(self, db_path: str):
+        self.con = duckdb.connect(
+            db_path,
+            read_only=True,
+            config={"memory_limit": DUCKDB_MEMORY_LIMIT, "threads": DUCKDB_THREADS},
+        )
+        self._finalizer = weakref.finalize(self, self.con.close)
+
+    def cursor(self):
+        return self.con.cursor()
+
+    def close(self) -> None:
+        self._finalizer()
+
+
+# One connection per process and snapshot; when a new snapshot evicts it, the old one closes
+# as soon as the last query holding it finishes
+@st.cache_resource(max_entries=1, show_spinner=False)
+def snapshot_connection(db_path: str, version: tuple) -> DashboardConnection:
+    return DashboardConnection(db_path)
+
+
+@contextmanager
+def connection(version: tuple):
+    """The cached snapshot connection; the live file is opened per use and closed right after."""
+    if DB_PATH == LIVE_DB_PATH:
+        conn = DashboardConnection(str(DB_PATH))
+        try:
+            yield conn
+        finally:
+            conn.close()
+    else:
+        yield snapshot_connection(str(DB_PATH), version)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def run_query(query: str, version: tuple, params: tuple = ()) -> pd.DataFrame:
+    """Cached query results, keyed by SQL text, bound parameters and data version."""
+    # A cursor per call keeps the shared connection safe across Streamlit sessions
+    with connection(version) as conn:
+        return conn.cursor().execute(query, list(params)).fetchdf()
+
+
+def quote_ident(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+NUMERIC_TYPES = ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT", "UTINYINT", "USMALLINT",
+                 "UINTEGER", "UBIGINT", "FLOAT", "REAL", "DOUBLE", "DECIMAL")
+FILTER_OPERATORS = {
+    "=": "{col} = CAST(? AS {dtype})",
+    "!=": "{col} != CAST(? AS {dtype})",
+    ">": "{col} > CAST(? AS {dtype})",
+    ">=": "{col} >= CAST(? AS {dtype})",
+    "<": "{col} < CAST(? AS {dtype})",
+    "<=": "{col} <= CAST(? AS {dtype})",
+    "contains": "CAST({col} AS VARCHAR) ILIKE '%' || ? || '%'",
+    "is null": "{col} IS NULL",
+    "is not null": "{col} IS NOT NULL",
+}
+PLOT_POINTS = 5000
+
+# --- Weekly matchup page (cfb.weekly_matchups is pre-joined when a snapshot is published) ---
+MATCHUPS_TABLE = "cfb.weekly_matchups"
+MATCHUPS_QUERY = f"""
+    SELECT
+        game_id, kickoff, matchup, predicted_winner, win_pred_prob,
+        point_spread_pred, vegas_spread, spread_edge, ai_recommendation,
+        total_points_pred, vegas_total, total_edge, ai_total_recommendation,
+        home_points, away_points, point_spread_actual, win_pred_correct
+    FROM {MATCHUPS_TABLE}
+    WHERE season = $1 AND season_type = $2 AND week = $3
+      AND ($4 = '' OR home_conference = $4 OR away_conference = $4)
+      AND (is_ranked OR NOT $5)
+    ORDER BY start_date, LEAST(COALESCE(home_rank, 99), COALESCE(away_rank, 99)), matchup
+"""
+
+# Per-feature contributions written by cfb_ai (ai.cfb_explain); indexed on game_id
+ATTRIBUTIONS_TABLE = "cfb.ai_attributions"
+DRIVERS_QUERY = f"""
+    SELECT target, feature, feature_value, contribution
+    FROM {ATTRIBUTIONS_TABLE}
+    WHERE game_id = $1
+"""
+DRIVER_TARGETS = {"win": "Win (log-odds, home)", "spread": "Spread (pts)", "total": "Total (pts)"}
+DRIVERS_SHOWN = 8
+
+
+def governed_sql(query: str, max_rows: int) -> str:
+    """Wrap a SELECT so DuckDB itself stops after max_rows + 1 rows (the extra row flags truncation)."""
+    body = query.strip().rstrip(";").strip()
+    # Newline before ")" so a trailing -- comment can't swallow it
+    return f"SELECT * FROM (\n{body}\n) AS governed_query LIMIT {int(max_rows) + 1}"
+
+
+def run_governed(query: str, status, timeout_s: float = QUERY_TIMEOUT_S, max_rows: int = QUERY_MAX_ROWS):
+    """
+    Run `query` on its own cursor in a worker thread, streaming Arrow batches.
+    The script thread polls: past `timeout_s`, or when Streamlit stops the run
+    (Stop button / widget change), the cursor is interrupted.
+    Returns (DataFrame, truncated).
+    """
+    # Held until the worker is done, so a per-use live-file connection never closes under it
+    with connection(DB_VERSION) as conn:
+        cur = conn.cursor()
+        state = {"batches": [], "rows": 0, "schema": None, "error": None}
+
+        def worker():
+            try:
+                try:
+                    reader = cur.execute(governed_sql(query, max_rows)).to_arrow_reader(QUERY_CHUNK_ROWS)
+                except duckdb.ParserException:
+                    # Not wrappable (PRAGMA, SHOW, DESCRIBE ...): run as-is, still capped while fetching
+                    reader = cur.execute(query).to_arrow_reader(QUERY_CHUNK_ROWS)
+                state["schema"] = reader.schema
+                for batch in reader:
+                    state["batches"].append(batch)
+                    state["rows"] += batch.num_rows
+                    if state["rows"] > max_rows:
+                        break
+            except Exception as e:
+                state["error"] = e
+
+        thread = threading.Thread(target=worker, daemon=True)
+        started = time.monotonic()
+        thread.start()
+        try:
+            while thread.is_alive():
+                elapsed = time.monotonic() - started
+                if elapsed > timeout_s:
+                    cur.interrupt()
+                    thread.join()
+                    raise TimeoutError(f"Query cancelled after {timeout_s:.0f}s (limit DASHBOARD_QUERY_TIMEOUT_S)")
+                status.caption(f"⏳ Running… {elapsed:.1f}s, {state['rows']:,} rows fetched")
+                thread.join(0.25)
+        finally:
+            if thread.is_alive():
+                cur.interrupt()
+                thread.join()
+        status.empty()
+
+    if state["error"] is not None:
+        raise state["error"]
+    table = pa.Table.from_batches(state["batches"], schema=state["schema"])
+    truncated = table.num_rows > max_rows
+    return table.slice(0, max_rows).to_pandas(), truncated
+
+
+def explain_analyze(query: str, status, timeout_s: float = QUERY_TIMEOUT_S, max_rows: int = QUERY_MAX_ROWS) -> str:
+    """DuckDB's EXPLAIN ANALYZE timing tree for the governed (row-capped) query."""
+    plan, _ = run_governed(f"EXPLAIN ANALYZE {governed_sql(query, max_rows)}", status, timeout_s, max_rows)
+    return "\n".join(plan.iloc[:, -1].astype(str))
+
+
+def prefetch_queries(query: str, version: tuple, param_sets: list) -> None:
+    """Warm run_query's cache for likely next selections on a background thread."""
+    def warm():
+        for params in param_sets:
+            try:
+                run_query(query, version, params)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=warm, daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+
+def week_label(week_key: tuple) -> str:
+    season_type, week = week_key
+    return f"Week {week}" if season_type == "regular" else f"{season_type.title()} {week}"
+
+
+def render_matchups_page(tables_df: pd.DataFrame) -> None:
+    started = time.perf_counter()
+    st.subheader("🗓️ Weekly Matchups")
+    schema, name = MATCHUPS_TABLE.split(".")
+    if not ((tables_df["table_schema"] == schema) & (tables_df["table_name"] == name)).any():
+        st.info(f"`{MATCHUPS_TABLE}` is built when a snapshot is published — run `python -m shared.snapshots`.")
+        return
+
+    c1, c2, c3, c4 = st.columns([1, 2, 2, 1])
+    seasons = run_query(f"SELECT DISTINCT season FROM {MATCHUPS_TABLE} ORDER BY season DESC", DB_VERSION)
+    season = c1.selectbox("Season", seasons["season"].tolist())
+
+    weeks_df = run_query(f"""
+        SELECT season_type, week, BOOL_AND(completed) AS completed
+        FROM {MATCHUPS_TABLE}
+        WHERE season = ?
+        GROUP BY season_type, week
+        ORDER BY season_type <> 'regular', season_type, week
+    """, DB_VERSION, (season,))
+    weeks = [(str(t), int(w)) for t, w in weeks_df[["season_type", "week"]].itertuples(index=False)]
+    # Default to the first week that still has games to play
+    pending = [i for i, done in enumerate(weeks_df["completed"].tolist()) if not done]
+    week_key = c2.selectbox("Week", weeks, index=pending[0] if pending else len(weeks) - 1, format_func=week_label)
+
+    conferences = run_query(f"""
+        SELECT DISTINCT conference
+        FROM (
+            SELECT home_conference AS conference FROM {MATCHUPS_TABLE} WHERE season = $1
+            UNION ALL
+            SELECT away_conference FROM {MATCHUPS_TABLE} WHERE season = $1
+        )
+        WHERE conference IS NOT NULL
+        ORDER BY conference
+    """, DB_VERSION, (season,))
+    conference = c3.selectbox("Conference", ["All"] + conferences["conference"].tolist())
+    ranked_only = c4.toggle("Ranked only", value=True, help="Games with an AP Top 25 team")
+
+    def matchup_params(key: tuple) -> tuple:
+        return (int(season), key[0], key[1], "" if conference == "All" else conference, bool(ranked_only))
+
+    df = run_query(MATCHUPS_QUERY, DB_VERSION, matchup_params(week_key))
+
+    # Next and previous week are the most likely clicks; have them cached before they happen
+    i = weeks.index(week_key)
+    prefetch_queries(MATCHUPS_QUERY, DB_VERSION, [matchup_params(weeks[j]) for j in (i + 1, i - 1) if 0 <= j < len(weeks)])
+
+    st.dataframe(df.drop(columns=["game_id"]), hide_index=True, use_container_width=True)
+    st.caption(f"{len(df):,} games · {week_label(week_key)}, {season} · {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    if not df.empty and ((tables_df["table_schema"] == "cfb") & (tables_df["table_name"] == "ai_attributions")).any():
+        render_drivers(df)
+
+
+LIVE_STATE_QUERY = """
+    SELECT
+        away_team || ' @ ' || home_team AS matchup,
+        away_score, home_score,
+        'Q' || quarter || ' ' || clock_minutes || ':' || lpad(CAST(clock_seconds AS VARCHAR), 2, '0') AS clock,
+        possession,
+        ROUND(home_win_prob, 3) AS home_win_prob,
+        plays,
+        updated_at
+    FROM cfb_live.game_state
+    ORDER BY season, season_type, week, game_id
+"""
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def live_game_state(version: tuple) -> pd.DataFrame:
+    """cfb_live.game_state from one live snapshot; a new snapshot is a new version."""
+    conn = DashboardConnection(version[0])
+    try:
+        return conn.cursor().execute(LIVE_STATE_QUERY).fetchdf()
+    finally:
+        conn.close()
+
+
+def render_live_page() -> None:
+    st.subheader("🔴 Live Games")
+    live_path = latest_snapshot_path(LIVE_SNAPSHOT_DIR)
+    if live_path is None:
+        st.info("No live snapshot yet — on game day run `python -m pipelines.cfb_live`.")
+        return
+
+    df = live_game_state(db_version(live_path))
+    st.button("🔄 Refresh")
+    if df.empty:
+        st.info("No games in progress.")
+    else:
+        st.dataframe(df, hide_index=True, use_container_width=True)
+    st.caption(f"Serving live snapshot `{live_path.name}`")
+
+
+def render_drivers(matchups_df: pd.DataFrame) -> None:
+    """Top feature contributions behind one matchup's predictions."""
+    st.markdown("#### 🔍 Why the model likes a side")
+    labels = dict(zip(matchups_df["game_id"], matchups_df["matchup"]))
+    game_id = st.selectbox("Matchup", list(labels), format_func=labels.get)
+    drivers = run_query(DRIVERS_QUERY, DB_VERSION, (int(game_id),))
+    if drivers.empty:
+        st.info("No attributions stored for this game yet — they are written for predicted games by `python -m ai.cfb_ai`.")
+        return
+
+    for col, (target, title) in zip(st.columns(len(DRIVER_TARGETS)), DRIVER_TARGETS.items()):
+        rows = drivers[drivers["target"] == target]
+        top = rows.reindex(rows["contribution"].abs().sort_values(ascending=False).index).head(DRIVERS_SHOWN)
+        col.markdown(f"**{title}**")
+        col.dataframe(top[["feature", "feature_value", "contribution"]], hide_index=True, use_container_width=True)
+
+
+DB_VERSION = db_version()
 
 # --- Get all available tables ---
-tables_df = conn.execute("""
+tables_df = run_query("""
     SELECT table_schema, table_name
     FROM information_schema.tables
     WHERE table_schema NOT IN ('information_schema') AND table_schema NOT LIKE 'sqlmesh%'
-""").fetchdf()
+""", DB_VERSION)
 
 if tables_df.empty:
     st.warning("No tables found in the database.")
@@ -32,6 +358,15 @@ if tables_df.empty:
 # Remove DLT internal tables
 tables_df = tables_df[~tables_df["table_name"].str.startswith("_dlt")]
 
+# --- Page selector ---
+view = st.sidebar.radio("Page", ["🗓️ Weekly Matchups", "🔴 Live Games", "📋 Table Explorer"])
+if view == "🗓️ Weekly Matchups":
+    render_matchups_page(tables_df)
+    st.stop()
+if view == "🔴 Live Games":
+    render_live_page()
+    st.stop()
+
 # --- Schema selector ---
 schemas = sorted(tables_df["table_schema"].unique().tolist())
 selected_schema = st.selectbox("Select a schema:", schemas)
@@ -43,70 +378,134 @@ selected_table = st.selectbox(
     sorted(filtered_tables["table_name"].tolist())
 )
 
-# --- Load selected table ---
+# --- Load selected table (paged, filtered and sorted inside DuckDB) ---
 if selected_table:
     full_table_name = f'{selected_schema}.{selected_table}'
+    table_sql = f"{quote_ident(selected_schema)}.{quote_ident(selected_table)}"
     try:
-        df = conn.execute(f'SELECT * FROM {full_table_name} LIMIT 1000').fetchdf()
+        columns_df = run_query("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = ? AND table_name = ?
+            ORDER BY ordinal_position
+        """, DB_VERSION, (selected_schema, selected_table))
+        all_cols = columns_df["column_name"].tolist()
+        numeric_cols = columns_df.loc[
+            columns_df["data_type"].str.upper().str.startswith(NUMERIC_TYPES), "column_name"
+        ].tolist()
 
-        st.subheader(f"📋 Preview of `{full_table_name}`")
+        st.subheader(f"📋 Browse `{full_table_name}`")
+        shown_cols = st.multiselect("Columns", all_cols, default=all_cols[:12])
+
+        c1, c2, c3 = st.columns(3)
+        filter_col = c1.selectbox("Filter column", ["(none)"] + all_cols)
+        filter_op = c2.selectbox("Operator", list(FILTER_OPERATORS), disabled=filter_col == "(none)")
+        filter_val = c3.text_input("Value", disabled=filter_col == "(none)" or filter_op in ("is null", "is not null"))
+
+        where_sql, where_params = "", ()
+        if filter_col != "(none)":
+            filter_type = columns_df.set_index("column_name").loc[filter_col, "data_type"]
+            where_sql = "WHERE " + FILTER_OPERATORS[filter_op].format(col=quote_ident(filter_col), dtype=filter_type)
+            if "?" in where_sql:
+                where_params = (filter_val,)
+
+        c1, c2, c3, c4 = st.columns(4)
+        sort_col = c1.selectbox("Sort by", ["(none)"] + all_cols)
+        sort_desc = c2.checkbox("Descending")
+        page_size = c3.selectbox("Rows per page", [50, 100, 500, 1000], index=1)
+
+        total_rows = int(run_query(f"SELECT COUNT(*) AS n FROM {table_sql} {where_sql}", DB_VERSION, where_params)["n"].iloc[0])
+        pages = max(1, -(-total_rows // page_size))
+        page = c4.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1)
+
+        order_sql = ""
+        if sort_col != "(none)":
+            order_sql = f"ORDER BY {quote_ident(sort_col)} {'DESC' if sort_desc else 'ASC'} NULLS LAST"
+        select_sql = ", ".join(quote_ident(c) for c in (shown_cols or all_cols))
+        df = run_query(
+            f"SELECT {select_sql} FROM {table_sql} {where_sql} {order_sql} LIMIT ? OFFSET ?",
+            DB_VERSION,
+            where_params + (page_size, (int(page) - 1) * page_size),
+        )
+
+        st.caption(f"{total_rows:,} matching rows — showing {len(df):,} from row {(int(page) - 1) * page_size + 1:,}")
         st.dataframe(df)
 
-        # --- Basic visualization ---
-        numeric_cols = df.select_dtypes(include="number").columns.tolist()
+        # --- Basic visualization (aggregated in DuckDB over every matching row) ---
         if len(numeric_cols) > 1:
             st.subheader("📊 Quick Visualization")
             x_col = st.selectbox("X Axis", numeric_cols)
             y_col = st.selectbox("Y Axis", numeric_cols, index=min(1, len(numeric_cols) - 1))
+            mode = st.radio("Chart", ["Density (binned in DuckDB)", "Scatter (reservoir sample)"], horizontal=True)
+
+            x_sql, y_sql = quote_ident(x_col), quote_ident(y_col)
+            not_null = f"{x_sql} IS NOT NULL AND {y_sql} IS NOT NULL"
+            plot_where = f"{where_sql} AND {not_null}" if where_sql else f"WHERE {not_null}"
 
-            fig = px.scatter(df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}")
+            if mode.startswith("Density"):
+                bins = st.slider("Bins per axis", 10, 200, 60)
+                plot_df = run_query(f"""
+                    WITH pts AS (
+                        SELECT CAST({x_sql} AS DOUBLE) AS x, CAST({y_sql} AS DOUBLE) AS y
+                        FROM {table_sql} {plot_where}
+                    ),
+                    bounds AS (
+                        SELECT MIN(x) AS x0, MAX(x) AS x1, MIN(y) AS y0, MAX(y) AS y1 FROM pts
+                    ),
+                    binned AS (
+                        SELECT
+                            LEAST(FLOOR((x - x0) / NULLIF(x1 - x0, 0) * ?), ? - 1) AS bin_x,
+                            LEAST(FLOOR((y - y0) / NULLIF(y1 - y0, 0) * ?), ? - 1) AS bin_y,
+                            x0, x1, y0, y1
+                        FROM pts, bounds
+                    )
+                    SELECT
+                        ANY_VALUE(x0) + (COALESCE(bin_x, 0) + 0.5) * (ANY_VALUE(x1) - ANY_VALUE(x0)) / ? AS {x_sql},
+                        ANY_VALUE(y0) + (COALESCE(bin_y, 0) + 0.5) * (ANY_VALUE(y1) - ANY_VALUE(y0)) / ? AS {y_sql},
+                        COUNT(*) AS row_count
+                    FROM binned
+                    GROUP BY bin_x, bin_y
+                """, DB_VERSION, where_params + (bins,) * 6)
+                fig = px.density_heatmap(
+                    plot_df, x=x_col, y=y_col, z="row_count", histfunc="sum",
+                    nbinsx=bins, nbinsy=bins, title=f"{y_col} vs {x_col} — all {total_rows:,} rows",
+                )
+            else:
+                plot_df = run_query(
+                    f"SELECT {x_sql}, {y_sql} FROM (SELECT {x_sql}, {y_sql} FROM {table_sql} {plot_where}) "
+                    f"USING SAMPLE reservoir({PLOT_POINTS} ROWS) REPEATABLE (42)",
+                    DB_VERSION,
+                    where_params,
+                )
+                fig = px.scatter(
+                    plot_df, x=x_col, y=y_col, opacity=0.5,
+                    title=f"{y_col} vs {x_col} — {len(plot_df):,} sampled of {total_rows:,} rows",
+                )
             st.plotly_chart(fig, use_container_width=True)
 
         # --- Custom SQL Query ---
         st.subheader("🧠 Run Custom SQL Query")
-        query = st.text_area("Enter your SQL query:", f"""-- AP Top 25 Matchup Predictions
-WITH rankings AS (
-    SELECT *
-    FROM cfb.cfb_rankings
-    WHERE poll = 'AP Top 25'
-)
-SELECT 
-    CONCAT('Week ', week,', ',season, ' ',DAYNAME(cg.start_date),' @',CASE WHEN DATEPART('HOUR', cg.start_date) > 12 THEN DATEPART('HOUR', cg.start_date) - 12 ELSE DATEPART('HOUR', cg.start_date) END, 'pm') AS game_details,
-    CONCAT(CASE WHEN hr.rank NOT NULL THEN CONCAT(hr.rank,' ')END,cg.home_team, ' vs. ',CASE WHEN ar.rank NOT NULL THEN CONCAT(ar.rank,' ')END, cg.away_team) AS matchup,
-    CASE WHEN cp.home_win_pred = 1 THEN cg.home_team ELSE cg.away_team END AS predicted_winner,
-    CASE WHEN cp.home_win_pred = 1 THEN ROUND(cp.home_win_prob * 100, 0) ELSE ROUND((1-cp.home_win_prob)*100,0) END AS win_pred_prob,
-    ai_recommendation AS bet_recommendation,
-    ROUND(cp.point_spread_pred,0) AS point_spread_pred,
-    cg.home_points - cg.away_points AS point_spread_actual,
-    CASE WHEN (cg.home_points > cg.away_points AND cp.home_win_pred = 1) OR (cg.home_points < cg.away_points AND cp.home_win_pred = 0) THEN TRUE ELSE FALSE END AS win_pred_correct,
-FROM cfb.cfb_games cg
-LEFT JOIN cfb.cfb_predictions cp
-    USING(season, week, home_id, away_id)
-LEFT JOIN rankings hr
-    ON cg.home_id = hr.team_id
-    AND cg.season = hr.season
-    AND cg.season_type = hr.season_type
-    AND cg.week = hr.week
-LEFT JOIN rankings ar
-    ON cg.away_id = ar.team_id
-    AND cg.season = ar.season
-    AND cg.season_type = ar.season_type
-    AND cg.week = ar.week
-LEFT JOIN cfb.ai_best_bets bb
-   ON bb.season = cg.season
-   AND bb.week = cg.week
-   AND bb.home_id = cg.home_id
-   AND bb.away_id = cg.away_id
-WHERE season = 2025 
-    AND week = 9 
-    --AND (cg.home_conference = 'ACC' OR cg.away_conference = 'ACC')
-    AND (ar.rank IS NOT NULL OR hr.rank IS NOT NULL)
-GROUP BY cg.start_date, season, week, hr.rank,cg.home_team, ar.rank,cg.away_team, cp.home_win_pred, cp.home_win_prob,  bb.ai_recommendation, cp.point_spread_pred, home_points, away_points
-ORDER BY cg.start_date, hr.rank, ar.rank, cg.home_team, cg.away_team ASC""", height = 600)
+        query = st.text_area("Enter your SQL query:", f"SELECT *\nFROM {table_sql}\nLIMIT 100", height=200)
+        c1, c2 = st.columns([1, 3])
+        explain = c1.toggle("Explain / Profile", help="Show DuckDB's EXPLAIN ANALYZE timing tree")
+        c2.caption(
+            f"Limits: {QUERY_TIMEOUT_S:.0f}s timeout, {QUERY_MAX_ROWS:,} rows, "
+            f"{DUCKDB_MEMORY_LIMIT} memory, {DUCKDB_THREADS} threads"
+        )
         if st.button("Run Query"):
+            status = st.empty()
             try:
-                result = conn.execute(query).fetchdf()
-                st.write(result)
+                if explain:
+                    st.code(explain_analyze(query, status), language="text")
+                else:
+                    result, truncated = run_governed(query, status)
+                    if truncated:
+                        st.warning(f"Result capped at {QUERY_MAX_ROWS:,} rows.")
+                    st.write(result)
+            except TimeoutError as e:
+                st.error(f"⏱️ {e}")
+            except duckdb.InterruptException:
+                st.error("Query was cancelled.")
             except Exception as e:
                 st.error(f"Query failed: {e}")
 
@@ -114,5 +513,3 @@ ORDER BY cg.start_date, hr.rank, ar.rank, cg.home_team, cg.away_team ASC""", hei
         st.error(f"❌ Error loading table `{selected_table}`: {e}")
 else:
     st.info("Please select a table to display.")
-
-conn.close()
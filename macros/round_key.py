@@ -0,0 +1,11 @@
+from sqlglot import exp
+from sqlmesh import macro
+
+from shared.rounds import round_key_sql
+
+
+@macro()
+def round_key(evaluator, season: exp.Expression, season_type: exp.Expression, week: exp.Expression) -> exp.Expression:
+    """@round_key(g.season, g.season_type, g.week): the same game order as ai.cfb_elo.ROUND_KEY_SQL."""
+    columns = (arg.sql(dialect=evaluator.dialect) for arg in (season, season_type, week))
+    return exp.maybe_parse(round_key_sql(*columns), dialect=evaluator.dialect)
@@ -0,0 +1,50 @@
+MODEL (
+    name cfb.cfb_player_rolling_stats,
+    kind FULL
+);
+/* Per player per game production with pregame rolling averages (previous 3 games, in round key order, macros/round_key.py) */
+WITH player_game AS (
+    SELECT
+        s.player_id,
+        s.game_id,
+        s.team_name,
+        s.season,
+        s.week,
+        @round_key(s.season, g.season_type, s.week) AS round_key,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'passing_yds') AS pass_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'rushing_yds') AS rush_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'receiving_yds') AS receiving_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key IN ('passing_td', 'rushing_td', 'receiving_td')) AS total_tds,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_tot') AS tackles,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_sacks') AS sacks
+    FROM cfb.cfb_player_stats_parsed AS s
+    LEFT JOIN cfb.cfb_games AS g
+        ON g.game_id = s.game_id
+    GROUP BY s.player_id, s.game_id, s.team_name, s.season, s.week, g.season_type
+)
+SELECT
+    pg.player_id,
+    pg.game_id,
+    pg.team_name,
+    pg.season,
+    pg.week,
+    pg.pass_yards,
+    pg.rush_yards,
+    pg.receiving_yards,
+    pg.total_tds,
+    pg.tackles,
+    pg.sacks,
+    COALESCE(pg.pass_yards, 0) + COALESCE(pg.rush_yards, 0) + COALESCE(pg.receiving_yards, 0) AS scrimmage_yards,
+    COUNT(*) OVER recent AS games_l3,
+    AVG(pg.pass_yards) OVER recent AS pass_yards_l3,
+    AVG(pg.rush_yards) OVER recent AS rush_yards_l3,
+    AVG(pg.receiving_yards) OVER recent AS receiving_yards_l3,
+    AVG(pg.total_tds) OVER recent AS total_tds_l3,
+    AVG(pg.tackles) OVER recent AS tackles_l3,
+    AVG(pg.sacks) OVER recent AS sacks_l3
+FROM player_game AS pg
+WINDOW recent AS (
+    PARTITION BY pg.player_id
+    ORDER BY pg.round_key, pg.game_id
+    ROWS BETWEEN 3 PRECEDING AND 1 PRECEDING
+)
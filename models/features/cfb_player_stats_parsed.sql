@@ -0,0 +1,46 @@
+MODEL (
+    name cfb.cfb_player_stats_parsed,
+    kind FULL
+);
+/* Typed box-score stats: "21/30" and "4-12" become made/attempted, plain numbers become stat_value */
+WITH raw_stats AS (
+    SELECT
+        game_id,
+        player_id,
+        team_name,
+        season,
+        week,
+        LOWER(stat_category) AS stat_category,
+        LOWER(REGEXP_REPLACE(TRIM(stat_type), '[^A-Za-z0-9]+', '_', 'g')) AS stat_type,
+        TRIM(player_stat) AS player_stat
+    FROM cfb.cfb_game_player_stats
+), split_stats AS (
+    SELECT
+        game_id,
+        player_id,
+        team_name,
+        season,
+        week,
+        stat_category,
+        stat_type,
+        CONCAT(stat_category, '_', stat_type) AS stat_key,
+        player_stat,
+        TRY_CAST(REGEXP_EXTRACT(player_stat, '^(\d+)\s*[/-]\s*(\d+)$', 1) AS DOUBLE) AS stat_made,
+        TRY_CAST(REGEXP_EXTRACT(player_stat, '^(\d+)\s*[/-]\s*(\d+)$', 2) AS DOUBLE) AS stat_attempted,
+        TRY_CAST(player_stat AS DOUBLE) AS stat_number
+    FROM raw_stats
+)
+SELECT
+    game_id,
+    player_id,
+    team_name,
+    season,
+    week,
+    stat_category,
+    stat_type,
+    stat_key,
+    player_stat,
+    stat_made,
+    stat_attempted,
+    COALESCE(stat_made, stat_number) AS stat_value
+FROM split_stats
@@ -0,0 +1,169 @@
+MODEL (
+    name cfb.cfb_team_box_stats,
+    kind FULL
+);
+/*
+Per team per scheduled game (every cfb.cfb_games row, played or not): box-score totals for
+played games, plus pregame form for cfb_ai = averages over the team's previous 3 played games,
+ordered by the round key macro (macros/round_key.py, the order ai/cfb_elo.py rates games in), so upcoming games get the
+same features at prediction time as completed games got in training
+*/
+WITH team_game AS (
+    SELECT
+        s.game_id,
+        s.team_name,
+        s.season,
+        s.week,
+        SUM(s.stat_made) FILTER (WHERE s.stat_key = 'passing_c_att') AS pass_completions,
+        SUM(s.stat_attempted) FILTER (WHERE s.stat_key = 'passing_c_att') AS pass_attempts,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'passing_yds') AS pass_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'passing_td') AS pass_tds,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'passing_int') AS interceptions_thrown,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'rushing_car') AS rush_attempts,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'rushing_yds') AS rush_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'rushing_td') AS rush_tds,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'receiving_rec') AS receptions,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'fumbles_lost') AS fumbles_lost,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_tot') AS tackles,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_sacks') AS sacks,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_tfl') AS tackles_for_loss,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_pd') AS passes_defended,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'defensive_qb_hur') AS qb_hurries,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'interceptions_int') AS interceptions_caught,
+        SUM(s.stat_made) FILTER (WHERE s.stat_key = 'kicking_fg') AS fg_made,
+        SUM(s.stat_attempted) FILTER (WHERE s.stat_key = 'kicking_fg') AS fg_attempted,
+        SUM(s.stat_made) FILTER (WHERE s.stat_key = 'kicking_xp') AS xp_made,
+        SUM(s.stat_attempted) FILTER (WHERE s.stat_key = 'kicking_xp') AS xp_attempted,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'punting_no') AS punts,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'kickreturns_yds') AS kick_return_yards,
+        SUM(s.stat_value) FILTER (WHERE s.stat_key = 'puntreturns_yds') AS punt_return_yards
+    FROM cfb.cfb_player_stats_parsed AS s
+    GROUP BY s.game_id, s.team_name, s.season, s.week
+), team_ids AS (
+    SELECT
+        t.team_name,
+        t.season,
+        MIN(t.team_id) AS team_id
+    FROM cfb.cfb_teams AS t
+    GROUP BY t.team_name, t.season
+), schedule AS (
+    SELECT g.game_id, g.season, g.week, g.season_type, g.home_id AS team_id
+    FROM cfb.cfb_games AS g
+    UNION ALL
+    SELECT g.game_id, g.season, g.week, g.season_type, g.away_id AS team_id
+    FROM cfb.cfb_games AS g
+), timeline AS (
+    SELECT
+        sc.game_id,
+        sc.team_id,
+        sc.season,
+        sc.week,
+        @round_key(sc.season, sc.season_type, sc.week) AS round_key,
+        tg.team_name,
+        tg.pass_completions,
+        tg.pass_attempts,
+        tg.pass_yards,
+        tg.pass_tds,
+        tg.interceptions_thrown,
+        tg.rush_attempts,
+        tg.rush_yards,
+        tg.rush_tds,
+        tg.receptions,
+        tg.fumbles_lost,
+        tg.tackles,
+        tg.sacks,
+        tg.tackles_for_loss,
+        tg.passes_defended,
+        tg.qb_hurries,
+        tg.interceptions_caught,
+        tg.fg_made,
+        tg.fg_attempted,
+        tg.xp_made,
+        tg.xp_attempted,
+        tg.punts,
+        tg.kick_return_yards,
+        tg.punt_return_yards,
+        tg.pass_completions / NULLIF(tg.pass_attempts, 0) AS completion_pct,
+        tg.pass_yards / NULLIF(tg.pass_attempts, 0) AS yards_per_pass_attempt,
+        tg.rush_yards / NULLIF(tg.rush_attempts, 0) AS yards_per_rush,
+        COALESCE(tg.interceptions_thrown, 0) + COALESCE(tg.fumbles_lost, 0) AS turnovers,
+        tg.game_id IS NOT NULL AS played
+    FROM schedule AS sc
+    LEFT JOIN (
+        SELECT tg.*, ti.team_id
+        FROM team_game AS tg
+        JOIN team_ids AS ti
+            ON ti.team_name = tg.team_name
+            AND ti.season = tg.season
+    ) AS tg
+        ON tg.game_id = sc.game_id
+        AND tg.team_id = sc.team_id
+), sequenced AS (
+    /* played_seq numbers a team's played games; prior_played is how many it had played before this one */
+    SELECT
+        tl.*,
+        CASE WHEN tl.played THEN COUNT(*) FILTER (WHERE tl.played) OVER through_game END AS played_seq,
+        COALESCE(COUNT(*) FILTER (WHERE tl.played) OVER before_game, 0) AS prior_played
+    FROM timeline AS tl
+    WINDOW
+        through_game AS (PARTITION BY tl.team_id ORDER BY tl.round_key, tl.game_id ROWS UNBOUNDED PRECEDING),
+        before_game AS (PARTITION BY tl.team_id ORDER BY tl.round_key, tl.game_id ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+), form AS (
+    /* Form after each played game = averages over it and the team's two previous played games */
+    SELECT
+        sq.team_id,
+        sq.played_seq,
+        AVG(sq.pass_yards) OVER last3 AS pass_yards_l3,
+        AVG(sq.rush_yards) OVER last3 AS rush_yards_l3,
+        AVG(sq.completion_pct) OVER last3 AS completion_pct_l3,
+        AVG(sq.yards_per_rush) OVER last3 AS yards_per_rush_l3,
+        AVG(sq.turnovers) OVER last3 AS turnovers_l3,
+        AVG(sq.sacks) OVER last3 AS sacks_l3
+    FROM sequenced AS sq
+    WHERE sq.played
+    WINDOW last3 AS (PARTITION BY sq.team_id ORDER BY sq.played_seq ROWS BETWEEN 2 PRECEDING AND CURRENT ROW)
+)
+SELECT
+    sq.game_id,
+    sq.team_id,
+    sq.team_name,
+    sq.season,
+    sq.week,
+    sq.pass_completions,
+    sq.pass_attempts,
+    sq.pass_yards,
+    sq.pass_tds,
+    sq.interceptions_thrown,
+    sq.rush_attempts,
+    sq.rush_yards,
+    sq.rush_tds,
+    sq.receptions,
+    sq.fumbles_lost,
+    sq.tackles,
+    sq.sacks,
+    sq.tackles_for_loss,
+    sq.passes_defended,
+    sq.qb_hurries,
+    sq.interceptions_caught,
+    sq.fg_made,
+    sq.fg_attempted,
+    sq.xp_made,
+    sq.xp_attempted,
+    sq.punts,
+    sq.kick_return_yards,
+    sq.punt_return_yards,
+    sq.completion_pct,
+    sq.yards_per_pass_attempt,
+    sq.yards_per_rush,
+    CASE WHEN sq.played THEN sq.turnovers END AS turnovers,
+    f.pass_yards_l3,
+    f.rush_yards_l3,
+    f.completion_pct_l3,
+    f.yards_per_rush_l3,
+    f.turnovers_l3,
+    f.sacks_l3
+FROM sequenced AS sq
+/* Pregame form = form after the team's last played game before this one */
+LEFT JOIN form AS f
+    ON f.team_id = sq.team_id
+    AND f.played_seq = sq.prior_played
@@ -9,6 +9,7 @@ SELECT DISTINCT
     week,
     offense AS offense_team_name,
     defense AS defense_team_name,
+    is_home_offense,
     drive_number,
     scoring,
     drive_result,
@@ -30,4 +31,4 @@ SELECT DISTINCT
     end_time_seconds,
     elapsed_minutes,
     elapsed_seconds
-FROM cfb.cfb_drives_source
\ No newline at end of file
+FROM cfb.cfb_drives_source
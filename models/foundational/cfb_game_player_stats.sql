@@ -11,4 +11,4 @@ SELECT DISTINCT
     category_name AS stat_category,
     type_name AS stat_type,
     stat AS player_stat
-FROM cfb.cfb_game_players_source
\ No newline at end of file
+FROM cfb.cfb_game_players_source
@@ -22,4 +22,4 @@ SELECT DISTINCT
     away_pregame_elo,
     away_postgame_elo,
     excitement_index
-FROM cfb.cfb_games_source
\ No newline at end of file
+FROM cfb.cfb_games_source
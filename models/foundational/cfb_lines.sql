@@ -16,4 +16,4 @@ SELECT DISTINCT
     spread AS spread_close,
     over_under_open,
     over_under AS over_under_close
-FROM cfb.cfb_lines_source
\ No newline at end of file
+FROM cfb.cfb_lines_source
@@ -6,6 +6,16 @@ SELECT DISTINCT
     id AS play_id,
     drive_id,
     game_id,
+    year AS season,
+    week,
+    offense AS offense_team_name,
+    offense_conference,
+    defense AS defense_team_name,
+    defense_conference,
+    home AS home_team_name,
+    away AS away_team_name,
+    offense_score,
+    defense_score,
     drive_number,
     play_number,
     period AS quarter,
@@ -20,5 +30,6 @@ SELECT DISTINCT
     yards_gained,
     scoring,
     play_type,
-    play_text
-FROM cfb.cfb_plays_source
\ No newline at end of file
+    play_text,
+    ppa
+FROM cfb.cfb_plays_source
@@ -11,4 +11,4 @@ SELECT DISTINCT
     rank AS team_rank,
     first_place_votes,
     points AS poll_points
-FROM cfb.cfb_rankings_source
\ No newline at end of file
+FROM cfb.cfb_rankings_source
@@ -16,4 +16,4 @@ SELECT DISTINCT
     home_country,
     home_latitude,
     home_longitude
-FROM cfb.cfb_roster_source
\ No newline at end of file
+FROM cfb.cfb_roster_source
@@ -18,4 +18,4 @@ SELECT DISTINCT
     grass AS stadium_is_grass,
     dome AS stadium_is_dome,
     season
-FROM cfb.cfb_teams_source
\ No newline at end of file
+FROM cfb.cfb_teams_source
@@ -13,4 +13,4 @@ SELECT DISTINCT
     twitter AS team_twitter_handle,
     season AS season,
     location_id AS stadium_id
-FROM cfb.cfb_teams_source
\ No newline at end of file
+FROM cfb.cfb_teams_source
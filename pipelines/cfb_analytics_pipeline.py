@@ -85,5 +85,8 @@ def run_pipeline(years: list[int]):
         print(f"✅ Pipeline completed for {year}!")
         print(load_info)
 
+    # No snapshot here: snapshots hold models, not *_source tables, so cfb_ai and the
+    # orchestrator publish once sqlmesh has rebuilt them
+
 if __name__ == "__main__":
     run_pipeline(years=[2025])
@@ -0,0 +1,442 @@
+# cfb_live.py
+"""
+Game-day live mode, for near-real-time numbers without a full pipeline run:
+- Finds in-progress games in cfb_games (not completed, kicked off within the last
+  CFB_LIVE_WINDOW_H hours), re-checked every CFB_LIVE_DISCOVER_S seconds; discovery
+  also records completion and final scores, and drops games (with their plays,
+  drives and win probabilities) that left the window
+- Each cycle sends one /plays, one /drives and one /games request per (season, week,
+  season type) that has a live game — normally 3 requests, however many seasons are loaded.
+  Requests are conditional (If-None-Match / If-Modified-Since, plus a body hash
+  for responses without validators), so an unchanged feed is skipped unparsed
+- Only play ids not seen before are appended to cfb_live.plays_source; drives of
+  live games are replaced as they grow; /games marks games completed with their final
+  score as soon as the feed has it, instead of waiting for the next batch snapshot
+- Games that got new plays are rescored with the saved play win probability model
+  (ai.cfb_play_model), their scores are taken from the last play, cfb_live.game_state
+  is rebuilt for the games still in progress, and the cfb_live schema is published
+  as a small snapshot under snapshots/live/ (read by the dashboard's Live Games page,
+  or directly: duckdb.connect(latest_snapshot_path(SNAPSHOT_DIR / "live"), read_only=True))
+- Writes its own DuckDB file (CFB_LIVE_DB), so it never waits on the batch
+  pipeline's writer
+
+Run with: python -m pipelines.cfb_live [--interval 15] [--once]
+"""
+
+import argparse
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+import duckdb
+import pyarrow as pa
+import requests
+
+from ai.cfb_play_model import MODEL_PATH, ensure_win_prob_table, load_play_model, play_features_sql, score_plays
+from shared.app_config import get_app_config
+from shared.snapshots import SNAPSHOT_DIR, connect_snapshot, publish_snapshot
+from pipelines.sources.cfb_drives import drive_row
+from pipelines.sources.cfb_plays import play_row
+
+API_URL = "https://api.collegefootballdata.com"
+REQUEST_TIMEOUT_S = 10
+
+LIVE_DB = os.getenv("CFB_LIVE_DB", "cfb_live.duckdb")
+LIVE_SNAPSHOT_DIR = SNAPSHOT_DIR / "live"
+POLL_S = float(os.getenv("CFB_LIVE_POLL_S", "15"))
+DISCOVER_S = float(os.getenv("CFB_LIVE_DISCOVER_S", "300"))
+WINDOW_H = int(os.getenv("CFB_LIVE_WINDOW_H", "6"))
+
+LIVE_WIN_PROB_TABLE = "cfb_live.play_win_prob"
+
+# Every game kicked off within the window, finished or not: finished ones carry their
+# completion and final score into cfb_live.games, the rest are the live set
+LIVE_GAMES_SQL = """
+    WITH team_names AS (
+        SELECT team_id, season, ANY_VALUE(team_name) AS team_name
+        FROM cfb.cfb_teams
+        GROUP BY team_id, season
+    )
+    SELECT
+        g.game_id, g.season, g.week, g.season_type,
+        h.team_name AS home_team, a.team_name AS away_team,
+        COALESCE(g.game_completed, FALSE) AS game_completed, g.home_points, g.away_points
+    FROM cfb.cfb_games g
+    LEFT JOIN team_names h ON h.team_id = g.home_id AND h.season = g.season
+    LEFT JOIN team_names a ON a.team_id = g.away_id AND a.season = g.season
+    WHERE TRY_CAST(g.start_date AS TIMESTAMPTZ)
+          BETWEEN now() - to_hours(CAST(? AS BIGINT)) AND now() + INTERVAL 15 MINUTE
+    ORDER BY g.game_id
+"""
+
+LIVE_SCHEMA_SQL = """
+CREATE SCHEMA IF NOT EXISTS cfb_live;
+
+CREATE TABLE IF NOT EXISTS cfb_live.games (
+    game_id BIGINT PRIMARY KEY,
+    season INTEGER,
+    week INTEGER,
+    season_type VARCHAR,
+    home_team VARCHAR,
+    away_team VARCHAR,
+    game_completed BOOLEAN,
+    home_points INTEGER,
+    away_points INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS cfb_live.plays_source (
+    id BIGINT, drive_id BIGINT, game_id BIGINT, drive_number INTEGER, play_number INTEGER,
+    offense VARCHAR, offense_conference VARCHAR, offense_score INTEGER,
+    defense VARCHAR, defense_conference VARCHAR, defense_score INTEGER,
+    home VARCHAR, away VARCHAR, period INTEGER, clock_minutes INTEGER, clock_seconds INTEGER,
+    offense_timeouts INTEGER, defense_timeouts INTEGER, yardline INTEGER, yards_to_goal INTEGER,
+    down INTEGER, distance INTEGER, yards_gained INTEGER, scoring BOOLEAN,
+    play_type VARCHAR, play_text VARCHAR, ppa DOUBLE, wallclock VARCHAR, year INTEGER, week INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS cfb_live.drives_source (
+    id BIGINT, game_id BIGINT, offense VARCHAR, offense_conference VARCHAR,
+    defense VARCHAR, defense_conference VARCHAR, is_home_offense BOOLEAN, drive_number INTEGER,
+    scoring BOOLEAN, drive_result VARCHAR, plays INTEGER, yards INTEGER,
+    start_period INTEGER, end_period INTEGER, start_yardline INTEGER, end_yardline INTEGER,
+    start_yards_to_goal INTEGER, end_yards_to_goal INTEGER,
+    start_offense_score INTEGER, start_defense_score INTEGER, end_offense_score INTEGER, end_defense_score INTEGER,
+    start_time_minutes INTEGER, start_time_seconds INTEGER, end_time_minutes INTEGER, end_time_seconds INTEGER,
+    elapsed_minutes INTEGER, elapsed_seconds INTEGER, year INTEGER, week INTEGER
+);
+
+-- Same column names as the cfb.cfb_plays model, so the play model's feature query runs unchanged
+CREATE OR REPLACE VIEW cfb_live.plays AS
+SELECT
+    id AS play_id, drive_id, game_id, year AS season, week,
+    offense AS offense_team_name, offense_conference,
+    defense AS defense_team_name, defense_conference,
+    home AS home_team_name, away AS away_team_name,
+    offense_score, defense_score, drive_number, play_number,
+    period AS quarter, clock_minutes, clock_seconds, offense_timeouts, defense_timeouts,
+    yardline, yards_to_goal, down, distance AS distance_to_first_down,
+    yards_gained, scoring, play_type, play_text, ppa
+FROM cfb_live.plays_source;
+"""
+
+# Latest play of every game still in progress: score, clock and the home side's win probability
+GAME_STATE_SQL = f"""
+CREATE OR REPLACE TABLE cfb_live.game_state AS
+WITH last_play AS (
+    SELECT *, COUNT(*) OVER (PARTITION BY game_id) AS plays
+    FROM cfb_live.plays
+    WHERE game_id IN (SELECT game_id FROM cfb_live.games WHERE NOT game_completed)
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY game_id ORDER BY drive_number DESC NULLS LAST, play_number DESC NULLS LAST, play_id DESC
+    ) = 1
+)
+SELECT
+    g.game_id,
+    g.season,
+    g.season_type,
+    g.week,
+    g.home_team,
+    g.away_team,
+    CASE WHEN p.offense_team_name = p.home_team_name THEN p.offense_score ELSE p.defense_score END AS home_score,
+    CASE WHEN p.offense_team_name = p.home_team_name THEN p.defense_score ELSE p.offense_score END AS away_score,
+    p.quarter,
+    p.clock_minutes,
+    p.clock_seconds,
+    p.offense_team_name AS possession,
+    CASE
+        WHEN p.offense_team_name = p.home_team_name THEN wp.offense_win_prob
+        ELSE 1 - wp.offense_win_prob
+    END AS home_win_prob,
+    wp.model_version,
+    COALESCE(p.plays, 0) AS plays,
+    current_localtimestamp() AS updated_at
+FROM cfb_live.games g
+LEFT JOIN last_play p USING (game_id)
+LEFT JOIN {LIVE_WIN_PROB_TABLE} wp ON wp.play_id = p.play_id
+WHERE NOT g.game_completed
+ORDER BY g.game_id
+"""
+
+# Running score of unfinished games, from their latest play (the schedule only has final scores)
+LIVE_SCORES_SQL = """
+UPDATE cfb_live.games g
+SET home_points = s.home_score, away_points = s.away_score
+FROM cfb_live.game_state s
+WHERE s.game_id = g.game_id AND s.home_score IS NOT NULL
+"""
+
+# Completion and score from the live /games feed; a game never goes back to in progress
+LIVE_RESULTS_SQL = """
+UPDATE cfb_live.games g
+SET game_completed = g.game_completed OR r.completed,
+    home_points = COALESCE(r.home_points, g.home_points),
+    away_points = COALESCE(r.away_points, g.away_points)
+FROM (SELECT UNNEST(?) AS game_id, UNNEST(?) AS completed, UNNEST(?) AS home_points, UNNEST(?) AS away_points) r
+WHERE r.game_id = g.game_id
+"""
+
+LIVE_GAMES_COLUMNS = "game_id, season, week, season_type, home_team, away_team, game_completed, home_points, away_points"
+
+# Everything stored for games no longer in cfb_live.games (run after pruning it to the window)
+PRUNE_SQL = [
+    "DELETE FROM cfb_live.plays_source WHERE game_id NOT IN (SELECT game_id FROM cfb_live.games)",
+    "DELETE FROM cfb_live.drives_source WHERE game_id NOT IN (SELECT game_id FROM cfb_live.games)",
+    f"DELETE FROM {LIVE_WIN_PROB_TABLE} WHERE game_id NOT IN (SELECT game_id FROM cfb_live.games)",
+]
+
+
+# -------------------------
+# Conditional HTTP
+# -------------------------
+class ConditionalFetcher:
+    """
+    GETs against the CFBD API that remember each URL's validators (ETag / Last-Modified)
+    and body hash; `get` returns None when nothing changed since the last 200.
+    """
+
+    def __init__(self, api_key: str, session: Optional[requests.Session] = None):
+        self.session = session or requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        self._seen: Dict[Tuple, Tuple[Optional[str], Optional[str], str]] = {}
+        self.requests = 0
+        self.not_modified = 0
+
+    def get(self, path: str, params: dict) -> Optional[list]:
+        key = (path, tuple(sorted(params.items())))
+        etag, modified, digest = self._seen.get(key, (None, None, ""))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+        self.requests += 1
+        try:
+            resp = self.session.get(f"{API_URL}/{path}", params=params, headers=headers, timeout=REQUEST_TIMEOUT_S)
+        except requests.RequestException as e:
+            print(f"⚠️ /{path} {params}: {e}")
+            return None
+        if resp.status_code == 304:
+            self.not_modified += 1
+            return None
+        if resp.status_code != 200:
+            print(f"⚠️ /{path} {params}: {resp.status_code} {resp.text[:200]}")
+            return None
+
+        body_digest = hashlib.sha1(resp.content).hexdigest()
+        self._seen[key] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body_digest)
+        if body_digest == digest:
+            self.not_modified += 1
+            return None
+        return resp.json()
+
+
+# -------------------------
+# Live state
+# -------------------------
+def ensure_live_schema(con) -> None:
+    con.execute(LIVE_SCHEMA_SQL)
+    ensure_win_prob_table(con, LIVE_WIN_PROB_TABLE)
+
+
+def discover_live_games(con, window_h: int = WINDOW_H) -> Optional[List[tuple]]:
+    """
+    Games in the window from the latest published snapshot (so the batch pipeline's
+    writer never blocks us), upserted into cfb_live.games with their completion and
+    final scores; games that left the window are pruned. Returns the games still in
+    progress (a game the live feed already finished stays finished), or None if the
+    schedule can't be read.
+    """
+    try:
+        source = connect_snapshot()
+    except duckdb.Error as e:
+        print(f"⚠️ Could not read cfb_games: {e}")
+        return None
+    try:
+        games = source.execute(LIVE_GAMES_SQL, [window_h]).fetchall()
+    except duckdb.Error as e:
+        print(f"⚠️ Could not read cfb_games: {e}")
+        return None
+    finally:
+        source.close()
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if games:
+            # Scores stay at the last play's until the schedule has the final
+            con.executemany("""
+                INSERT INTO cfb_live.games
+                    (game_id, season, week, season_type, home_team, away_team, game_completed, home_points, away_points)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (game_id) DO UPDATE SET
+                    game_completed = EXCLUDED.game_completed OR game_completed,
+                    home_points = COALESCE(EXCLUDED.home_points, home_points),
+                    away_points = COALESCE(EXCLUDED.away_points, away_points)
+            """, games)
+        con.execute(
+            "DELETE FROM cfb_live.games WHERE game_id NOT IN (SELECT UNNEST(?))",
+            [[game_id for game_id, *_ in games]],
+        )
+        for sql in PRUNE_SQL:
+            con.execute(sql)
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    return live_games(con)
+
+
+def live_games(con) -> List[tuple]:
+    """Games in cfb_live.games still in progress, as (game_id, season, week, season_type, ...)."""
+    return con.execute(
+        f"SELECT {LIVE_GAMES_COLUMNS} FROM cfb_live.games WHERE NOT game_completed ORDER BY game_id"
+    ).fetchall()
+
+
+def _insert_rows(con, table: str, rows: List[dict]) -> None:
+    con.register("___live_rows", pa.Table.from_pylist(rows))
+    try:
+        con.execute(f"INSERT INTO {table} BY NAME SELECT * FROM ___live_rows")
+    finally:
+        con.unregister("___live_rows")
+
+
+def poll_cycle(
+    con, fetcher: ConditionalFetcher, games: List[tuple], seen: Set[int]
+) -> Tuple[Set[int], int, Set[int]]:
+    """
+    One poll of every week with a live game. Appends unseen plays (adding them to `seen`),
+    replaces changed drives and records completion and scores from /games. Returns
+    (game ids with new plays, drives written, game ids that finished).
+    """
+    live_ids = {game_id for game_id, *_ in games}
+    weeks = sorted({(season, week, season_type) for _, season, week, season_type, *_ in games})
+
+    new_plays: List[dict] = []
+    new_drives: Dict[int, dict] = {}
+    results: Dict[int, tuple] = {}
+    for season, week, season_type in weeks:
+        params = {"year": season, "week": week, "seasonType": season_type}
+
+        for play in fetcher.get("plays", params) or []:
+            if play.get("gameId") not in live_ids or play.get("id") is None:
+                continue
+            play_id = int(play["id"])
+            if play_id in seen:
+                continue
+            seen.add(play_id)
+            new_plays.append(play_row(play, season, week))
+
+        for drive in fetcher.get("drives", params) or []:
+            if drive.get("gameId") in live_ids and drive.get("id") is not None:
+                new_drives[int(drive["id"])] = drive_row(drive, season, week)
+
+        for game in fetcher.get("games", params) or []:
+            if game.get("id") in live_ids:
+                results[int(game["id"])] = (
+                    bool(game.get("completed")), game.get("homePoints"), game.get("awayPoints")
+                )
+
+    con.execute("BEGIN TRANSACTION")
+    try:
+        if new_plays:
+            _insert_rows(con, "cfb_live.plays_source", new_plays)
+        if new_drives:
+            con.execute("DELETE FROM cfb_live.drives_source WHERE id IN (SELECT UNNEST(?))", [list(new_drives)])
+            _insert_rows(con, "cfb_live.drives_source", list(new_drives.values()))
+        if results:
+            game_ids = list(results)
+            completed, home_points, away_points = (list(col) for col in zip(*results.values()))
+            con.execute(LIVE_RESULTS_SQL, [game_ids, completed, home_points, away_points])
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        seen.difference_update(int(p["id"]) for p in new_plays)
+        raise
+
+    finished = {game_id for game_id, (completed, *_) in results.items() if completed}
+    return {p["game_id"] for p in new_plays}, len(new_drives), finished
+
+
+def rescore(con, model, game_ids: Set[int]) -> int:
+    """Rescore the plays of `game_ids`, rebuild cfb_live.game_state and update running scores."""
+    scored = 0
+    if model is not None and game_ids:
+        booster, version = model
+        scored = score_plays(
+            con, booster, version, game_ids=sorted(game_ids),
+            features_sql=play_features_sql("cfb_live.plays", "cfb_live.games"),
+            table=LIVE_WIN_PROB_TABLE,
+        )
+    con.execute(GAME_STATE_SQL)
+    con.execute(LIVE_SCORES_SQL)
+    return scored
+
+
+# -------------------------
+# Main loop
+# -------------------------
+def run_live(interval_s: float = POLL_S, once: bool = False, database: str = LIVE_DB) -> None:
+    fetcher = ConditionalFetcher(get_app_config()["CFB_API_KEY"])
+    try:
+        model = load_play_model(MODEL_PATH)
+    except Exception as e:
+        model = None
+        print(f"⚠️ No play win probability model at {MODEL_PATH} ({e}); publishing scores only")
+
+    con = duckdb.connect(database=database, read_only=False)
+    try:
+        ensure_live_schema(con)
+        seen = {play_id for (play_id,) in con.execute("SELECT id FROM cfb_live.plays_source").fetchall()}
+        games: List[tuple] = []
+        discovered_at = None
+
+        while True:
+            started = time.monotonic()
+            if discovered_at is None or started - discovered_at >= DISCOVER_S:
+                found = discover_live_games(con)
+                if found is not None:
+                    # Finished and pruned games leave game_state (and the live snapshot) right away
+                    if {g[0] for g in found} != {g[0] for g in games}:
+                        rescore(con, model, set())
+                        publish_snapshot(snapshot_dir=LIVE_SNAPSHOT_DIR, schemas=("cfb_live",), con=con)
+                    games = found
+                    seen = {play_id for (play_id,) in con.execute("SELECT id FROM cfb_live.plays_source").fetchall()}
+                    print(f"🏈 {len(games)} game(s) in progress")
+                discovered_at = started
+
+            if games:
+                requests_before, not_modified_before = fetcher.requests, fetcher.not_modified
+                affected, drives, finished = poll_cycle(con, fetcher, games, seen)
+                if finished:
+                    games = live_games(con)
+                    print(f"🏁 {len(finished)} game(s) finished, {len(games)} in progress")
+                if affected or drives or finished:
+                    scored = rescore(con, model, affected)
+                    publish_snapshot(snapshot_dir=LIVE_SNAPSHOT_DIR, schemas=("cfb_live",), con=con)
+                else:
+                    scored = 0
+                print(
+                    f"✅ {fetcher.requests - requests_before} requests "
+                    f"({fetcher.not_modified - not_modified_before} unchanged), "
+                    f"{len(affected)} game(s) with new plays, {scored:,} plays rescored "
+                    f"in {time.monotonic() - started:.2f}s"
+                )
+
+            if once:
+                break
+            time.sleep(max(0.0, interval_s - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("Stopped live mode")
+    finally:
+        con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll in-progress games and publish live win probabilities")
+    parser.add_argument("--interval", type=float, default=POLL_S, help="seconds between polls")
+    parser.add_argument("--once", action="store_true", help="run a single discovery + poll cycle")
+    parser.add_argument("--database", default=LIVE_DB)
+    args = parser.parse_args()
+    run_live(interval_s=args.interval, once=args.once, database=args.database)
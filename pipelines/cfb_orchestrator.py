@@ -0,0 +1,409 @@
+# cfb_orchestrator.py
+"""
+Single entry point for a full refresh, modelled as a DAG:
+    ingest:<source>:<season>  →  sqlmesh  →  elo, ratings, play_model  →  predict  →  simulate  →  snapshot
+- Independent nodes run in parallel on a worker pool. Every node that writes
+  the DuckDB file holds DB_LOCK (DuckDB allows one writer), so the overlap comes
+  from the API-bound ingestion extracts, which run outside the lock
+- Each node has an input hash built from its code/config plus the output hashes
+  of its upstream nodes; a node whose input hash matches its last success is skipped
+- Output hashes are content hashes of the tables a node writes, so an ingest
+  that brings back identical data doesn't trigger anything downstream
+- sqlmesh plans its own model changes; only the models reading a *_source table
+  whose content changed since the last refresh are restated (SQLMesh follows downstream)
+- Past seasons are treated as immutable; ingestion of the live seasons always runs.
+  A failed ingest is reported but, like the original pipeline, doesn't stop the rest
+- Reports per-node timings and the critical path of the run; time spent queued
+  for DB_LOCK is reported separately and left out of both
+
+Run with: python -m pipelines.cfb_orchestrator [--seasons 2024 2025] [--workers 8] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import dlt
+import duckdb
+
+from shared.app_config import get_app_config
+from shared.snapshots import SOURCE_DB, publish_snapshot
+from pipelines.sources.cfb_games import cfb_games
+from pipelines.sources.cfb_rankings import cfb_rankings
+from pipelines.sources.cfb_drives import cfb_drives
+from pipelines.sources.cfb_plays import cfb_plays
+from pipelines.sources.cfb_lines import cfb_lines
+from pipelines.sources.cfb_teams import cfb_teams
+from pipelines.sources.cfb_roster import cfb_roster
+from pipelines.sources.cfb_game_players import cfb_game_players
+
+ROOT = Path(__file__).resolve().parent.parent
+STATE_PATH = Path(os.getenv("CFB_ORCHESTRATOR_STATE", "./output_data/orchestrator_state.json"))
+WORKERS = int(os.getenv("CFB_ORCHESTRATOR_WORKERS", "8"))
+SQLMESH_COMMAND = ["sqlmesh", "plan", "--auto-apply", "--no-prompts"]
+SQLMESH_SOURCES_PATH = STATE_PATH.with_name("sqlmesh_sources.json")  # source hashes at the last refresh
+
+SOURCES = {
+    "cfb_games": cfb_games,
+    "cfb_rankings": cfb_rankings,
+    "cfb_drives": cfb_drives,
+    "cfb_plays": cfb_plays,
+    "cfb_lines": cfb_lines,
+    "cfb_teams": cfb_teams,
+    "cfb_roster": cfb_roster,
+    "cfb_game_players": cfb_game_players,
+}
+
+class WriterLock:
+    """A Lock that also tallies, per thread, how long acquiring it waited (queued behind other writers)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __enter__(self):
+        started = time.perf_counter()
+        self._lock.acquire()
+        self._local.waited = self.waited() + time.perf_counter() - started
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+    def waited(self) -> float:
+        return getattr(self._local, "waited", 0.0)
+
+    def reset(self) -> None:
+        self._local.waited = 0.0
+
+
+# One writer at a time on the DuckDB file (dlt loads, subprocess stages, hashing, snapshot)
+DB_LOCK = WriterLock()
+
+
+@dataclass
+class Node:
+    name: str
+    run: Callable[[], None]
+    deps: Tuple[str, ...] = ()
+    code: Tuple[str, ...] = ()          # files (relative to the repo) whose content feeds the input hash
+    params: Dict[str, object] = field(default_factory=dict)
+    outputs: Tuple[str, ...] = ()       # tables whose content becomes the output hash
+    always_run: bool = False
+    required: bool = True               # a failed optional node doesn't block its children
+
+
+# -------------------------
+# Hashing
+# -------------------------
+def _sha1(*parts: str) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_hash(paths: Sequence[str]) -> str:
+    files = sorted({f for p in paths for f in ((ROOT / p).rglob("*") if (ROOT / p).is_dir() else [ROOT / p])})
+    return _sha1(*(
+        f"{f.relative_to(ROOT)}:{hashlib.sha1(f.read_bytes()).hexdigest()}"
+        for f in files if f.is_file() and "__pycache__" not in f.parts
+    ))
+
+
+def table_hash(con, table: str) -> str:
+    """Order-independent content hash of a table (dlt bookkeeping columns excluded)."""
+    schema, name = table.split(".")
+    columns = [row[0] for row in con.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = ? AND table_name = ? AND column_name NOT LIKE '\\_dlt%' ESCAPE '\\'
+        ORDER BY ordinal_position
+    """, [schema, name]).fetchall()]
+    if not columns:
+        return "missing"
+    cols = ", ".join('"' + c.replace('"', '""') + '"' for c in columns)
+    rows, digest = con.execute(f"SELECT COUNT(*), BIT_XOR(HASH({cols})) FROM {table}").fetchone()
+    return f"{rows}:{digest}"
+
+
+def outputs_hash(tables: Sequence[str]) -> str:
+    with DB_LOCK:
+        con = duckdb.connect(SOURCE_DB, read_only=True)
+        try:
+            return _sha1(*(f"{t}={table_hash(con, t)}" for t in tables))
+        finally:
+            con.close()
+
+
+# -------------------------
+# Node bodies
+# -------------------------
+def ingest(source: str, season: int) -> Callable[[], None]:
+    def run():
+        pipeline = dlt.pipeline(
+            pipeline_name=f"cfb_analytics_{source}_{season}",
+            destination=dlt.destinations.duckdb(SOURCE_DB),
+            dataset_name="cfb",
+        )
+        # Extract + normalize hit the API and local files only; the load needs the writer lock
+        pipeline.extract(SOURCES[source](get_app_config()["CFB_API_KEY"], season))
+        pipeline.normalize()
+        with DB_LOCK:
+            pipeline.load()
+    return run
+
+
+def command(*args: str) -> Callable[[], None]:
+    def run():
+        # Steps (and sqlmesh, through config.yaml) read and write the database the orchestrator
+        # checks and snapshots; absolute, since they run from the repo root
+        env = {**os.environ, "CFB_DUCKDB_PATH": os.path.abspath(SOURCE_DB), "CFB_AI_PUBLISH_SNAPSHOT": "0"}
+        with DB_LOCK:
+            subprocess.run(list(args), cwd=ROOT, env=env, check=True)
+    return run
+
+
+def source_readers() -> Dict[str, List[str]]:
+    """cfb.<x>_source table -> the models that select from it directly."""
+    readers: Dict[str, List[str]] = {}
+    for path in sorted((ROOT / "models").rglob("*.sql")):
+        text = path.read_text(encoding="utf-8")
+        model = re.search(r"name\s+([\w.]+)", text).group(1)
+        for table in sorted(set(re.findall(r"\bcfb\.\w+_source\b", text))):
+            readers.setdefault(table, []).append(model)
+    return readers
+
+
+def sqlmesh_refresh() -> None:
+    """
+    `sqlmesh plan` applies model changes on its own; the FULL models over source tables whose
+    content changed since the last refresh are restated as well, so new data reaches them.
+    """
+    readers = source_readers()
+    with DB_LOCK:
+        con = duckdb.connect(SOURCE_DB, read_only=True)
+        try:
+            hashes = {table: table_hash(con, table) for table in readers}
+        finally:
+            con.close()
+    previous = load_state(SQLMESH_SOURCES_PATH)
+    restate = sorted({m for table, models in readers.items() if previous.get(table) != hashes[table] for m in models})
+
+    args = list(SQLMESH_COMMAND)
+    for model in restate:
+        args += ["--restate-model", model]
+    command(*args)()
+    save_state(hashes, SQLMESH_SOURCES_PATH)
+
+
+def snapshot() -> None:
+    with DB_LOCK:
+        publish_snapshot()
+
+
+def build_dag(seasons: Sequence[int], live_seasons: Sequence[int]) -> List[Node]:
+    ingest_nodes = [
+        Node(
+            name=f"ingest:{source}:{season}",
+            run=ingest(source, season),
+            code=(f"pipelines/sources/{source}.py",),
+            params={"season": season},
+            outputs=(f"cfb.{source}_source",),
+            always_run=season in live_seasons,
+            required=False,
+        )
+        for source in SOURCES
+        for season in seasons
+    ]
+    models = tuple(f"cfb.{p.stem}" for p in sorted((ROOT / "models").rglob("*.sql")))
+    py = sys.executable
+    return ingest_nodes + [
+        Node("sqlmesh", sqlmesh_refresh, tuple(n.name for n in ingest_nodes),
+             code=("models", "macros", "shared/rounds.py", "config.yaml"), outputs=models),
+        Node("elo", command(py, "-m", "ai.cfb_elo"), ("sqlmesh",),
+             code=("ai/cfb_elo.py", "ai/cfb_history.py", "shared/rounds.py"), outputs=("cfb.game_elo", "cfb.team_elo")),
+        Node("ratings", command(py, "-m", "ai.cfb_ratings"), ("sqlmesh",),
+             code=("ai/cfb_ratings.py", "ai/cfb_elo.py", "ai/cfb_history.py", "shared/rounds.py"), outputs=("cfb.team_adjusted_ratings",)),
+        Node("play_model", command(py, "-m", "ai.cfb_play_model"), ("sqlmesh",),
+             code=("ai/cfb_play_model.py", "ai/cfb_history.py"), outputs=("cfb.play_win_prob",)),
+        # Training, prediction and edges are written by cfb_ai as one versioned run
+        Node("predict", command(py, "-m", "ai.cfb_ai"), ("sqlmesh", "elo", "ratings"),
+             code=("ai/cfb_ai.py", "ai/cfb_edges.py", "ai/cfb_explain.py", "ai/cfb_history.py", "ai/cfb_memory.py",
+                   "ai/cfb_profile.py", "ai/cfb_ratings.py", "ai/cfb_elo.py", "shared/rounds.py", "shared/snapshots.py"),
+             outputs=("cfb.cfb_predictions", "cfb.ai_best_bets", "cfb.ai_attributions")),
+        Node("simulate", command(py, "-m", "ai.cfb_simulate"), ("predict",),
+             code=("ai/cfb_simulate.py",), outputs=("cfb.sim_team_odds", "cfb.sim_win_distribution")),
+        Node("snapshot", snapshot, ("predict", "simulate", "play_model"),
+             code=("shared/snapshots.py", "shared/matchups.py")),
+    ]
+
+
+# -------------------------
+# Runner
+# -------------------------
+def load_state(path: Path = STATE_PATH) -> Dict[str, dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, dict], path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def run_dag(nodes: List[Node], workers: int = WORKERS, force: bool = False, state_path: Path = STATE_PATH) -> Dict[str, dict]:
+    """Run `nodes` in dependency order. Returns {node: {status, wall_s, output_hash, ...}}."""
+    by_name = {n.name: n for n in nodes}
+    children: Dict[str, List[str]] = {n.name: [] for n in nodes}
+    waiting = {n.name: set(n.deps) for n in nodes}
+    for n in nodes:
+        for dep in n.deps:
+            children[dep].append(n.name)
+
+    state = load_state(state_path)
+    state_lock = threading.Lock()
+    results: Dict[str, dict] = {}
+
+    def execute(node: Node) -> dict:
+        input_hash = _sha1(
+            node.name,
+            code_hash(node.code),
+            json.dumps(node.params, sort_keys=True),
+            *(results[d]["output_hash"] for d in node.deps),
+        )
+        previous = state.get(node.name, {})
+        if not force and not node.always_run and previous.get("input_hash") == input_hash:
+            return {"status": "skipped", "wall_s": 0.0, "output_hash": previous["output_hash"]}
+
+        # Time queued for DB_LOCK (this worker thread only) is not node work
+        DB_LOCK.reset()
+        started = time.perf_counter()
+        node.run()
+        output_hash = outputs_hash(node.outputs) if node.outputs else input_hash
+        lock_wait = DB_LOCK.waited()
+        wall = time.perf_counter() - started - lock_wait
+        with state_lock:
+            state[node.name] = {
+                "input_hash": input_hash,
+                "output_hash": output_hash,
+                "succeeded_at": datetime.now().isoformat(timespec="seconds"),
+                "wall_s": wall,
+                "lock_wait_s": lock_wait,
+            }
+            save_state(state, state_path)
+        return {"status": "ran", "wall_s": wall, "lock_wait_s": lock_wait, "output_hash": output_hash}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        def submit_ready(names):
+            for name in names:
+                if waiting[name]:
+                    continue
+                failed = [
+                    d for d in by_name[name].deps
+                    if results[d]["status"] == "blocked" or (results[d]["status"] == "failed" and by_name[d].required)
+                ]
+                if failed:
+                    results[name] = {"status": "blocked", "wall_s": 0.0, "output_hash": None, "error": f"upstream {failed[0]}"}
+                    print(f"⏭️ {name} blocked by {failed[0]}")
+                    release(name)
+                else:
+                    running[pool.submit(execute, by_name[name])] = name
+
+        def release(name):
+            for child in children[name]:
+                waiting[child].discard(name)
+            submit_ready(children[name])
+
+        submit_ready(list(by_name))
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                    result = results[name]
+                    icon = "✅" if result["status"] == "ran" else "⏩"
+                    waited = f", {result['lock_wait_s']:.1f}s waiting for DB_LOCK" if result.get("lock_wait_s") else ""
+                    print(f"{icon} {name} {result['status']} ({result['wall_s']:.1f}s{waited})")
+                except Exception as e:
+                    # Children of an optional node carry on with its last good output
+                    last_output = load_state(state_path).get(name, {}).get("output_hash", "failed")
+                    results[name] = {"status": "failed", "wall_s": 0.0, "output_hash": last_output, "error": str(e)}
+                    print(f"❌ {name} failed: {e}")
+                release(name)
+
+    return results
+
+
+def critical_path(nodes: List[Node], results: Dict[str, dict]) -> Tuple[List[str], float]:
+    """Longest chain of dependent node work in this run (DB_LOCK waits excluded, skipped nodes count as zero)."""
+    finish: Dict[str, float] = {}
+    via: Dict[str, Optional[str]] = {}
+    for node in nodes:  # build_dag lists nodes after their dependencies
+        prev = max(node.deps, key=lambda d: finish[d], default=None)
+        finish[node.name] = results[node.name]["wall_s"] + (finish[prev] if prev else 0.0)
+        via[node.name] = prev
+    end = max(finish, key=finish.get)
+    path = [end]
+    while via[path[-1]]:
+        path.append(via[path[-1]])
+    return path[::-1], finish[end]
+
+
+def report(nodes: List[Node], results: Dict[str, dict], elapsed: float) -> None:
+    counts = {}
+    for result in results.values():
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    print("\n🧭 Orchestrator summary: " + ", ".join(f"{v} {k}" for k, v in sorted(counts.items())))
+    for name, result in sorted(results.items(), key=lambda kv: -kv[1]["wall_s"])[:10]:
+        if result["wall_s"]:
+            print(f"   {name:<32} {result['wall_s']:8.1f}s  (+{result.get('lock_wait_s', 0.0):.1f}s lock wait)")
+    lock_wait = sum(result.get("lock_wait_s", 0.0) for result in results.values())
+    print(f"   total time queued for DB_LOCK: {lock_wait:.1f}s")
+
+    path, length = critical_path(nodes, results)
+    print(f"\n🛤️ Critical path ({length:.1f}s of {elapsed:.1f}s wall):")
+    for name in path:
+        print(f"   {name:<32} {results[name]['wall_s']:8.1f}s  [{results[name]['status']}]")
+
+
+def run_orchestrator(seasons: Sequence[int], live_seasons: Optional[Sequence[int]] = None,
+                     workers: int = WORKERS, force: bool = False) -> Dict[str, dict]:
+    live_seasons = [max(seasons)] if live_seasons is None else live_seasons
+    nodes = build_dag(seasons, live_seasons)
+    started = time.perf_counter()
+    results = run_dag(nodes, workers=workers, force=force)
+    report(nodes, results, time.perf_counter() - started)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the cfb refresh DAG")
+    parser.add_argument("--seasons", type=int, nargs="+", default=[2025])
+    parser.add_argument("--live-seasons", type=int, nargs="*", default=None,
+                        help="Seasons whose ingestion always runs (default: the latest)")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--force", action="store_true", help="Ignore input hashes and run every node")
+    args = parser.parse_args()
+
+    results = run_orchestrator(args.seasons, args.live_seasons, args.workers, args.force)
+    if any(r["status"] in ("failed", "blocked") for r in results.values()):
+        sys.exit(1)
@@ -1,6 +1,10 @@
 import os
 import json
-from typing import Any, Dict
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -9,11 +13,21 @@ try:
 except ImportError:
     secretmanager = None  # Safe fallback if not using GCP yet
 
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None  # Encrypted local secret cache is disabled without cryptography
+
 
 # --- Environment Setup ---
 ENVIRONMENT = os.getenv("ENVIRONMENT", "dev")
 PROJECT_ID = os.getenv("GCP_PROJECT_ID", "analytics-project")
 
+# --- Secret caching ---
+SECRET_TTL_S = float(os.getenv("APP_CONFIG_SECRET_TTL_S", "300"))
+SECRET_CACHE_FILE = Path.home() / ".cache" / "cfb_analytics" / "secrets.enc"
+SECRET_FETCH_WORKERS = 8
+
 # --- Default values ---
 APP_CONFIG_DEFAULT: Dict[str, Any] = {
     "CFB_API_KEY": "",
@@ -34,37 +48,210 @@ SECRETS_MAP = {
 }
 
 
-# --- Load local environment variables ---
-if ENVIRONMENT != "production":
-    load_dotenv()
+# --- Load local environment variables (once, on first config use rather than at import) ---
+_env_loaded = False
 
 
-# --- Helper to fetch a secret or fallback to env/default ---
-def get_secret(config_key: str, project_id: str = PROJECT_ID, default_value: Any = None) -> Any:
-    """
-    Retrieves a configuration value from GCP Secret Manager (in prod)
-    or from environment variables (in dev/staging).
-    """
-    secret_value = None
+def load_local_env() -> None:
+    global _env_loaded
+    if not _env_loaded and ENVIRONMENT != "production":
+        load_dotenv()
+    _env_loaded = True
+
+
+# --- Secret sources ---
+_secret_client = None
+_secret_client_lock = threading.Lock()
+
+
+def secret_manager_client():
+    """One Secret Manager client per process; requests name their project, so every project shares it."""
+    global _secret_client
+    with _secret_client_lock:
+        if _secret_client is None:
+            _secret_client = secretmanager.SecretManagerServiceClient()
+        return _secret_client
+
+
+class GcpSecretSource:
+    """Secret Manager through the shared client; several secrets are fetched concurrently."""
+
+    def __init__(self, project_id: str = PROJECT_ID, workers: int = SECRET_FETCH_WORKERS):
+        self.project_id = project_id
+        self.workers = workers
 
-    if ENVIRONMENT == "production" and secretmanager and config_key in SECRETS_MAP:
+    @property
+    def client(self):
+        return secret_manager_client()
+
+    def _access(self, secret_id: str) -> Optional[str]:
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/latest"
         try:
-            client = secretmanager.SecretManagerServiceClient()
-            secret_id = SECRETS_MAP[config_key]
-            name = f"projects/{project_id}/secrets/{secret_id}/versions/latest"
-            response = client.access_secret_version(request={"name": name})
-            secret_value = response.payload.data.decode("UTF-8")
+            response = self.client.access_secret_version(request={"name": name})
+            return response.payload.data.decode("UTF-8")
         except Exception as e:
-            print(f"[WARN] Failed to retrieve secret {config_key} from GCP: {e}")
-            secret_value = os.getenv(config_key, default_value)
-    else:
-        secret_value = os.getenv(config_key, default_value)
+            print(f"[WARN] Failed to retrieve secret {secret_id} from GCP: {e}")
+            return None
+
+    def fetch(self, secret_ids: Iterable[str]) -> Dict[str, str]:
+        """Values for `secret_ids`; secrets that could not be read are left out."""
+        ids = list(dict.fromkeys(secret_ids))
+        if len(ids) <= 1:
+            values = [self._access(secret_id) for secret_id in ids]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(ids))) as pool:
+                values = list(pool.map(self._access, ids))
+        return {secret_id: value for secret_id, value in zip(ids, values) if value is not None}
+
+
+class LocalSecretSource:
+    """In-memory stand-in for Secret Manager (tests, offline runs). Records every fetch."""
+
+    def __init__(self, secrets: Optional[Dict[str, str]] = None):
+        self.secrets = dict(secrets or {})
+        self.calls: List[List[str]] = []
+
+    def fetch(self, secret_ids: Iterable[str]) -> Dict[str, str]:
+        ids = list(secret_ids)
+        self.calls.append(ids)
+        return {secret_id: self.secrets[secret_id] for secret_id in ids if secret_id in self.secrets}
+
+
+class EncryptedSecretCache:
+    """Fernet-encrypted {secret_id: [value, expires_at]} file so restarts can skip Secret Manager."""
+
+    def __init__(self, path: Path, key: str):
+        self.path = Path(path)
+        self._fernet = Fernet(key.encode("utf-8"))
+
+    def load(self) -> Dict[str, tuple]:
+        try:
+            payload = json.loads(self._fernet.decrypt(self.path.read_bytes()))
+        except (OSError, InvalidToken, ValueError):
+            return {}
+        now = time.time()
+        return {secret_id: (value, expires) for secret_id, (value, expires) in payload.items() if expires > now}
+
+    def save(self, entries: Dict[str, tuple]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_bytes(self._fernet.encrypt(json.dumps(entries).encode("utf-8")))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, self.path)
+
+
+def default_secret_source():
+    """Secret Manager in production (when the client library is installed), else env only."""
+    if ENVIRONMENT == "production" and secretmanager is not None:
+        return GcpSecretSource(PROJECT_ID)
+    return None
 
-    # Post-process complex values
-    if config_key == "GCP_SERVICE_ACCOUNT":
-        secret_value = handle_gcp_service_account(secret_value)
 
-    return secret_value
+def default_secret_cache() -> Optional[EncryptedSecretCache]:
+    """Encrypted cache file, enabled by setting APP_CONFIG_CACHE_KEY to a Fernet key."""
+    key = os.getenv("APP_CONFIG_CACHE_KEY", "")
+    if not key or Fernet is None:
+        return None
+    return EncryptedSecretCache(Path(os.getenv("APP_CONFIG_CACHE_FILE", str(SECRET_CACHE_FILE))).expanduser(), key)
+
+
+# --- Lazily resolved config ---
+class AppConfig(Mapping):
+    """
+    Read-only mapping over APP_CONFIG_DEFAULT keys. Nothing is resolved until a key is read.
+    Secret-backed keys come from `secret_source` (cached in-process for `ttl_s`, and in the
+    encrypted cache file when configured); everything else, and any secret that can't be
+    fetched, falls back to environment variables, then defaults.
+    """
+
+    def __init__(
+        self,
+        defaults: Dict[str, Any] = APP_CONFIG_DEFAULT,
+        secrets_map: Dict[str, str] = SECRETS_MAP,
+        secret_source=None,
+        ttl_s: float = SECRET_TTL_S,
+        cache: Optional[EncryptedSecretCache] = None,
+    ):
+        self.defaults = dict(defaults)
+        self.secrets_map = dict(secrets_map)
+        self.secret_source = secret_source
+        self.ttl_s = ttl_s
+        self.cache = cache
+        self._secrets: Dict[str, tuple] = {}  # secret_id -> (value or None, expires_at)
+        self._cache_loaded = False
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.defaults:
+            raise KeyError(key)
+        return self.get_value(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.defaults)
+
+    def __len__(self) -> int:
+        return len(self.defaults)
+
+    def get_value(self, key: str, default_value: Any = None) -> Any:
+        value = None
+        if self.secret_source is not None and key in self.secrets_map:
+            value = self._cached_secret(self.secrets_map[key])
+            if value is None:
+                self.prefetch([key])
+                value = self._cached_secret(self.secrets_map[key])
+        if value is None:
+            # An explicit caller default wins over APP_CONFIG_DEFAULT
+            fallback = self.defaults.get(key) if default_value is None else default_value
+            value = os.getenv(key, fallback)
+
+        # Post-process complex values
+        if key == "GCP_SERVICE_ACCOUNT":
+            value = handle_gcp_service_account(value)
+        return value
+
+    def _cached_secret(self, secret_id: str) -> Optional[str]:
+        value, expires = self._secrets.get(secret_id, (None, 0))
+        return value if expires > time.time() else None
+
+    def prefetch(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Fetch every expired or missing secret-backed key (default: all) in one batched call."""
+        if self.secret_source is None:
+            return
+        keys = list(self.secrets_map) if keys is None else [k for k in keys if k in self.secrets_map]
+        with self._lock:
+            if self.cache is not None and not self._cache_loaded:
+                self._secrets.update(self.cache.load())
+                self._cache_loaded = True
+
+            now = time.time()
+            missing = [
+                self.secrets_map[k] for k in keys
+                if self._secrets.get(self.secrets_map[k], (None, 0))[1] <= now
+            ]
+            if not missing:
+                return
+
+            fetched = self.secret_source.fetch(missing)
+            expires = time.time() + self.ttl_s
+            # Misses are remembered too, so a failing secret isn't re-requested on every read
+            for secret_id in missing:
+                self._secrets[secret_id] = (fetched.get(secret_id), expires)
+            if fetched and self.cache is not None:
+                self.cache.save({
+                    secret_id: [value, exp] for secret_id, (value, exp) in self._secrets.items()
+                    if value is not None
+                })
+
+    def prefetch_async(self, keys: Optional[Iterable[str]] = None) -> threading.Thread:
+        """Warm secrets on a background thread so startup never waits on Secret Manager."""
+        thread = threading.Thread(target=self.prefetch, args=(keys,), daemon=True)
+        thread.start()
+        return thread
+
+    def invalidate(self) -> None:
+        """Drop in-process secret values (e.g. after a rotation)."""
+        with self._lock:
+            self._secrets.clear()
 
 
 def handle_gcp_service_account(value: Any) -> Dict[str, Any]:
@@ -87,10 +274,42 @@ def handle_gcp_service_account(value: Any) -> Dict[str, Any]:
         return {}
 
 
-# --- Load all config values into a single dict (optional convenience) ---
-def get_app_config() -> Dict[str, Any]:
-    """Builds the final config dictionary with secrets and defaults resolved."""
-    config = {}
-    for key, default in APP_CONFIG_DEFAULT.items():
-        config[key] = get_secret(key, PROJECT_ID, default)
-    return config
+# --- Shared config instance ---
+_app_config: Optional[AppConfig] = None
+_project_configs: Dict[str, AppConfig] = {}  # project_id -> config for non-default projects
+_app_config_lock = threading.Lock()
+
+
+def get_app_config() -> AppConfig:
+    """
+    The process-wide AppConfig. Creating it doesn't wait on the network: with Secret Manager,
+    the secrets are warmed on a background thread, and a read before that finishes waits for it.
+    """
+    global _app_config
+    with _app_config_lock:
+        if _app_config is None:
+            load_local_env()
+            _app_config = AppConfig(secret_source=default_secret_source(), cache=default_secret_cache())
+            if _app_config.secret_source is not None:
+                _app_config.prefetch_async()
+        return _app_config
+
+
+# --- Helper to fetch a single value (kept for existing callers) ---
+def get_secret(config_key: str, project_id: str = PROJECT_ID, default_value: Any = None) -> Any:
+    """
+    Retrieves a configuration value from GCP Secret Manager (in prod)
+    or from environment variables (in dev/staging), via the shared config.
+    """
+    config = get_app_config()
+    if project_id != PROJECT_ID and isinstance(config.secret_source, GcpSecretSource):
+        config = _project_config(project_id)
+    return config.get_value(config_key, default_value)
+
+
+def _project_config(project_id: str) -> AppConfig:
+    """One AppConfig per non-default project, reused across calls (all share one Secret Manager client)."""
+    with _app_config_lock:
+        if project_id not in _project_configs:
+            _project_configs[project_id] = AppConfig(secret_source=GcpSecretSource(project_id))
+        return _project_configs[project_id]
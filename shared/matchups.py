@@ -0,0 +1,104 @@
+from typing import Tuple
+
+# Pre-joined, one row per game: everything the weekly matchup page shows, so the
+# page itself is a single filtered scan. Built inside each published snapshot.
+MATCHUPS_TABLE = "cfb.weekly_matchups"
+MATCHUP_SOURCES: Tuple[str, ...] = (
+    "cfb.cfb_games",
+    "cfb.cfb_teams",
+    "cfb.cfb_rankings",
+    "cfb.cfb_predictions",
+    "cfb.ai_best_bets",
+)
+RANKING_POLL = "AP Top 25"
+
+# Rows are stored in (season, season_type, week) order so DuckDB's zone maps skip
+# every other week when the page filters on them.
+MATCHUPS_SQL = f"""
+CREATE OR REPLACE TABLE {MATCHUPS_TABLE} AS
+WITH teams AS (
+    SELECT team_id, season, ANY_VALUE(team_name) AS team_name, ANY_VALUE(conference) AS conference
+    FROM cfb.cfb_teams
+    GROUP BY team_id, season
+), polls AS (
+    SELECT season, season_type, week, team_id, MIN(team_rank) AS team_rank
+    FROM cfb.cfb_rankings
+    WHERE poll = '{RANKING_POLL}'
+    GROUP BY season, season_type, week, team_id
+), bets AS (
+    SELECT *
+    FROM cfb.ai_best_bets
+    WHERE line_provider = 'consensus'
+), games AS (
+    SELECT *, TRY_CAST(start_date AS TIMESTAMP) AS kickoff_ts
+    FROM cfb.cfb_games
+)
+SELECT
+    g.game_id,
+    g.season,
+    g.season_type,
+    g.week,
+    g.kickoff_ts AS start_date,
+    STRFTIME(g.kickoff_ts, '%a %b %-d, %-I:%M %p') AS kickoff,
+    COALESCE(g.game_completed, FALSE) AS completed,
+    g.home_id,
+    g.away_id,
+    ht.team_name AS home_team,
+    vt.team_name AS away_team,
+    ht.conference AS home_conference,
+    vt.conference AS away_conference,
+    hr.team_rank AS home_rank,
+    ar.team_rank AS away_rank,
+    hr.team_rank IS NOT NULL OR ar.team_rank IS NOT NULL AS is_ranked,
+    CONCAT_WS(' ', '#' || CAST(hr.team_rank AS VARCHAR), ht.team_name)
+        || ' vs. ' || CONCAT_WS(' ', '#' || CAST(ar.team_rank AS VARCHAR), vt.team_name) AS matchup,
+    CASE
+        WHEN cp.home_win_prob >= 0.5 THEN ht.team_name
+        WHEN cp.home_win_prob < 0.5 THEN vt.team_name
+    END AS predicted_winner,
+    ROUND(GREATEST(cp.home_win_prob, 1 - cp.home_win_prob) * 100, 0) AS win_pred_prob,
+    cp.home_win_prob,
+    ROUND(cp.point_spread_pred, 1) AS point_spread_pred,
+    ROUND(cp.total_points_pred, 1) AS total_points_pred,
+    bb.vegas_spread,
+    ROUND(bb.spread_edge, 1) AS spread_edge,
+    bb.ai_recommendation,
+    bb.vegas_total,
+    ROUND(bb.total_edge, 1) AS total_edge,
+    bb.ai_total_recommendation,
+    g.home_points,
+    g.away_points,
+    -- Same sign as point_spread_pred and the lines: negative = home won / favored
+    g.away_points - g.home_points AS point_spread_actual,
+    CASE
+        WHEN NOT g.game_completed OR cp.home_win_prob IS NULL OR g.home_points = g.away_points THEN NULL
+        ELSE (g.home_points > g.away_points) = (cp.home_win_prob >= 0.5)
+    END AS win_pred_correct
+FROM games g
+LEFT JOIN teams ht ON ht.team_id = g.home_id AND ht.season = g.season
+LEFT JOIN teams vt ON vt.team_id = g.away_id AND vt.season = g.season
+LEFT JOIN polls hr
+    ON hr.team_id = g.home_id AND hr.season = g.season AND hr.season_type = g.season_type AND hr.week = g.week
+LEFT JOIN polls ar
+    ON ar.team_id = g.away_id AND ar.season = g.season AND ar.season_type = g.season_type AND ar.week = g.week
+LEFT JOIN cfb.cfb_predictions cp
+    ON cp.season = g.season AND cp.week = g.week AND cp.home_id = g.home_id AND cp.away_id = g.away_id
+LEFT JOIN bets bb
+    ON bb.season = g.season AND bb.week = g.week AND bb.home_id = g.home_id AND bb.away_id = g.away_id
+ORDER BY g.season, g.season_type, g.week, g.kickoff_ts, g.game_id
+"""
+
+
+def build_matchup_table(con) -> bool:
+    """(Re)build cfb.weekly_matchups on `con`; False when a source table is missing."""
+    existing = {
+        f"{schema}.{name}" for schema, name in con.execute(
+            "SELECT table_schema, table_name FROM information_schema.tables WHERE table_catalog = current_database()"
+        ).fetchall()
+    }
+    missing = [t for t in MATCHUP_SOURCES if t not in existing]
+    if missing:
+        print(f"⚠️ Skipping {MATCHUPS_TABLE}; missing {', '.join(missing)}")
+        return False
+    con.execute(MATCHUPS_SQL)
+    return True
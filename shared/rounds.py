@@ -0,0 +1,8 @@
+# Rating order of games: postseason rounds sort after every regular-season week of
+# the same season. Shared by ai.cfb_elo / ai.cfb_ratings (ROUND_KEY_SQL) and the
+# SQLMesh feature models (@round_key macro), so their orderings can't drift apart.
+
+
+def round_key_sql(season: str = "season", season_type: str = "season_type", week: str = "week") -> str:
+    """SQL expression for the round key over the given season, season_type and week columns."""
+    return f"{season} * 1000 + CASE WHEN {season_type} = 'postseason' THEN 100 ELSE 0 END + {week}"
@@ -0,0 +1,172 @@
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import duckdb
+
+from shared.matchups import build_matchup_table
+
+# --- Snapshot layout ---
+# snapshots/cfb_<version>.duckdb   immutable, read-optimized copies of the serving tables
+# snapshots/CURRENT                name of the latest published snapshot (swapped atomically)
+SOURCE_DB = os.getenv("CFB_DUCKDB_PATH", "cfb_analytics.duckdb")
+SNAPSHOT_DIR = Path(os.getenv("CFB_SNAPSHOT_DIR", "./snapshots"))
+SNAPSHOT_KEEP = int(os.getenv("CFB_SNAPSHOT_KEEP", "3"))
+SERVING_SCHEMAS = tuple(s.strip() for s in os.getenv("CFB_SERVING_SCHEMAS", "cfb").split(",") if s.strip())
+CURRENT_POINTER = "CURRENT"
+
+# CREATE TABLE AS doesn't carry indexes over; these are rebuilt in every snapshot
+# (single column: DuckDB only scans through single-column ART indexes)
+SNAPSHOT_INDEXES = {
+    "cfb.ai_attributions": ("game_id",),
+}
+
+# Tables in the serving schemas that are never copied (LIKE patterns on table_name):
+# dlt bookkeeping, raw *_source landing tables, append-only run history and play-level data
+SNAPSHOT_EXCLUDE = (
+    "\\_dlt%",
+    "%\\_source",
+    "%\\_history",
+    "cfb\\_plays",
+    "plays",
+    "play\\_win\\_prob",
+)
+
+_SNAPSHOT_NAME = re.compile(r"^cfb_\d{8}T\d{6}_\d{6}\.duckdb$")
+
+
+def latest_snapshot_path(snapshot_dir: Path = SNAPSHOT_DIR) -> Optional[Path]:
+    """Path of the current snapshot, or None if nothing has been published."""
+    pointer = snapshot_dir / CURRENT_POINTER
+    if not pointer.is_file():
+        return None
+    path = snapshot_dir / pointer.read_text(encoding="utf-8").strip()
+    return path if path.is_file() else None
+
+
+def connect_snapshot(snapshot_dir: Path = SNAPSHOT_DIR):
+    """Read-only connection to the latest snapshot (falls back to the live database)."""
+    path = latest_snapshot_path(snapshot_dir) or Path(SOURCE_DB)
+    return duckdb.connect(str(path), read_only=True)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _prune(snapshot_dir: Path, keep: int, current: str) -> None:
+    """Delete older snapshots beyond `keep`; files still open by readers are left for next time."""
+    snapshots = sorted(p for p in snapshot_dir.iterdir() if _SNAPSHOT_NAME.match(p.name))
+    for old in snapshots[:-keep] if keep > 0 else []:
+        if old.name == current:
+            continue
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def _build_snapshot(con, source: str, tmp_path: Path, schemas: List[str]) -> List[tuple]:
+    """Copy the serving tables of `source` into a new DuckDB file at `tmp_path`; returns the copied tables."""
+    previous = con.execute("SELECT current_database()").fetchone()[0]
+    con.execute(f"ATTACH {_literal(str(tmp_path))} AS snap")
+    try:
+        objects = con.execute("""
+            SELECT table_schema, table_name
+            FROM information_schema.tables
+            WHERE table_catalog = ?
+              AND table_schema IN (SELECT UNNEST(?))
+              AND NOT EXISTS (
+                  SELECT 1 FROM (SELECT UNNEST(?) AS pattern)
+                  WHERE table_name LIKE pattern ESCAPE '\\'
+              )
+            ORDER BY table_schema, table_name
+        """, [source, schemas, list(SNAPSHOT_EXCLUDE)]).fetchall()
+
+        for schema in sorted({schema for schema, _ in objects}):
+            con.execute(f"CREATE SCHEMA IF NOT EXISTS snap.{_quote(schema)}")
+        for schema, name in objects:
+            target = f"{_quote(schema)}.{_quote(name)}"
+            con.execute(f"CREATE TABLE snap.{target} AS SELECT * FROM {_quote(source)}.{target}")
+            columns = SNAPSHOT_INDEXES.get(f"{schema}.{name}")
+            if columns:
+                con.execute(
+                    f"CREATE INDEX {_quote(name + '_idx')} ON snap.{target} ({', '.join(map(_quote, columns))})"
+                )
+
+        if "cfb" in schemas:
+            con.execute("USE snap")
+            try:
+                build_matchup_table(con)
+            finally:
+                con.execute(f"USE {_quote(previous)}")
+        con.execute("CHECKPOINT snap")
+    finally:
+        con.execute("DETACH snap")
+    return objects
+
+
+def publish_snapshot(
+    source_db: str = SOURCE_DB,
+    snapshot_dir: Path = SNAPSHOT_DIR,
+    schemas: Iterable[str] = SERVING_SCHEMAS,
+    keep: int = SNAPSHOT_KEEP,
+    con=None,
+) -> Path:
+    """
+    Copy the serving tables/views (views are materialized; SNAPSHOT_EXCLUDE is skipped)
+    from `source_db` into a new versioned DuckDB file, add the pre-joined read models
+    (cfb.weekly_matchups), then point CURRENT at it. Readers keep whatever snapshot
+    they opened; new readers pick up the new version.
+
+    Pass `con` to copy from a connection that already holds the source file open
+    for writing (DuckDB won't attach it a second time in the same process).
+    """
+    schemas = list(schemas)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%dT%H%M%S_%f")
+    final_path = snapshot_dir / f"cfb_{version}.duckdb"
+    tmp_path = snapshot_dir / f".cfb_{version}.duckdb.tmp"
+
+    own_connection = con is None
+    if own_connection:
+        con = duckdb.connect()
+    try:
+        if own_connection:
+            con.execute(f"ATTACH {_literal(source_db)} AS src (READ_ONLY)")
+            source = "src"
+        else:
+            source = con.execute("SELECT current_database()").fetchone()[0]
+        objects = _build_snapshot(con, source, tmp_path, schemas)
+    except Exception:
+        # A failed build never becomes a snapshot, and _prune only knows finished ones
+        for leftover in (tmp_path, tmp_path.with_name(tmp_path.name + ".wal")):
+            leftover.unlink(missing_ok=True)
+        raise
+    finally:
+        if own_connection:
+            con.close()
+
+    os.replace(tmp_path, final_path)
+    _atomic_write(snapshot_dir / CURRENT_POINTER, final_path.name)
+    _prune(snapshot_dir, keep, final_path.name)
+
+    print(f"📦 Published snapshot {final_path} ({len(objects)} tables)")
+    return final_path
+
+
+if __name__ == "__main__":
+    publish_snapshot(source_db=sys.argv[1] if len(sys.argv) > 1 else SOURCE_DB)
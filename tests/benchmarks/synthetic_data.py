@@ -0,0 +1,515 @@
+# synthetic_data.py
+"""
+Synthetic cfb_*_source tables for benchmarks and local experiments:
+- Writes the raw dlt source tables (games, lines, rankings, drives, plays,
+  teams, roster, game players) into a scratch DuckDB, generated entirely in SQL
+- Deterministic per seed (hash-based noise, no RNG state), so every scale is
+  reproducible; team strength drives lines and polls, and the offense's edge over
+  the defense drives yards per play (and so PPA); drive results come from the yards
+  gained and final scores from the drives
+- Scale: 1-100 seasons; plays ≈ seasons × games/season × drives_per_game × 6.6
+  (100 seasons at the defaults is ~15M plays)
+- build_models() materializes the SQLMesh models straight from models/*.sql so
+  cfb_ai can run against the scratch file without a SQLMesh project
+
+Run with: python tests/benchmarks/synthetic_data.py scratch.duckdb --seasons 10
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))  # shared/ when run as a script
+
+from shared.rounds import round_key_sql  # noqa: E402
+
+MODELS_DIR = ROOT / "models"
+# @round_key(...) (macros/round_key.py) expanded here, since models are built without SQLMesh
+ROUND_KEY_MACRO = re.compile(r"@round_key\(([^()]*)\)")
+CONFERENCES = ["ACC", "Big Ten", "Big 12", "SEC", "Pac-12", "American", "Mountain West", "Sun Belt", "MAC", "Conference USA"]
+PROVIDERS = ["Bovada", "DraftKings", "ESPN Bet"]
+PLAY_TYPES = ["Rush", "Pass Reception", "Pass Incompletion", "Rush", "Pass Reception", "Sack", "Penalty"]
+
+# Yards per snap: the mean at an even matchup, plus this much per point of offensive edge
+# (strength gap + home field); drives that stall within FG_RANGE_YARDS of the goal kick a field goal
+PLAY_YARDS_MEAN = 6.5
+PLAY_YARDS_PER_EDGE = 0.07
+FG_RANGE_YARDS = 18
+
+# (category, type, athletes per team, mean, sd, kind) — kind 'ratio' renders as "made/attempted"
+BOX_STATS = [
+    ("passing", "C/ATT", 1, 20, 5, "ratio"),
+    ("passing", "YDS", 1, 240, 70, "count"),
+    ("passing", "TD", 1, 2, 1, "count"),
+    ("passing", "INT", 1, 0.8, 0.8, "count"),
+    ("rushing", "CAR", 3, 12, 5, "count"),
+    ("rushing", "YDS", 3, 55, 30, "count"),
+    ("rushing", "TD", 3, 0.4, 0.6, "count"),
+    ("receiving", "REC", 4, 4, 2, "count"),
+    ("receiving", "YDS", 4, 55, 30, "count"),
+    ("receiving", "TD", 4, 0.4, 0.6, "count"),
+    ("fumbles", "LOST", 1, 0.4, 0.6, "count"),
+    ("defensive", "TOT", 5, 5, 2.5, "count"),
+    ("defensive", "SACKS", 5, 0.4, 0.6, "count"),
+    ("defensive", "TFL", 5, 0.8, 0.8, "count"),
+    ("defensive", "PD", 5, 0.5, 0.6, "count"),
+    ("defensive", "QB HUR", 5, 0.4, 0.6, "count"),
+    ("interceptions", "INT", 1, 0.5, 0.6, "count"),
+    ("kicking", "FG", 1, 1.5, 1, "ratio"),
+    ("kicking", "XP", 1, 3, 1.5, "ratio"),
+    ("punting", "NO", 1, 4.5, 1.5, "count"),
+    ("kickReturns", "YDS", 1, 45, 25, "count"),
+    ("puntReturns", "YDS", 1, 12, 10, "count"),
+]
+
+
+def _sql_list(values) -> str:
+    return "[" + ", ".join("'" + str(v).replace("'", "''") + "'" for v in values) + "]"
+
+
+def _macros(con, seed: int) -> None:
+    con.execute(f"""
+        CREATE OR REPLACE TEMP MACRO unif(a, b, c) AS
+            ((HASH(a, b, c, {int(seed)}) % 1000003) + 0.5) / 1000004.0;
+        CREATE OR REPLACE TEMP MACRO gauss(a, b, c) AS
+            SQRT(-2 * LN(unif(a, b, c))) * COS(2 * PI() * unif(a, b, c + 7919));
+        CREATE OR REPLACE TEMP MACRO strength(team, season) AS
+            8 * gauss(team, 0, 11) + 4 * gauss(team, season, 12);
+        CREATE OR REPLACE TEMP MACRO conference(team) AS
+            {_sql_list(CONFERENCES)}[((team - 1) % {len(CONFERENCES)}) + 1];
+        CREATE OR REPLACE TEMP MACRO kickoff(season, week, slot) AS
+            MAKE_TIMESTAMP(season, 8, 30, 12, 0, 0) + TO_DAYS(CAST((week - 1) * 7 AS INTEGER))
+                + TO_HOURS(CAST((slot % 4) * 3 AS BIGINT));
+    """)
+
+
+def generate(
+    db_path: str,
+    seasons: int = 1,
+    last_season: int = 2025,
+    teams: int = 136,
+    weeks: int = 14,
+    drives_per_game: int = 24,
+    current_week: int = 9,
+    seed: int = 42,
+) -> Dict[str, int]:
+    """
+    (Re)create every cfb_*_source table in `db_path`. The last season is complete
+    through `current_week`; later weeks are scheduled with no score, like a live season.
+    Returns row counts per table.
+    """
+    if not 1 <= seasons <= 100:
+        raise ValueError("seasons must be between 1 and 100")
+    teams -= teams % 2  # every team plays every week
+    first_season = last_season - seasons + 1
+
+    con = duckdb.connect(db_path)
+    try:
+        con.execute("CREATE SCHEMA IF NOT EXISTS cfb")
+        _macros(con, seed)
+        season_range = f"range({first_season}, {last_season + 1}) AS s(season)"
+        team_range = f"range(1, {teams + 1}) AS tt(team)"
+
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_teams_source AS
+        SELECT
+            team AS id,
+            'Team ' || team AS school,
+            'Mascots ' || team AS mascot,
+            'T' || team AS abbreviation,
+            conference(team) AS conference,
+            'fbs' AS classification,
+            'fbs' AS division,
+            PRINTF('#%06x', HASH(team) % 16777216) AS color,
+            PRINTF('#%06x', HASH(team, 1) % 16777216) AS alternate_color,
+            '@team' || team AS twitter,
+            season,
+            season AS year,
+            team AS location_id,
+            'Stadium ' || team AS stadium_name,
+            'City ' || team AS city,
+            'ST' AS state,
+            LPAD(CAST(10000 + team AS VARCHAR), 5, '0') AS zip,
+            'US' AS country_code,
+            'America/Chicago' AS timezone,
+            25 + 20 * unif(team, 0, 1) AS latitude,
+            -120 + 45 * unif(team, 0, 2) AS longitude,
+            CAST(2000 * unif(team, 0, 3) AS INTEGER) AS elevation,
+            CAST(20000 + 80000 * unif(team, 0, 4) AS INTEGER) AS capacity,
+            CAST(1920 + 80 * unif(team, 0, 5) AS INTEGER) AS construction_year,
+            unif(team, 0, 6) < 0.7 AS grass,
+            unif(team, 0, 7) < 0.1 AS dome
+        FROM {season_range}, {team_range}
+        """)
+
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_roster_source AS
+        SELECT
+            season * 1000000 + team * 100 + k AS id,
+            'First' || k AS first_name,
+            'Last' || team || '_' || k AS last_name,
+            'Team ' || team AS team,
+            CAST(68 + 10 * unif(team, season, k) AS INTEGER) AS height,
+            CAST(170 + 150 * unif(team, season, k + 100) AS INTEGER) AS weight,
+            k AS jersey,
+            ['QB', 'RB', 'WR', 'TE', 'OL', 'DL', 'LB', 'DB', 'K', 'P'][(k % 10) + 1] AS position,
+            'Hometown ' || (k % 50) AS home_city,
+            'ST' AS home_state,
+            'USA' AS home_country,
+            25 + 20 * unif(team, k, 1) AS home_latitude,
+            -120 + 45 * unif(team, k, 2) AS home_longitude,
+            season
+        FROM {season_range}, {team_range}, range(85) AS r(k)
+        """)
+
+        # Teams are paired at random every week; scores are filled in from the drives below
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_games_source AS
+        WITH slots AS (
+            SELECT season, week, team,
+                   ROW_NUMBER() OVER (PARTITION BY season, week ORDER BY HASH(season, week, team, {int(seed)})) - 1 AS slot
+            FROM {season_range}, range(1, {weeks + 1}) AS w(week), {team_range}
+        ), pairs AS (
+            SELECT h.season, h.week, h.slot // 2 AS pair, h.team AS home_id, a.team AS away_id,
+                   h.season * 100000 + h.week * 1000 + h.slot // 2 AS id
+            FROM slots h
+            JOIN slots a ON a.season = h.season AND a.week = h.week AND a.slot = h.slot + 1
+            WHERE h.slot % 2 = 0
+        )
+        SELECT
+            id,
+            season,
+            week,
+            'regular' AS season_type,
+            CAST(kickoff(season, week, pair) AS VARCHAR) AS start_date,
+            FALSE AS start_time_tbd,
+            season < {last_season} OR week <= {current_week} AS completed,
+            unif(id, 0, 1) < 0.03 AS neutral_site,
+            conference(home_id) = conference(away_id) AS conference_game,
+            NULL::BIGINT AS attendance,
+            home_id AS venue_id,
+            'Stadium ' || home_id AS venue,
+            home_id,
+            'Team ' || home_id AS home_team,
+            conference(home_id) AS home_conference,
+            'fbs' AS home_classification,
+            NULL::INTEGER AS home_points,
+            CAST(1500 + 25 * strength(home_id, season) AS INTEGER) AS home_pregame_elo,
+            NULL::INTEGER AS home_postgame_elo,
+            away_id,
+            'Team ' || away_id AS away_team,
+            conference(away_id) AS away_conference,
+            'fbs' AS away_classification,
+            NULL::INTEGER AS away_points,
+            CAST(1500 + 25 * strength(away_id, season) AS INTEGER) AS away_pregame_elo,
+            NULL::INTEGER AS away_postgame_elo,
+            CASE WHEN season < {last_season} OR week <= {current_week} THEN ROUND(10 * unif(id, 0, 4), 2) END AS excitement_index
+        FROM pairs
+        """)
+
+        # Home and away alternate possessions. Every snap gains yards around a mean that moves
+        # with the offense's edge over the defense (strength gap + home field); a drive ends on
+        # the play that reaches the end zone, or after its snaps run out
+        con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE ___drive_plays AS
+        WITH drives AS (
+            SELECT
+                g.id AS game_id, g.season, g.week, g.home_id, g.away_id,
+                g.id * 100 + d.drive_number AS drive_id,
+                d.drive_number,
+                d.drive_number % 2 = 1 AS is_home_offense,
+                CASE WHEN d.drive_number % 2 = 1 THEN 1 ELSE -1 END
+                    * (strength(g.home_id, g.season) - strength(g.away_id, g.season) + CASE WHEN g.neutral_site THEN 0 ELSE 3 END)
+                    AS edge,
+                CAST(3 + FLOOR(9 * unif(g.id, d.drive_number, 40)) AS INTEGER) AS snaps,
+                CAST(75 - 20 * unif(g.id, d.drive_number, 43) AS INTEGER) AS start_yards_to_goal
+            FROM cfb.cfb_games_source g, range(1, {drives_per_game + 1}) AS d(drive_number)
+        ), snaps AS (
+            SELECT d.*, UNNEST(range(d.snaps)) AS i
+            FROM drives d
+        ), gains AS (
+            SELECT *, CAST(ROUND({PLAY_YARDS_MEAN} + {PLAY_YARDS_PER_EDGE} * edge + 7 * gauss(drive_id, i, 53)) AS INTEGER) AS raw_gained
+            FROM snaps
+        ), progress AS (
+            SELECT *, COALESCE(SUM(raw_gained) OVER before, 0) AS gained_before
+            FROM gains
+            WINDOW before AS (PARTITION BY drive_id ORDER BY i ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+        )
+        SELECT * EXCLUDE (raw_gained), LEAST(raw_gained, start_yards_to_goal - gained_before) AS gained
+        FROM progress
+        WHERE gained_before < start_yards_to_goal
+        """)
+
+        # Drive results follow from the yards gained: a touchdown when the snaps reach the end zone,
+        # a field goal when they stall within FG_RANGE_YARDS of it, otherwise a turnover or a punt
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_drives_source AS
+        WITH base AS (
+            SELECT
+                game_id, season, week, home_id, away_id, drive_id, drive_number, is_home_offense, start_yards_to_goal,
+                CAST(COUNT(*) AS INTEGER) AS plays,
+                CAST(SUM(gained) AS INTEGER) AS yards
+            FROM ___drive_plays
+            GROUP BY ALL
+        ), results AS (
+            SELECT *,
+                CASE WHEN yards >= start_yards_to_goal THEN 'TD'
+                     WHEN start_yards_to_goal - yards <= {FG_RANGE_YARDS} THEN 'FG'
+                     WHEN unif(game_id, drive_number, 41) < 0.25 THEN 'TURNOVER'
+                     ELSE 'PUNT' END AS drive_result,
+                CASE WHEN yards >= start_yards_to_goal THEN 7
+                     WHEN start_yards_to_goal - yards <= {FG_RANGE_YARDS} THEN 3
+                     ELSE 0 END AS drive_points
+            FROM base
+        ), scores AS (
+            SELECT *,
+                COALESCE(SUM(CASE WHEN is_home_offense THEN drive_points END) OVER before, 0) AS home_before,
+                COALESCE(SUM(CASE WHEN NOT is_home_offense THEN drive_points END) OVER before, 0) AS away_before
+            FROM results
+            WINDOW before AS (PARTITION BY game_id ORDER BY drive_number ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING)
+        )
+        SELECT
+            drive_id AS id,
+            game_id, season AS year, week,
+            'Team ' || CASE WHEN is_home_offense THEN home_id ELSE away_id END AS offense,
+            conference(CASE WHEN is_home_offense THEN home_id ELSE away_id END) AS offense_conference,
+            'Team ' || CASE WHEN is_home_offense THEN away_id ELSE home_id END AS defense,
+            conference(CASE WHEN is_home_offense THEN away_id ELSE home_id END) AS defense_conference,
+            is_home_offense,
+            drive_number,
+            drive_points > 0 AS scoring,
+            drive_result,
+            plays,
+            yards,
+            CAST(1 + (drive_number - 1) * 4 // {drives_per_game} AS INTEGER) AS start_period,
+            CAST(1 + (drive_number - 1) * 4 // {drives_per_game} AS INTEGER) AS end_period,
+            100 - start_yards_to_goal AS start_yardline,
+            CAST(LEAST(100, GREATEST(0, 100 - start_yards_to_goal + yards)) AS INTEGER) AS end_yardline,
+            start_yards_to_goal,
+            CAST(LEAST(100, GREATEST(0, start_yards_to_goal - yards)) AS INTEGER) AS end_yards_to_goal,
+            CASE WHEN is_home_offense THEN home_before ELSE away_before END AS start_offense_score,
+            CASE WHEN is_home_offense THEN away_before ELSE home_before END AS start_defense_score,
+            CASE WHEN is_home_offense THEN home_before ELSE away_before END + drive_points AS end_offense_score,
+            CASE WHEN is_home_offense THEN away_before ELSE home_before END AS end_defense_score,
+            CAST(14 - FLOOR(((drive_number - 1) * 60.0 / {drives_per_game}) % 15) AS INTEGER) AS start_time_minutes,
+            CAST(59 * unif(game_id, drive_number, 44) AS INTEGER) AS start_time_seconds,
+            CAST(GREATEST(0, 14 - FLOOR(((drive_number - 1) * 60.0 / {drives_per_game}) % 15) - plays // 3) AS INTEGER) AS end_time_minutes,
+            CAST(59 * unif(game_id, drive_number, 45) AS INTEGER) AS end_time_seconds,
+            CAST(plays // 3 AS INTEGER) AS elapsed_minutes,
+            CAST(59 * unif(game_id, drive_number, 46) AS INTEGER) AS elapsed_seconds
+        FROM scores
+        """)
+
+        # PPA follows the yards each snap gained against the distance it needed
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_plays_source AS
+        WITH plays AS (
+            SELECT p.drive_id, p.i, p.gained, p.gained_before, d.*,
+                CAST(1 + FLOOR(4 * unif(d.id, p.i, 50) * unif(d.id, p.i, 51)) AS INTEGER) AS down,
+                CAST(1 + FLOOR(12 * unif(d.id, p.i, 52)) AS INTEGER) AS distance
+            FROM ___drive_plays p
+            JOIN cfb.cfb_drives_source d ON d.id = p.drive_id
+        )
+        SELECT
+            id * 32 + i AS id,
+            id AS drive_id,
+            game_id,
+            drive_number,
+            drive_number * 20 + i AS play_number,
+            offense, offense_conference,
+            start_offense_score AS offense_score,
+            defense, defense_conference,
+            start_defense_score AS defense_score,
+            CASE WHEN is_home_offense THEN offense ELSE defense END AS home,
+            CASE WHEN is_home_offense THEN defense ELSE offense END AS away,
+            start_period AS period,
+            CAST(GREATEST(0, start_time_minutes - i // 3) AS INTEGER) AS clock_minutes,
+            CAST(59 * unif(id, i, 54) AS INTEGER) AS clock_seconds,
+            CAST(3 - FLOOR(2 * unif(game_id, start_period, 55)) AS INTEGER) AS offense_timeouts,
+            CAST(3 - FLOOR(2 * unif(game_id, start_period, 56)) AS INTEGER) AS defense_timeouts,
+            CAST(LEAST(99, GREATEST(1, start_yardline + gained_before)) AS INTEGER) AS yardline,
+            CAST(LEAST(99, GREATEST(1, start_yards_to_goal - gained_before)) AS INTEGER) AS yards_to_goal,
+            down,
+            distance,
+            gained AS yards_gained,
+            scoring AND i = plays - 1 AS scoring,
+            {_sql_list(PLAY_TYPES)}[1 + CAST(FLOOR({len(PLAY_TYPES)} * unif(id, i, 57)) AS INTEGER)] AS play_type,
+            offense || ' play for ' || gained || ' yards' AS play_text,
+            ROUND((gained - distance / 2.0) / 8.0 + 0.3 * gauss(id, i, 58), 3) AS ppa,
+            NULL::VARCHAR AS wallclock,
+            year,
+            week
+        FROM plays
+        """)
+        con.execute("DROP TABLE ___drive_plays")
+
+        # Final scores are the drives' points; a tie goes to overtime, won by a field goal
+        con.execute("""
+        UPDATE cfb.cfb_games_source g
+        SET home_points = s.home_points + CASE WHEN s.home_points = s.away_points AND s.home_wins_ot THEN 3 ELSE 0 END,
+            away_points = s.away_points + CASE WHEN s.home_points = s.away_points AND NOT s.home_wins_ot THEN 3 ELSE 0 END
+        FROM (
+            SELECT
+                d.game_id,
+                CAST(SUM(CASE WHEN d.is_home_offense THEN d.end_offense_score - d.start_offense_score ELSE 0 END) AS INTEGER) AS home_points,
+                CAST(SUM(CASE WHEN d.is_home_offense THEN 0 ELSE d.end_offense_score - d.start_offense_score END) AS INTEGER) AS away_points,
+                unif(d.game_id, 0, 3) < 0.5 AS home_wins_ot
+            FROM cfb.cfb_drives_source d
+            GROUP BY d.game_id
+        ) s
+        WHERE s.game_id = g.id AND g.completed
+        """)
+
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_rankings_source AS
+        SELECT
+            season, season AS year, 'regular' AS season_type, week, 'AP Top 25' AS poll,
+            ROW_NUMBER() OVER w AS rank,
+            team AS team_id,
+            'Team ' || team AS school,
+            conference(team) AS conference,
+            CASE WHEN ROW_NUMBER() OVER w = 1 THEN 50 ELSE 0 END AS first_place_votes,
+            CAST((26 - ROW_NUMBER() OVER w) * 60 AS INTEGER) AS points
+        FROM {season_range}, range(1, {weeks + 1}) AS wk(week), {team_range}
+        WINDOW w AS (PARTITION BY season, week ORDER BY strength(team, season) + 2 * gauss(team, season * 100 + week, 30) DESC)
+        QUALIFY ROW_NUMBER() OVER w <= 25
+        """)
+
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_lines_source AS
+        WITH lines AS (
+            SELECT g.*, p.provider, p.i,
+                   -(strength(home_id, season) - strength(away_id, season) + CASE WHEN neutral_site THEN 0 ELSE 3 END)
+                       + 1.5 * gauss(id, p.i, 20) AS raw_spread,
+                   55 + 3 * gauss(id, p.i, 21) AS raw_total
+            FROM cfb.cfb_games_source g,
+                 (SELECT UNNEST({_sql_list(PROVIDERS)}) AS provider, GENERATE_SUBSCRIPTS({_sql_list(PROVIDERS)}, 1) AS i) p
+        )
+        SELECT
+            id, season, season AS year, season_type, week, start_date,
+            home_id AS home_team_id, home_team, home_conference, home_classification, home_points AS home_score,
+            away_id AS away_team_id, away_team, away_conference, away_classification, away_points AS away_score,
+            provider,
+            ROUND(raw_spread * 2) / 2 AS spread,
+            home_team || ' ' || (ROUND(raw_spread * 2) / 2) AS formatted_spread,
+            ROUND((raw_spread + gauss(id, i, 22)) * 2) / 2 AS spread_open,
+            ROUND(raw_total * 2) / 2 AS over_under,
+            ROUND((raw_total + gauss(id, i, 23)) * 2) / 2 AS over_under_open,
+            CAST(CASE WHEN raw_spread < 0 THEN -110 - 20 * ABS(raw_spread) ELSE 100 + 20 * raw_spread END AS INTEGER) AS home_moneyline,
+            CAST(CASE WHEN raw_spread < 0 THEN 100 + 20 * ABS(raw_spread) ELSE -110 - 20 * raw_spread END AS INTEGER) AS away_moneyline
+        FROM lines
+        """)
+
+        box = ", ".join(
+            f"('{cat}', '{typ}', {n}, {mean}, {sd}, '{kind}')" for cat, typ, n, mean, sd, kind in BOX_STATS
+        )
+        con.execute(f"""
+        CREATE OR REPLACE TABLE cfb.cfb_game_players_source AS
+        WITH box(category_name, type_name, athletes, mean, sd, kind) AS (VALUES {box}),
+        sides AS (
+            SELECT id AS game_id, season, week, home_id AS team_id, 'home' AS home_away, home_points AS points FROM cfb.cfb_games_source WHERE completed
+            UNION ALL
+            SELECT id, season, week, away_id, 'away', away_points FROM cfb.cfb_games_source WHERE completed
+        ), stats AS (
+            SELECT s.*, b.*, a.k,
+                GREATEST(0, ROUND(b.mean + b.sd * gauss(s.game_id * 1000 + s.team_id, HASH(b.category_name, b.type_name) % 100000, a.k))) AS value
+            FROM sides s, box b, range(5) AS a(k)
+            WHERE a.k < b.athletes
+        )
+        SELECT
+            game_id,
+            'Team ' || team_id AS team,
+            conference(team_id) AS conference,
+            home_away,
+            points,
+            category_name,
+            type_name,
+            season * 1000000 + team_id * 100 + (HASH(category_name) % 10) * 8 + k AS athlete_id,
+            'Player ' || team_id || '-' || k AS athlete_name,
+            CASE WHEN kind = 'ratio'
+                 THEN CAST(CAST(value AS INTEGER) AS VARCHAR) || '/'
+                      || CAST(CAST(value + ROUND(value * (0.3 + 0.5 * unif(game_id, team_id, k))) AS INTEGER) AS VARCHAR)
+                 ELSE CAST(CAST(value AS INTEGER) AS VARCHAR)
+            END AS stat,
+            season,
+            week
+        FROM stats
+        """)
+
+        counts = {
+            name: con.execute(f"SELECT COUNT(*) FROM cfb.{name}").fetchone()[0]
+            for name in (
+                "cfb_teams_source", "cfb_roster_source", "cfb_games_source", "cfb_lines_source",
+                "cfb_rankings_source", "cfb_drives_source", "cfb_plays_source", "cfb_game_players_source",
+            )
+        }
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    return counts
+
+
+def build_models(db_path: str, models_dir: Path = MODELS_DIR) -> int:
+    """
+    Materialize every SQLMesh model in `models_dir` as a plain table, without SQLMesh.
+    Models are retried until their upstream tables exist. Returns the number built.
+    """
+    pending = {}
+    for path in sorted(models_dir.rglob("*.sql")):
+        text = path.read_text(encoding="utf-8")
+        name = re.search(r"name\s+([\w.]+)", text).group(1)
+        body = re.sub(r"^\s*MODEL\s*\(.*?\);", "", text, count=1, flags=re.S | re.I)
+        body = ROUND_KEY_MACRO.sub(lambda m: round_key_sql(*(arg.strip() for arg in m.group(1).split(","))), body)
+        pending[name] = body
+
+    con = duckdb.connect(db_path)
+    built = 0
+    try:
+        while pending:
+            progressed = False
+            for name, body in list(pending.items()):
+                try:
+                    con.execute(f"CREATE OR REPLACE TABLE {name} AS {body}")
+                except duckdb.CatalogException:
+                    continue
+                del pending[name]
+                built += 1
+                progressed = True
+            if not progressed:
+                raise RuntimeError(f"Could not build models (missing upstream tables?): {', '.join(pending)}")
+        con.execute("CHECKPOINT")
+    finally:
+        con.close()
+    return built
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic cfb_*_source tables into a scratch DuckDB")
+    parser.add_argument("db_path")
+    parser.add_argument("--seasons", type=int, default=1)
+    parser.add_argument("--last-season", type=int, default=2025)
+    parser.add_argument("--teams", type=int, default=136)
+    parser.add_argument("--weeks", type=int, default=14)
+    parser.add_argument("--drives-per-game", type=int, default=24)
+    parser.add_argument("--current-week", type=int, default=9)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--models", action="store_true", help="Also materialize models/*.sql")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(
+        args.db_path, args.seasons, args.last_season, args.teams, args.weeks,
+        args.drives_per_game, args.current_week, args.seed,
+    )
+    for table, rows in counts.items():
+        print(f"   cfb.{table:<26} {rows:>12,} rows")
+    if args.models:
+        print(f"   {build_models(args.db_path)} models built")
+    print(f"✅ Synthetic data written to {args.db_path} in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,126 @@
+# test_cfb_ai_benchmarks.py
+"""
+cfb_ai stage benchmarks on synthetic data:
+- For each scale, write synthetic cfb_*_source tables + models into a scratch
+  DuckDB (synthetic_data.py) and run `python -m ai.cfb_ai` against it
+- Per-stage wall time and peak RSS come from cfb.ai_run_metrics (ai.cfb_profile)
+- Compared with baseline.json; a stage fails when it is more than
+  CFB_BENCH_THRESHOLD (default 25%) slower or larger than its baseline, beyond a
+  small absolute noise floor
+
+Opt-in (slow):   CFB_RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -q
+New baseline:    CFB_RUN_BENCHMARKS=1 CFB_BENCH_UPDATE_BASELINE=1 python -m pytest tests/benchmarks -q
+Pick scales:     CFB_BENCH_SCALES=small,medium,large
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from synthetic_data import build_models, generate  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[2]
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+SCALES = {
+    "small": {"seasons": 1},
+    "medium": {"seasons": 10},
+    "large": {"seasons": 40},
+    "xlarge": {"seasons": 100},
+}
+BENCH_SCALES = [s.strip() for s in os.getenv("CFB_BENCH_SCALES", "small,medium").split(",") if s.strip()]
+THRESHOLD = float(os.getenv("CFB_BENCH_THRESHOLD", "0.25"))
+UPDATE_BASELINE = os.getenv("CFB_BENCH_UPDATE_BASELINE") == "1"
+
+# Below these, differences are timer / allocator noise rather than regressions
+MIN_WALL_DELTA_S = 0.25
+MIN_RSS_DELTA_MB = 64
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("CFB_RUN_BENCHMARKS") != "1",
+    reason="benchmarks are opt-in: set CFB_RUN_BENCHMARKS=1",
+)
+
+
+def run_cfb_ai(db_path: Path) -> dict:
+    """Run cfb_ai on `db_path`; returns {stage: {wall_s, peak_rss_mb, rows_in}} for that run."""
+    env = {**os.environ, "CFB_DUCKDB_PATH": str(db_path), "CFB_AI_PUBLISH_SNAPSHOT": "0"}
+    proc = subprocess.run([sys.executable, "-m", "ai.cfb_ai"], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stdout[-4000:] + proc.stderr[-4000:]
+
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        rows = con.execute("""
+            SELECT stage, wall_s, peak_rss_mb, rows_in
+            FROM cfb.ai_run_metrics
+            WHERE run_id = (SELECT MAX(run_id) FROM cfb.ai_run_metrics)
+            ORDER BY started_at
+        """).fetchall()
+    finally:
+        con.close()
+    return {stage: {"wall_s": wall, "peak_rss_mb": rss, "rows_in": rows_in} for stage, wall, rss, rows_in in rows}
+
+
+def regressions(measured: dict, baseline: dict, threshold: float = THRESHOLD) -> list:
+    problems = []
+    for stage, base in baseline.items():
+        now = measured.get(stage)
+        if now is None:
+            problems.append(f"{stage}: missing from this run")
+            continue
+        if now["wall_s"] > base["wall_s"] * (1 + threshold) and now["wall_s"] - base["wall_s"] > MIN_WALL_DELTA_S:
+            problems.append(f"{stage}: {now['wall_s']:.2f}s wall vs baseline {base['wall_s']:.2f}s")
+        if (
+            now["peak_rss_mb"] is not None and base["peak_rss_mb"] is not None
+            and now["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold)
+            and now["peak_rss_mb"] - base["peak_rss_mb"] > MIN_RSS_DELTA_MB
+        ):
+            problems.append(f"{stage}: {now['peak_rss_mb']:.0f} MB peak RSS vs baseline {base['peak_rss_mb']:.0f} MB")
+    return problems
+
+
+def load_baseline() -> dict:
+    if BASELINE_PATH.is_file():
+        return json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+    return {}
+
+
+@pytest.mark.parametrize("scale", BENCH_SCALES)
+def test_cfb_ai_stage_benchmarks(scale, tmp_path):
+    db_path = tmp_path / f"cfb_bench_{scale}.duckdb"
+    counts = generate(str(db_path), **SCALES[scale])
+    build_models(str(db_path))
+    measured = run_cfb_ai(db_path)
+
+    report = "\n".join(f"   {stage:<18} {m['wall_s']:8.2f}s  {m['peak_rss_mb'] or 0:8.0f} MB" for stage, m in measured.items())
+    print(f"\n{scale}: {counts['cfb_plays_source']:,} plays, {counts['cfb_games_source']:,} games\n{report}")
+
+    baseline = load_baseline()
+    if UPDATE_BASELINE:
+        baseline.setdefault("machine", {}).update({
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        })
+        baseline.setdefault("scales", {})[scale] = {
+            "plays": counts["cfb_plays_source"],
+            "stages": {
+                stage: {"wall_s": round(m["wall_s"], 4), "peak_rss_mb": m["peak_rss_mb"] and round(m["peak_rss_mb"], 1)}
+                for stage, m in measured.items()
+            },
+        }
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        return
+
+    recorded = baseline.get("scales", {}).get(scale)
+    if recorded is None:
+        pytest.skip(f"no baseline for '{scale}' (record one with CFB_BENCH_UPDATE_BASELINE=1)")
+    problems = regressions(measured, recorded["stages"])
+    assert not problems, f"{scale} regressed past {THRESHOLD:.0%}:\n" + "\n".join(problems)
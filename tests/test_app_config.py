@@ -0,0 +1,141 @@
+import pytest
+
+pytest.importorskip("dotenv")
+
+from shared import app_config  # noqa: E402
+from shared.app_config import AppConfig, EncryptedSecretCache, LocalSecretSource  # noqa: E402
+
+API_KEY_SECRET = app_config.SECRETS_MAP["CFB_API_KEY"]
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(app_config.time, "time", clock)
+    return clock
+
+
+@pytest.fixture(autouse=True)
+def no_env_secrets(monkeypatch):
+    for key in app_config.APP_CONFIG_DEFAULT:
+        monkeypatch.delenv(key, raising=False)
+
+
+def test_secrets_are_fetched_lazily_and_once():
+    source = LocalSecretSource({API_KEY_SECRET: "live-key"})
+    config = AppConfig(secret_source=source)
+    assert source.calls == []
+
+    assert config["CFB_API_KEY"] == "live-key"
+    assert config["CFB_API_KEY"] == "live-key"
+    assert source.calls == [[API_KEY_SECRET]]
+
+
+def test_prefetch_batches_every_secret():
+    source = LocalSecretSource({API_KEY_SECRET: "live-key"})
+    config = AppConfig(secret_source=source)
+    config.prefetch()
+
+    assert source.calls == [list(app_config.SECRETS_MAP.values())]
+    assert config["CFB_API_KEY"] == "live-key"
+    assert len(source.calls) == 1
+
+
+def test_secrets_expire_after_ttl(clock):
+    source = LocalSecretSource({API_KEY_SECRET: "live-key"})
+    config = AppConfig(secret_source=source, ttl_s=60)
+
+    config["CFB_API_KEY"]
+    clock.now += 59
+    config["CFB_API_KEY"]
+    assert len(source.calls) == 1
+
+    clock.now += 2
+    config["CFB_API_KEY"]
+    assert len(source.calls) == 2
+
+
+def test_missing_secret_falls_back_and_is_not_refetched(clock, monkeypatch):
+    source = LocalSecretSource({})
+    config = AppConfig(secret_source=source, ttl_s=60)
+    monkeypatch.setenv("CFB_API_KEY", "env-key")
+
+    assert config["CFB_API_KEY"] == "env-key"
+    assert config["CFB_API_KEY"] == "env-key"
+    assert source.calls == [[API_KEY_SECRET]]
+
+
+def test_explicit_default_wins_over_config_default():
+    config = AppConfig()
+    assert config.get_value("DB_HOST") == "localhost"
+    assert config.get_value("DB_HOST", "db.internal") == "db.internal"
+
+
+def test_encrypted_cache_round_trip(tmp_path, clock):
+    fernet = pytest.importorskip("cryptography.fernet")
+    key = fernet.Fernet.generate_key().decode()
+    path = tmp_path / "secrets.enc"
+
+    first = AppConfig(secret_source=LocalSecretSource({API_KEY_SECRET: "live-key"}),
+                      cache=EncryptedSecretCache(path, key))
+    assert first["CFB_API_KEY"] == "live-key"
+    assert b"live-key" not in path.read_bytes()
+
+    # A restart reads the cache file instead of Secret Manager
+    source = LocalSecretSource({})
+    restarted = AppConfig(secret_source=source, cache=EncryptedSecretCache(path, key))
+    assert restarted["CFB_API_KEY"] == "live-key"
+    assert source.calls == []
+
+
+@pytest.mark.parametrize("damage", ["corrupt", "wrong_key"])
+def test_unreadable_cache_is_ignored(tmp_path, damage):
+    fernet = pytest.importorskip("cryptography.fernet")
+    key = fernet.Fernet.generate_key().decode()
+    path = tmp_path / "secrets.enc"
+    EncryptedSecretCache(path, key).save({API_KEY_SECRET: ["stale-key", 4_000_000_000.0]})
+
+    if damage == "corrupt":
+        path.write_bytes(b"not a fernet token")
+    else:
+        key = fernet.Fernet.generate_key().decode()
+    cache = EncryptedSecretCache(path, key)
+    assert cache.load() == {}
+
+    source = LocalSecretSource({API_KEY_SECRET: "live-key"})
+    assert AppConfig(secret_source=source, cache=cache)["CFB_API_KEY"] == "live-key"
+    assert source.calls == [[API_KEY_SECRET]]
+
+
+def test_cache_file_path_expands_user(tmp_path, monkeypatch):
+    fernet = pytest.importorskip("cryptography.fernet")
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("APP_CONFIG_CACHE_KEY", fernet.Fernet.generate_key().decode())
+    monkeypatch.setenv("APP_CONFIG_CACHE_FILE", "~/cache/secrets.enc")
+
+    assert app_config.default_secret_cache().path == tmp_path / "cache" / "secrets.enc"
+
+
+def test_projects_share_one_secret_manager_client(monkeypatch):
+    created = []
+
+    class FakeSecretManager:
+        class SecretManagerServiceClient:
+            def __init__(self):
+                created.append(self)
+
+    monkeypatch.setattr(app_config, "secretmanager", FakeSecretManager)
+    monkeypatch.setattr(app_config, "_secret_client", None)
+
+    first = app_config.GcpSecretSource("project-a")
+    second = app_config.GcpSecretSource("project-b")
+    assert first.client is second.client
+    assert len(created) == 1
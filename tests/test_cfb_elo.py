@@ -0,0 +1,88 @@
+import duckdb
+import pandas as pd
+import pytest
+
+from ai.cfb_elo import ELO_PARAMS, GAME_ELO_TABLE, STATE_TABLE, update_elo
+
+TEAMS = range(1, 7)
+# (season, week) -> completed; season 2025 is in progress from week 3
+ROUNDS = {(2024, 1): True, (2024, 2): True, (2024, 3): True,
+          (2025, 1): True, (2025, 2): True, (2025, 3): False, (2025, 4): False}
+
+
+def score(game_id: int, home: bool) -> int:
+    return (game_id * (7 if home else 3)) % 31 + (3 if home else 0)
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA cfb")
+    con.execute("CREATE TABLE cfb.cfb_teams AS SELECT t AS team_id, 2025 AS season, "
+                "CASE WHEN t < 6 THEN 'fbs' ELSE 'fcs' END AS division FROM range(1, 7) r(t)")
+    rows = []
+    for (season, week), completed in ROUNDS.items():
+        for pair in range(3):
+            home, away = TEAMS[(2 * pair + week) % 6], TEAMS[(2 * pair + 1 + 2 * week) % 6]
+            if home == away:
+                away = TEAMS[(home + 2) % 6]
+            game_id = season * 100 + week * 10 + pair
+            rows.append((
+                game_id, season, week, "regular", home, away,
+                score(game_id, True) if completed else None, score(game_id, False) if completed else None,
+                False, completed, f"{season}-09-{week:02d} 12:00",
+            ))
+    con.execute("""CREATE TABLE cfb.cfb_games (
+        game_id BIGINT, season INTEGER, week INTEGER, season_type VARCHAR, home_id INTEGER, away_id INTEGER,
+        home_points INTEGER, away_points INTEGER, neutral_site BOOLEAN, game_completed BOOLEAN, start_date VARCHAR)""")
+    con.executemany("INSERT INTO cfb.cfb_games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    yield con
+    con.close()
+
+
+def finish_week(con, season: int, week: int) -> None:
+    con.execute("""
+        UPDATE cfb.cfb_games
+        SET game_completed = TRUE, home_points = (game_id * 7) % 31 + 3, away_points = (game_id * 3) % 31
+        WHERE season = ? AND week = ?
+    """, [season, week])
+
+
+def game_elo(con) -> pd.DataFrame:
+    return con.execute(f"SELECT * FROM {GAME_ELO_TABLE} ORDER BY game_id").df()
+
+
+def watermark(con) -> int:
+    return con.execute(f"SELECT ANY_VALUE(watermark) FROM {STATE_TABLE}").fetchone()[0]
+
+
+def test_incremental_matches_full_rebuild(con):
+    update_elo(con)
+    finish_week(con, 2025, 3)
+    assert update_elo(con) == 6  # only weeks 3 and 4 of 2025 are replayed
+    incremental = game_elo(con)
+
+    update_elo(con, full=True)
+    pd.testing.assert_frame_equal(incremental, game_elo(con))
+    assert len(incremental) == 21
+
+
+def test_watermark_stops_at_first_unfinished_round(con):
+    # Week 4 finishing first must not move the watermark past unfinished week 3
+    finish_week(con, 2025, 4)
+    update_elo(con)
+    assert watermark(con) == 2025 * 1000 + 2
+
+    finish_week(con, 2025, 3)
+    assert update_elo(con) == 6
+    assert watermark(con) == 2025 * 1000 + 4
+
+
+def test_params_change_forces_rebuild(con):
+    params_hash = f"SELECT ANY_VALUE(params_hash) FROM {STATE_TABLE}"
+    update_elo(con)
+    assert update_elo(con) == 6  # weeks after the watermark only
+    before = con.execute(params_hash).fetchone()[0]
+
+    assert update_elo(con, params={**ELO_PARAMS, "k": 30.0}) == 21
+    assert con.execute(params_hash).fetchone()[0] != before
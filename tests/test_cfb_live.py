@@ -0,0 +1,147 @@
+import hashlib
+import json
+
+import duckdb
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("lightgbm")  # pipelines.cfb_live loads the play model module
+
+from pipelines import cfb_live  # noqa: E402
+from pipelines.cfb_live import ConditionalFetcher, ensure_live_schema, live_games, poll_cycle, rescore  # noqa: E402
+
+GAMES = [
+    (1, 2024, 5, "regular", "Home 1", "Away 1", False, None, None),
+    (2, 2024, 5, "regular", "Home 2", "Away 2", False, None, None),
+]
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, payload=None, headers=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode() if payload is not None else b""
+        self.headers = headers or {}
+        self.text = self.content.decode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.headers = {}
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.calls.append(headers)
+        return self.responses.pop(0)
+
+
+class FakeFetcher:
+    """Serves canned payloads per endpoint; a missing endpoint behaves like an unchanged feed."""
+
+    def __init__(self, **payloads):
+        self.payloads = payloads
+        self.calls = []
+
+    def get(self, path, params):
+        self.calls.append((path, params))
+        return self.payloads.get(path)
+
+
+def play(play_id: int, game_id: int, play_number: int, home_score: int = 0) -> dict:
+    return {
+        "id": play_id, "gameId": game_id, "driveId": game_id * 100, "driveNumber": 1, "playNumber": play_number,
+        "offense": f"Home {game_id}", "defense": f"Away {game_id}",
+        "home": f"Home {game_id}", "away": f"Away {game_id}",
+        "offenseScore": home_score, "defenseScore": 0, "period": 1, "clock": {"minutes": 10, "seconds": 0},
+    }
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    ensure_live_schema(con)
+    con.executemany("INSERT INTO cfb_live.games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", GAMES)
+    yield con
+    con.close()
+
+
+def test_fetcher_sends_validators_and_skips_304():
+    session = FakeSession([
+        FakeResponse(200, [{"id": 1}], {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ])
+    fetcher = ConditionalFetcher("key", session=session)
+
+    assert fetcher.get("plays", {"year": 2024}) == [{"id": 1}]
+    assert fetcher.get("plays", {"year": 2024}) is None
+    assert session.calls[1] == {"If-None-Match": '"v1"'}
+    assert (fetcher.requests, fetcher.not_modified) == (2, 1)
+
+
+def test_fetcher_skips_unchanged_body_without_validators():
+    session = FakeSession([
+        FakeResponse(200, [{"id": 1}]),
+        FakeResponse(200, [{"id": 1}]),
+        FakeResponse(200, [{"id": 1}, {"id": 2}]),
+    ])
+    fetcher = ConditionalFetcher("key", session=session)
+
+    assert fetcher.get("plays", {"year": 2024}) == [{"id": 1}]
+    assert fetcher.get("plays", {"year": 2024}) is None
+    assert fetcher.get("plays", {"year": 2024}) == [{"id": 1}, {"id": 2}]
+    assert session.calls == [{}, {}, {}]
+    assert fetcher.not_modified == 1
+    assert fetcher._seen[("plays", (("year", 2024),))][2] == hashlib.sha1(
+        json.dumps([{"id": 1}, {"id": 2}]).encode()
+    ).hexdigest()
+
+
+def test_poll_cycle_appends_only_unseen_plays(con):
+    seen = set()
+    fetcher = FakeFetcher(plays=[play(10, 1, 1), play(20, 2, 1), play(99, 3, 1)])
+    affected, drives, finished = poll_cycle(con, fetcher, GAMES, seen)
+
+    # One request per endpoint for the single live week; game 3 isn't live
+    assert [path for path, _ in fetcher.calls] == ["plays", "drives", "games"]
+    assert affected == {1, 2}
+    assert (drives, finished) == (0, set())
+    assert seen == {10, 20}
+
+    fetcher = FakeFetcher(plays=[play(10, 1, 1), play(20, 2, 1), play(11, 1, 2)])
+    affected, _, _ = poll_cycle(con, fetcher, GAMES, seen)
+
+    assert affected == {1}
+    ids = con.execute("SELECT id FROM cfb_live.plays_source ORDER BY id").fetchall()
+    assert ids == [(10,), (11,), (20,)]
+
+
+def test_poll_cycle_records_completion_from_games_feed(con):
+    fetcher = FakeFetcher(
+        plays=[play(10, 1, 1, home_score=7), play(20, 2, 1, home_score=3)],
+        games=[
+            {"id": 1, "completed": True, "homePoints": 31, "awayPoints": 24},
+            {"id": 2, "completed": False, "homePoints": 3, "awayPoints": 0},
+        ],
+    )
+    _, _, finished = poll_cycle(con, fetcher, GAMES, set())
+    rescore(con, None, set())
+
+    assert finished == {1}
+    assert [game[0] for game in live_games(con)] == [2]
+    assert con.execute("SELECT game_id FROM cfb_live.game_state").fetchall() == [(2,)]
+    scores = con.execute("SELECT game_id, home_points, away_points FROM cfb_live.games ORDER BY game_id").fetchall()
+    assert scores == [(1, 31, 24), (2, 3, 0)]
+
+
+def test_stale_schedule_does_not_reopen_finished_game(con, monkeypatch):
+    con.execute("UPDATE cfb_live.games SET game_completed = TRUE, home_points = 31, away_points = 24 WHERE game_id = 1")
+    schedule = duckdb.connect()
+    schedule.execute("CREATE TABLE stale AS SELECT * FROM (VALUES (1, 2024, 5, 'regular', 'Home 1', 'Away 1', FALSE, NULL, NULL)) t")
+    monkeypatch.setattr(cfb_live, "connect_snapshot", lambda: schedule)
+    monkeypatch.setattr(cfb_live, "LIVE_GAMES_SQL", "SELECT * FROM stale WHERE ? IS NOT NULL")
+
+    assert cfb_live.discover_live_games(con) == []
+    assert con.execute("SELECT game_completed, home_points FROM cfb_live.games").fetchall() == [(True, 31)]
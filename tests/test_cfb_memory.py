@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from ai.cfb_memory import compact_frame
+
+SCORE_COLUMNS = ["home_points", "away_points", "point_spread", "total_points"]
+
+
+def test_scores_are_not_downcast_into_overflow():
+    # A fully completed season: no NULL scores, so the columns load as plain ints
+    games = pd.DataFrame({"week": [1, 2], "home_points": [74, 3], "away_points": [62, 0]})
+    compact_frame(games, exclude=SCORE_COLUMNS)
+
+    assert games["week"].dtype == np.int8
+    total_points = games["home_points"].fillna(0) + games["away_points"].fillna(0)
+    assert total_points.tolist() == [136, 3]
+    point_spread = games["home_points"] - games["away_points"]
+    assert point_spread.tolist() == [12, 3]
+
+
+def test_score_targets_keep_their_width():
+    games = pd.DataFrame({"point_spread": [-70, 70], "total_points": [120, 130]})
+    compact_frame(games, exclude=SCORE_COLUMNS)
+
+    assert games["point_spread"].dtype == np.int64
+    assert games["total_points"].dtype == np.int64
@@ -0,0 +1,83 @@
+import duckdb
+import numpy as np
+import pytest
+
+pytest.importorskip("lightgbm")
+
+from ai.cfb_play_model import PLAY_FEATURES, WIN_PROB_TABLE, ensure_win_prob_table, score_plays  # noqa: E402
+
+SCORE_DIFF = PLAY_FEATURES.index("score_diff")
+
+
+class StubBooster:
+    """Win probability straight from the score difference; remembers each batch size."""
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        self.batches.append(len(X))
+        return 0.5 + X[:, SCORE_DIFF] / 100
+
+
+@pytest.fixture
+def con():
+    con = duckdb.connect()
+    con.execute("CREATE SCHEMA cfb")
+    con.execute("""
+        CREATE TABLE cfb.cfb_games AS
+        SELECT * FROM (VALUES
+            (1, 2025, 5, TRUE, 28, 14, 'Home 1'),
+            (2, 2025, 5, FALSE, NULL, NULL, 'Home 2')
+        ) t(game_id, season, week, game_completed, home_points, away_points, home_team)
+    """)
+    con.execute("""
+        CREATE TABLE cfb.cfb_plays AS
+        SELECT
+            game_id * 100 + n AS play_id, game_id,
+            1 + n % 4 AS down, 10 AS distance_to_first_down, 75 - n AS yards_to_goal,
+            1 + n // 3 AS quarter, 10 AS clock_minutes, 0 AS clock_seconds,
+            n AS offense_score, 0 AS defense_score, 3 AS offense_timeouts, 3 AS defense_timeouts,
+            'Home ' || game_id AS offense_team_name, 'Home ' || game_id AS home_team_name
+        FROM range(1, 3) g(game_id), range(5) r(n)
+    """)
+    yield con
+    con.close()
+
+
+def win_probs(con):
+    return con.execute(f"""
+        SELECT play_id, game_id, offense_win_prob, model_version, scored_at
+        FROM {WIN_PROB_TABLE} ORDER BY play_id
+    """).fetchall()
+
+
+def test_full_rebuild_replaces_table(con):
+    ensure_win_prob_table(con)
+    con.execute(f"INSERT INTO {WIN_PROB_TABLE} VALUES (999, 9, 2024, 1, 0.1, 'old', now())")
+    booster = StubBooster()
+
+    assert score_plays(con, booster, "v1", batch_rows=4) == 10
+    assert sum(booster.batches) == 10 and max(booster.batches) <= 4
+
+    rows = win_probs(con)
+    assert [r[0] for r in rows] == [100, 101, 102, 103, 104, 200, 201, 202, 203, 204]
+    assert {r[3] for r in rows} == {"v1"}
+    assert [r[2] for r in rows[:5]] == pytest.approx([0.5, 0.51, 0.52, 0.53, 0.54])
+
+
+def test_game_ids_rescore_only_those_games(con):
+    score_plays(con, StubBooster(), "v1")
+    before = {r[0]: r for r in win_probs(con)}
+
+    con.execute("UPDATE cfb.cfb_plays SET offense_score = offense_score + 10 WHERE game_id = 2")
+    assert score_plays(con, StubBooster(), "v2", game_ids=[2]) == 5
+
+    rows = win_probs(con)
+    assert len(rows) == 10
+    for play_id, game_id, prob, version, scored_at in rows:
+        if game_id == 1:
+            assert (play_id, game_id, prob, version, scored_at) == before[play_id]
+        else:
+            assert version == "v2"
+            assert prob == pytest.approx(0.6 + (play_id - 200) / 100)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("scipy")
+
+from ai.cfb_ratings import ADJ_PARAMS, TARGETS, _conjugate_gradient, solve_season  # noqa: E402
+
+N_TEAMS = 6
+ROUNDS = 4
+
+
+@pytest.fixture
+def season():
+    rng = np.random.default_rng(3)
+    games, offense_games = [], []
+    for week in range(1, ROUNDS + 1):
+        order = rng.permutation(np.arange(1, N_TEAMS + 1))
+        for pair, (home, away) in enumerate(zip(order[::2], order[1::2])):
+            game_id = week * 10 + pair
+            neutral = pair == 0
+            games.append({"game_id": game_id, "season": 2025, "week": week, "round_key": 2025_000 + week,
+                          "home_id": home, "away_id": away, "neutral_site": neutral, "completed": True})
+            for offense, defense, side in ((home, away, 1), (away, home, -1)):
+                offense_games.append({
+                    "season": 2025, "round_key": 2025_000 + week, "game_id": game_id,
+                    "offense_id": offense, "defense_id": defense, "home_offense": 0 if neutral else side,
+                    "plays": int(rng.integers(50, 80)),
+                    "ppa": rng.normal(0.1, 0.3), "success": rng.uniform(0.3, 0.55), "yards": rng.normal(5.5, 1.5),
+                })
+    return pd.DataFrame(games), pd.DataFrame(offense_games)
+
+
+def dense_ratings(offense_games: pd.DataFrame, params: dict) -> np.ndarray:
+    """The same ridge fit built as a dense matrix and solved directly."""
+    width = 2 * N_TEAMS + 1
+    X = np.zeros((len(offense_games), width))
+    rows = np.arange(len(offense_games))
+    X[rows, offense_games["offense_id"].to_numpy() - 1] = 1
+    X[rows, N_TEAMS + offense_games["defense_id"].to_numpy() - 1] = 1
+    X[:, -1] = offense_games["home_offense"].to_numpy()
+    w = offense_games["plays"].to_numpy(float)
+    y = offense_games[list(TARGETS)].to_numpy()
+    y = y - (w @ y) / w.sum()
+
+    penalty = np.full(width, params["alpha"])
+    penalty[-1] = params["hfa_alpha"]
+    return np.linalg.solve(X.T @ (w[:, None] * X) + np.diag(penalty), X.T @ (w[:, None] * y))
+
+
+def test_conjugate_gradient_matches_dense_solve():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(20, 20))
+    A = M @ M.T + 20 * np.eye(20)
+    B = rng.normal(size=(20, 3))
+
+    X, iterations = _conjugate_gradient(A, B, np.zeros_like(B), tol=1e-10, max_iter=200)
+    np.testing.assert_allclose(X, np.linalg.solve(A, B), rtol=1e-8, atol=1e-10)
+    assert 0 < iterations <= 20
+
+
+def test_season_ratings_match_dense_solve(season):
+    games, offense_games = season
+    params = {**ADJ_PARAMS, "alpha": 20.0, "tol": 1e-12}
+    rated, _ = solve_season(games, offense_games, params)
+
+    # Every round is rated on the completed games before it
+    for round_key in range(2025_002, 2025_000 + ROUNDS + 1):
+        expected = dense_ratings(offense_games[offense_games["round_key"] < round_key], params)
+        got = rated[rated["round_key"] == round_key].drop_duplicates("team_id").sort_values("team_id")
+        idx = got["team_id"].to_numpy() - 1
+        for k, target in enumerate(TARGETS):
+            np.testing.assert_allclose(got[f"adj_off_{target}"], expected[idx, k], atol=1e-9)
+            np.testing.assert_allclose(got[f"adj_def_{target}"], expected[N_TEAMS + idx, k], atol=1e-9)
+
+    # Before any game is played everyone is league average
+    assert not rated.loc[rated["round_key"] == 2025_001, ["adj_off_ppa", "adj_def_ppa"]].to_numpy().any()
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai import cfb_simulate
+from ai.cfb_simulate import PLAYOFF_FIELD, _prepare_arrays, simulate_season, summarize
+
+N_SIMS = 2_000
+SEED = 7
+
+
+@pytest.fixture
+def arrays():
+    # Three 6-team FBS conferences, two independents and two FCS teams
+    conferences = {team: f"Conf {(team - 1) // 6}" for team in range(1, 19)}
+    conferences.update({19: "FBS Independents", 20: "FBS Independents", 21: "Big Sky", 22: "Big Sky"})
+    teams = pd.DataFrame({
+        "team_id": list(conferences),
+        "conference": list(conferences.values()),
+        "division": ["fbs"] * 20 + ["fcs"] * 2,
+    })
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for week in range(1, 9):
+        order = rng.permutation(list(conferences))
+        for game, (home, away) in enumerate(zip(order[::2], order[1::2])):
+            completed = week <= 3
+            rows.append({
+                "game_id": week * 100 + game,
+                "home_id": home,
+                "away_id": away,
+                "completed": completed,
+                "home_points": int(rng.integers(0, 50)) if completed else None,
+                "away_points": int(rng.integers(0, 50)) if completed else None,
+                "conference_game": conferences[home] == conferences[away],
+                "home_win_prob": None if game == 0 else float(rng.uniform(0.1, 0.9)),
+            })
+    return _prepare_arrays(pd.DataFrame(rows), teams)
+
+
+def test_same_seed_same_results_for_any_worker_count(arrays, monkeypatch):
+    monkeypatch.setattr(cfb_simulate, "CHUNK_SIMS", 300)
+    single = simulate_season(arrays, N_SIMS, workers=1, seed=SEED)
+
+    for workers in (2, 3):
+        totals = simulate_season(arrays, N_SIMS, workers=workers, seed=SEED)
+        for key, value in single.items():
+            np.testing.assert_array_equal(totals[key], value)
+
+
+def test_probabilities_are_consistent(arrays):
+    totals = simulate_season(arrays, N_SIMS, workers=1, seed=SEED)
+    team_odds, win_dist = summarize(2025, arrays, totals, N_SIMS)
+
+    titles = team_odds.dropna(subset=["conference"]).groupby("conference")["conf_title_prob"].sum()
+    assert sorted(titles.index) == ["Big Sky", "Conf 0", "Conf 1", "Conf 2"]
+    np.testing.assert_allclose(titles, 1.0)
+    assert team_odds.loc[team_odds["conference"].isna(), "conf_title_prob"].eq(0).all()
+
+    assert team_odds["playoff_prob"].sum() == pytest.approx(PLAYOFF_FIELD)
+    np.testing.assert_allclose(win_dist.groupby("team_id")["probability"].sum(), 1.0)
+    expected = (win_dist["wins"] * win_dist["probability"]).groupby(win_dist["team_id"]).sum()
+    np.testing.assert_allclose(expected, team_odds.set_index("team_id")["expected_wins"].loc[expected.index])